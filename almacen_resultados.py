@@ -0,0 +1,325 @@
+"""
+Módulo con un almacén columnar compacto para resultados de clasificación
+
+Un almacén es un directorio con un archivo NPY por columna y un esquema JSON:
+
+    coeficientes        float32 (N, 4)   a1, b1, a2, b2
+    valores_propios     complex64 (N, 2)
+    determinante        float32 (N,)
+    traza               float32 (N,)
+    es_unico            bool (N,)
+    codigo_tipo         uint8 (N,)       códigos sobre TIPOS_PUNTO_CRITICO
+    codigo_estabilidad  uint8 (N,)       códigos sobre ESTABILIDADES
+
+Son 43 bytes por sistema, frente a más de un kilobyte de un diccionario de
+obtener_informacion_completa. Se escribe de forma incremental y se lee con
+mmap, de modo que las consultas recorren las columnas por trozos como
+máscaras vectorizadas sin cargar el almacén en memoria.
+
+Uso:
+    almacen = AlmacenResultados('barrido/')
+    indices = almacen.consultar(tipo="Foco o Espiral",
+                                estabilidad="Asintóticamente Estable",
+                                traza=(-1, 0))
+    almacen.fila(indices[0])  # Mismo formato que obtener_informacion_completa
+"""
+
+import json
+import os
+
+import numpy as np
+
+from analisis_estabilidad import (analizar_lote, describir_clasificacion, TIPOS_PUNTO_CRITICO,
+                                  ESTABILIDADES)
+from analisis_lotes import cabecera_npy, TAMANO_TROZO
+
+
+# Columnas del almacén: nombre -> (dtype, forma de cada fila)
+COLUMNAS = {
+    'coeficientes': (np.float32, (4,)),
+    'valores_propios': (np.complex64, (2,)),
+    'determinante': (np.float32, ()),
+    'traza': (np.float32, ()),
+    'es_unico': (np.bool_, ()),
+    'codigo_tipo': (np.uint8, ()),
+    'codigo_estabilidad': (np.uint8, ()),
+}
+NOMBRE_ESQUEMA = 'esquema.json'
+VERSION = 1
+
+# Trozo por defecto de las consultas: acota la memoria de las máscaras
+TAMANO_TROZO_CONSULTA = 1 << 20
+
+
+class EscritorAlmacen:
+    """
+    Escribe un almacén de forma incremental, un trozo de resultados a la vez
+    
+    Las cabeceras NPY se reservan al abrir y se reescriben al cerrar con el
+    número final de filas; el esquema solo se escribe al cerrar una escritura
+    completa, así que un almacén sin esquema es una escritura que falló o no
+    terminó.
+    """
+    
+    def __init__(self, directorio):
+        """
+        Args:
+            directorio: Directorio del almacén (se crea si no existe)
+        """
+        if directorio == '-':
+            raise ValueError("El almacén requiere un directorio (no la salida estándar)")
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self._filas = 0
+        self._archivos = {}
+        self._longitudes = {}
+        esquema = os.path.join(directorio, NOMBRE_ESQUEMA)
+        if os.path.exists(esquema):
+            os.remove(esquema)
+        for nombre, (dtype, forma) in COLUMNAS.items():
+            self._longitudes[nombre] = len(cabecera_npy(dtype, (10 ** 19,) + forma))
+            archivo = open(os.path.join(directorio, f"{nombre}.npy"), 'wb')
+            archivo.write(self._cabecera(nombre, 0))
+            self._archivos[nombre] = archivo
+    
+    def _cabecera(self, nombre, filas):
+        """Cabecera NPY de una columna con la longitud reservada"""
+        dtype, forma = COLUMNAS[nombre]
+        return cabecera_npy(dtype, (filas,) + forma, self._longitudes[nombre])
+    
+    def escribir(self, coeficientes, resultado):
+        """
+        Escribe un trozo de resultados
+        
+        Args:
+            coeficientes: Arreglo (n, 4) con columnas a1, b1, a2, b2
+            resultado: Diccionario de analizar_lote para esos coeficientes
+        """
+        columnas = dict(resultado, coeficientes=coeficientes)
+        for nombre, (dtype, _) in COLUMNAS.items():
+            self._archivos[nombre].write(np.ascontiguousarray(columnas[nombre], dtype=dtype).tobytes())
+        self._filas += len(coeficientes)
+    
+    def cerrar(self, completo=True):
+        """
+        Reescribe las cabeceras con el número final de filas y escribe el esquema
+        
+        Args:
+            completo: Si es False (la escritura falló) solo se cierran los
+                archivos, sin esquema, y el almacén queda marcado como incompleto
+        """
+        for nombre, archivo in self._archivos.items():
+            if completo:
+                archivo.seek(0)
+                archivo.write(self._cabecera(nombre, self._filas))
+            archivo.close()
+        if not completo:
+            return
+        esquema = {
+            'version': VERSION,
+            'filas': self._filas,
+            'columnas': {nombre: np.lib.format.dtype_to_descr(np.dtype(dtype))
+                         for nombre, (dtype, _) in COLUMNAS.items()},
+            'tipos': list(TIPOS_PUNTO_CRITICO),
+            'estabilidades': list(ESTABILIDADES),
+        }
+        with open(os.path.join(self.directorio, NOMBRE_ESQUEMA), 'w', encoding='utf-8') as archivo:
+            json.dump(esquema, archivo, ensure_ascii=False, indent=2)
+
+
+def guardar_resultados(directorio, coeficientes, resultado=None, tamano_trozo=TAMANO_TROZO):
+    """
+    Clasifica (si hace falta) y guarda un arreglo de coeficientes en un almacén
+    
+    Args:
+        directorio: Directorio del almacén
+        coeficientes: Arreglo (N, 4) con columnas a1, b1, a2, b2
+        resultado: Diccionario de analizar_lote; por defecto se calcula por
+            trozos
+        tamano_trozo: Filas escritas a la vez
+    
+    Returns:
+        int: Número de filas escritas
+    """
+    coeficientes = np.asarray(coeficientes)
+    escritor = EscritorAlmacen(directorio)
+    try:
+        for inicio in range(0, len(coeficientes), tamano_trozo):
+            trozo = coeficientes[inicio:inicio + tamano_trozo]
+            if resultado is None:
+                parte = analizar_lote(trozo, etiquetas=False)
+            else:
+                parte = {nombre: resultado[nombre][inicio:inicio + tamano_trozo]
+                         for nombre in COLUMNAS if nombre != 'coeficientes'}
+            escritor.escribir(trozo, parte)
+    except BaseException:
+        escritor.cerrar(completo=False)
+        raise
+    escritor.cerrar()
+    return len(coeficientes)
+
+
+def _codigos(valor, etiquetas, nombre):
+    """Convierte etiquetas o códigos (uno o una secuencia) en códigos uint8"""
+    valores = [valor] if isinstance(valor, (str, int, np.integer)) else list(valor)
+    codigos = []
+    for v in valores:
+        if isinstance(v, str):
+            if v not in etiquetas:
+                raise ValueError(f"{nombre} desconocido: {v}")
+            v = etiquetas.index(v)
+        codigos.append(int(v))
+    return np.array(codigos, dtype=np.uint8)
+
+
+class AlmacenResultados:
+    """Almacén columnar abierto en modo lectura con mmap"""
+    
+    def __init__(self, directorio):
+        """
+        Args:
+            directorio: Directorio escrito por EscritorAlmacen
+        
+        Raises:
+            ValueError: Si falta el esquema o es de otra versión
+        """
+        ruta_esquema = os.path.join(directorio, NOMBRE_ESQUEMA)
+        if not os.path.exists(ruta_esquema):
+            raise ValueError(f"{directorio} no es un almacén completo (falta {NOMBRE_ESQUEMA})")
+        with open(ruta_esquema, encoding='utf-8') as archivo:
+            self.esquema = json.load(archivo)
+        if self.esquema.get('version') != VERSION:
+            raise ValueError(f"Versión de almacén no admitida: {self.esquema.get('version')}")
+        self.directorio = directorio
+        self.tipos = tuple(self.esquema['tipos'])
+        self.estabilidades = tuple(self.esquema['estabilidades'])
+        self._columnas = {}
+    
+    def __len__(self):
+        return self.esquema['filas']
+    
+    def columna(self, nombre):
+        """
+        Devuelve una columna como arreglo de solo lectura proyectado con mmap
+        
+        Args:
+            nombre: Una de COLUMNAS
+        
+        Returns:
+            np.memmap: Columna completa (las páginas se leen al acceder)
+        """
+        if nombre not in self._columnas:
+            if nombre not in COLUMNAS:
+                raise KeyError(f"Columna desconocida: {nombre}")
+            self._columnas[nombre] = np.load(os.path.join(self.directorio, f"{nombre}.npy"),
+                                             mmap_mode='r')
+        return self._columnas[nombre]
+    
+    def _mascara(self, inicio, fin, filtros):
+        """Máscara de las filas [inicio, fin) que cumplen todos los filtros"""
+        mascara = np.ones(fin - inicio, dtype=bool)
+        for nombre, condicion in filtros:
+            valores = self.columna(nombre)[inicio:fin]
+            if nombre in ('codigo_tipo', 'codigo_estabilidad'):
+                mascara &= np.isin(valores, condicion)
+            elif nombre == 'es_unico':
+                mascara &= valores == condicion
+            else:
+                minimo, maximo = condicion
+                if minimo is not None:
+                    mascara &= valores >= minimo
+                if maximo is not None:
+                    mascara &= valores <= maximo
+        return mascara
+    
+    def consultar(self, tipo=None, estabilidad=None, traza=None, determinante=None, es_unico=None,
+                  tamano_trozo=TAMANO_TROZO_CONSULTA):
+        """
+        Índices de las filas que cumplen todos los filtros dados
+        
+        Solo se leen las columnas filtradas, trozo a trozo, así que la memoria
+        depende del tamaño del trozo y del número de coincidencias.
+        
+        Args:
+            tipo: Etiqueta o código de TIPOS_PUNTO_CRITICO, o una secuencia
+            estabilidad: Etiqueta o código de ESTABILIDADES, o una secuencia
+            traza: Intervalo cerrado (minimo, maximo); None deja un extremo abierto
+            determinante: Intervalo cerrado (minimo, maximo)
+            es_unico: Si se da, filtra por unicidad del punto crítico
+            tamano_trozo: Filas evaluadas a la vez
+        
+        Returns:
+            np.ndarray: Índices (int64) en orden creciente
+        """
+        filtros = []
+        if tipo is not None:
+            filtros.append(('codigo_tipo', _codigos(tipo, self.tipos, "Tipo")))
+        if estabilidad is not None:
+            filtros.append(('codigo_estabilidad', _codigos(estabilidad, self.estabilidades, "Estabilidad")))
+        if traza is not None:
+            filtros.append(('traza', traza))
+        if determinante is not None:
+            filtros.append(('determinante', determinante))
+        if es_unico is not None:
+            filtros.append(('es_unico', bool(es_unico)))
+        
+        if not filtros:
+            return np.arange(len(self), dtype=np.int64)
+        partes = [np.flatnonzero(self._mascara(inicio, min(inicio + tamano_trozo, len(self)), filtros))
+                  + inicio for inicio in range(0, len(self), tamano_trozo)]
+        return np.concatenate(partes).astype(np.int64) if partes else np.empty(0, dtype=np.int64)
+    
+    def contar(self, **filtros):
+        """Número de filas que cumplen los filtros de consultar"""
+        return len(self.consultar(**filtros))
+    
+    def seleccionar(self, indices, columnas=None):
+        """
+        Lee las filas dadas de varias columnas
+        
+        Args:
+            indices: Índices de fila (p. ej. de consultar)
+            columnas: Nombres de columna; por defecto todas
+        
+        Returns:
+            dict: Arreglos en memoria con las filas seleccionadas
+        """
+        return {nombre: self.columna(nombre)[indices] for nombre in (columnas or COLUMNAS)}
+    
+    def fila(self, indice):
+        """
+        Vista de una fila con el formato de obtener_informacion_completa
+        
+        Los valores se amplían a float64/complex128; conservan la precisión
+        de float32 con la que se guardaron.
+        
+        Args:
+            indice: Índice de la fila
+        
+        Returns:
+            dict: Mismas claves que obtener_informacion_completa
+        """
+        a1, b1, a2, b2 = (float(c) for c in self.columna('coeficientes')[indice])
+        valores_propios = np.array(self.columna('valores_propios')[indice], dtype=np.complex128)
+        if not valores_propios.imag.any():
+            valores_propios = valores_propios.real
+        codigo_tipo = self.columna('codigo_tipo')[indice]
+        codigo_estabilidad = self.columna('codigo_estabilidad')[indice]
+        if self.tipos != TIPOS_PUNTO_CRITICO or self.estabilidades != ESTABILIDADES:
+            # Almacén escrito con otra versión de las etiquetas
+            codigo_tipo = TIPOS_PUNTO_CRITICO.index(self.tipos[codigo_tipo])
+            codigo_estabilidad = ESTABILIDADES.index(self.estabilidades[codigo_estabilidad])
+        return {
+            'coeficientes': {'a1': a1, 'b1': b1, 'a2': a2, 'b2': b2},
+            'matriz': np.array([[a1, b1], [a2, b2]]),
+            'determinante': np.float64(self.columna('determinante')[indice]),
+            'traza': np.float64(self.columna('traza')[indice]),
+            'valores_propios': valores_propios,
+            'es_unico': bool(self.columna('es_unico')[indice]),
+            'tipo_estabilidad': describir_clasificacion(codigo_tipo, codigo_estabilidad, valores_propios),
+        }
+    
+    def filas(self, indices):
+        """Genera la vista de fila de cada índice"""
+        for indice in indices:
+            yield self.fila(indice)
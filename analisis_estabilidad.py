@@ -3,12 +3,484 @@ Módulo para el análisis de estabilidad de sistemas lineales
 Sistema: x' = a1*x + b1*y, y' = a2*x + b2*y
 """
 
+from fractions import Fraction
+from numbers import Rational
+
 import numpy as np
 
+from cache_lru import CacheLRU, cuantizar
+
+
+# Etiquetas de clasificación indexadas por los códigos que devuelve analizar_lote
+TIPOS_PUNTO_CRITICO = (
+    "Nodo",
+    "Silla",
+    "Nodo Especial",
+    "Foco o Espiral",
+    "Centro",
+    "Caso especial complejo",
+    "Caso degenerado",
+    "No único",
+)
+ESTABILIDADES = (
+    "Asintóticamente Estable",
+    "Estable",
+    "Inestable",
+)
+
+MENSAJE_NO_UNICO = "El punto crítico (0,0) no es único"
+TOLERANCIA = 1e-10
+# Tolerancia de clasificar_robusto, relativa a la escala de la matriz
+TOLERANCIA_RELATIVA = 1e-12
+# Mayor coeficiente a partir del cual los invariantes 2x2 se calculan
+# escalados (y su inverso por abajo), y exponente máximo de esa escala
+LIMITE_ESCALA = 2.0 ** 500
+EXPONENTE_MAXIMO = 1020
+
+# Descomposición y clasificación por coeficientes cuantizados, compartida
+# por todos los analizadores
+CACHE_ANALISIS = CacheLRU(capacidad=1024)
+
+
+def _valores_propios_cerrados(traza, determinante, discriminante):
+    """
+    Calcula los valores propios de matrices 2x2 a partir de su traza,
+    determinante y discriminante, sin llamar a LAPACK
+    
+    Args:
+        traza, determinante, discriminante: Escalares o arreglos de igual forma
+        
+    Returns:
+        tuple: (m1, m2) como arreglos complejos; la parte imaginaria es
+        exactamente cero cuando el discriminante es no negativo
+    """
+    traza = np.asarray(traza, dtype=float)
+    determinante = np.asarray(determinante, dtype=float)
+    discriminante = np.asarray(discriminante, dtype=float)
+    
+    raiz = np.sqrt(np.abs(discriminante))
+    reales = discriminante >= 0
+    
+    # Raíces reales: fórmula estable que evita la cancelación en (traza ± raiz)/2
+    grande = 0.5 * (traza + np.where(traza >= 0, raiz, -raiz))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pequeno = np.where(grande != 0, determinante / grande, 0.0)
+    m1_real = np.where(traza >= 0, grande, pequeno)
+    m2_real = np.where(traza >= 0, pequeno, grande)
+    
+    # Raíces complejas conjugadas
+    parte_real = 0.5 * traza
+    parte_imag = 0.5 * raiz
+    
+    m1 = np.where(reales, m1_real, parte_real) + 1j * np.where(reales, 0.0, parte_imag)
+    m2 = np.where(reales, m2_real, parte_real) - 1j * np.where(reales, 0.0, parte_imag)
+    return m1, m2
+
+
+def _invariantes_cerrados(a1, b1, a2, b2):
+    """
+    Traza, determinante, discriminante y valores propios de matrices 2x2
+    
+    Las filas cuyo mayor coeficiente está fuera de [2^-500, 2^500] se
+    calculan sobre la matriz dividida por una potencia de dos de ese orden y
+    se reescalan al final: sin escalar, el determinante y el discriminante
+    se desbordan con coeficientes de 1e154 (o se anulan por debajo de
+    1e-154) aunque los valores propios sean representables. Escalar por una
+    potencia de dos es exacto, y en las demás filas no hace falta.
+    
+    Args:
+        a1, b1, a2, b2: Escalares o arreglos de igual forma
+        
+    Returns:
+        tuple: (traza, determinante, discriminante, m1, m2); m1 y m2 son
+        complejos con parte imaginaria exactamente cero cuando son reales
+    """
+    a1, b1, a2, b2 = np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in (a1, b1, a2, b2)))
+    maximo = np.maximum(np.maximum(np.abs(a1), np.abs(b1)), np.maximum(np.abs(a2), np.abs(b2)))
+    extremos = (maximo > LIMITE_ESCALA) | ((maximo < 1.0 / LIMITE_ESCALA) & (maximo > 0))
+    escala = None
+    if extremos.any():
+        _, exponente = np.frexp(maximo)
+        # Exponente 0 (escala 1) en las demás filas y en las no finitas; el
+        # recorte evita que la escala o su inversa se desborden
+        exponente = np.where(extremos, np.clip(exponente, -EXPONENTE_MAXIMO, EXPONENTE_MAXIMO), 0)
+        escala = np.ldexp(1.0, exponente)
+        inversa = np.ldexp(1.0, -exponente)
+        a1, b1, a2, b2 = a1 * inversa, b1 * inversa, a2 * inversa, b2 * inversa
+    
+    # Con coeficientes no finitos los resultados son NaN o infinitos sin avisos
+    with np.errstate(over='ignore', invalid='ignore'):
+        traza = a1 + b2
+        determinante = a1 * b2 - b1 * a2
+        # (a1 - b2)^2 + 4*b1*a2 es algebraicamente traza^2 - 4*det, pero sin
+        # cancelación; el cuadrado como producto, igual para escalares (** 2
+        # sobre un escalar usa pow, que puede diferir en el último bit)
+        diferencia = a1 - b2
+        discriminante = diferencia * diferencia + 4.0 * b1 * a2
+        m1, m2 = _valores_propios_cerrados(traza, determinante, discriminante)
+        if escala is not None:
+            traza, determinante, discriminante = (traza * escala, determinante * escala * escala,
+                                                  discriminante * escala * escala)
+            m1, m2 = m1 * escala, m2 * escala
+    return traza, determinante, discriminante, m1, m2
+
+
+def _clasificar_tipos(m1, m2):
+    """
+    Versión vectorizada de AnalizadorEstabilidad._determinar_tipo_punto_critico
+    
+    Args:
+        m1, m2: Arreglos complejos con los valores propios de cada sistema
+        
+    Returns:
+        np.ndarray: Códigos (uint8) sobre TIPOS_PUNTO_CRITICO
+    """
+    reales = np.isreal(m1) & np.isreal(m2)
+    complejos = ~np.isreal(m1) & ~np.isreal(m2)
+    
+    distintos = np.abs(m1 - m2) > TOLERANCIA
+    mismo_signo = np.sign(np.real(m1)) == np.sign(np.real(m2))
+    conjugados = np.abs(m1 - np.conj(m2)) < TOLERANCIA
+    imaginarios_puros = (np.abs(np.real(m1)) < TOLERANCIA) & (np.abs(np.real(m2)) < TOLERANCIA)
+    
+    condiciones = [
+        reales & distintos & mismo_signo,
+        reales & distintos,
+        reales,
+        complejos & conjugados & ~imaginarios_puros,
+        complejos & conjugados,
+        complejos,
+    ]
+    codigos = [0, 1, 2, 3, 4, 5]
+    return np.select(condiciones, codigos, default=6).astype(np.uint8)
+
+
+def _clasificar_estabilidades(m1, m2):
+    """
+    Versión vectorizada de AnalizadorEstabilidad._determinar_estabilidad
+    
+    Args:
+        m1, m2: Arreglos complejos con los valores propios de cada sistema
+        
+    Returns:
+        np.ndarray: Códigos (uint8) sobre ESTABILIDADES
+    """
+    parte_real_m1 = np.real(m1)
+    parte_real_m2 = np.real(m2)
+    
+    condiciones = [
+        (parte_real_m1 < 0) & (parte_real_m2 < 0),
+        (parte_real_m1 <= 0) & (parte_real_m2 <= 0),
+    ]
+    return np.select(condiciones, [0, 1], default=2).astype(np.uint8)
+
+
+def _clasificar(m1, m2, es_unico):
+    """Calcula los códigos de tipo y estabilidad a partir de los valores propios"""
+    # Cerca del mayor float, m1 - m2 puede desbordarse a infinito, que sigue
+    # comparando bien con las tolerancias
+    with np.errstate(over='ignore', invalid='ignore'):
+        codigo_tipo = _clasificar_tipos(m1, m2)
+    codigo_tipo[~es_unico] = TIPOS_PUNTO_CRITICO.index("No único")
+    return codigo_tipo, _clasificar_estabilidades(m1, m2)
+
+
+def clasificar_traza_determinante(traza, determinante):
+    """
+    Clasifica puntos del plano traza-determinante (diagrama de Poincaré)
+    
+    Args:
+        traza, determinante: Arreglos de igual forma
+        
+    Returns:
+        tuple: (codigo_tipo, codigo_estabilidad) como arreglos uint8 con la
+        forma de la entrada
+    """
+    traza, determinante = np.broadcast_arrays(np.asarray(traza, dtype=float),
+                                              np.asarray(determinante, dtype=float))
+    discriminante = traza ** 2 - 4.0 * determinante
+    m1, m2 = _valores_propios_cerrados(traza, determinante, discriminante)
+    return _clasificar(m1, m2, np.abs(determinante) >= TOLERANCIA)
+
+
+def _columnas_lote(coeficientes):
+    """
+    Separa los coeficientes de un lote en cuatro columnas float
+    
+    Args:
+        coeficientes: Tupla con un arreglo (N, 4) o con cuatro arreglos 1-D
+        
+    Returns:
+        tuple: (a1, b1, a2, b2) como arreglos 1-D de igual longitud
+    """
+    if len(coeficientes) == 1:
+        matriz = np.asarray(coeficientes[0], dtype=float)
+        if matriz.ndim != 2 or matriz.shape[1] != 4:
+            raise ValueError("Se esperaba un arreglo de forma (N, 4) con columnas a1, b1, a2, b2")
+        return tuple(matriz.T)
+    if len(coeficientes) == 4:
+        columnas = np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in coeficientes))
+        if columnas[0].ndim != 1:
+            raise ValueError("Los coeficientes deben ser arreglos 1-D de igual longitud")
+        return tuple(columnas)
+    raise ValueError("Se esperaba un arreglo (N, 4) o cuatro arreglos a1, b1, a2, b2")
+
+
+def analizar_lote(*coeficientes, etiquetas=True):
+    """
+    Clasifica muchos sistemas a la vez sin bucles de Python por fila
+    
+    Los valores propios se obtienen en forma cerrada a partir de la traza, el
+    determinante y el discriminante, y se clasifican con las mismas reglas y
+    tolerancias que AnalizadorEstabilidad, que usa el mismo cálculo cerrado.
+    
+    Args:
+        *coeficientes: Un arreglo de forma (N, 4) con columnas (a1, b1, a2, b2),
+            o bien cuatro arreglos 1-D a1, b1, a2, b2 de igual longitud
+        etiquetas: Si es True, incluye también 'tipo' y 'estabilidad' como
+            arreglos de texto (costosos en memoria para lotes muy grandes)
+            
+    Returns:
+        dict: Arreglos de longitud N con 'determinante', 'traza',
+        'discriminante', 'valores_propios' (N, 2), 'es_unico', 'codigo_tipo'
+        y 'codigo_estabilidad' (índices sobre TIPOS_PUNTO_CRITICO y
+        ESTABILIDADES); los sistemas sin punto crítico único llevan el tipo
+        "No único"
+    """
+    traza, determinante, discriminante, m1, m2 = _invariantes_cerrados(*_columnas_lote(coeficientes))
+    es_unico = np.abs(determinante) >= TOLERANCIA
+    codigo_tipo, codigo_estabilidad = _clasificar(m1, m2, es_unico)
+    
+    resultado = {
+        'determinante': determinante,
+        'traza': traza,
+        'discriminante': discriminante,
+        'valores_propios': np.stack([m1, m2], axis=-1),
+        'es_unico': es_unico,
+        'codigo_tipo': codigo_tipo,
+        'codigo_estabilidad': codigo_estabilidad,
+    }
+    if etiquetas:
+        resultado['tipo'] = np.asarray(TIPOS_PUNTO_CRITICO)[codigo_tipo]
+        resultado['estabilidad'] = np.asarray(ESTABILIDADES)[codigo_estabilidad]
+    return resultado
+
+
+def _signos_con_tolerancia(valores, tolerancias):
+    """
+    Signo (-1, 0, 1) de cada valor, tomando como cero todo lo que cae dentro
+    de su tolerancia
+    
+    Returns:
+        tuple: (signos int8, dudosos) donde dudosos marca los valores que se
+        redondearon a cero sin ser exactamente cero y los no finitos (NaN o
+        infinitos, con signo 0: no deciden ninguna clasificación)
+    """
+    finitos = np.isfinite(valores)
+    en_banda = np.abs(valores) <= tolerancias
+    signos = np.where(en_banda | ~finitos, 0, np.sign(valores)).astype(np.int8)
+    return signos, (en_banda & (valores != 0)) | ~finitos
+
+
+def _clasificar_por_signos(signo_det, signo_traza, signo_disc):
+    """
+    Códigos de tipo y estabilidad a partir de los signos del determinante,
+    la traza y el discriminante (diagrama de Poincaré)
+    
+    Con det > 0 los dos valores propios tienen parte real del signo de la
+    traza; con det = 0 son 0 y la traza; con det < 0 hay uno positivo.
+    """
+    indice = TIPOS_PUNTO_CRITICO.index
+    codigo_tipo = np.select(
+        [signo_det == 0, signo_det < 0, signo_disc > 0, signo_disc == 0, signo_traza == 0],
+        [indice("No único"), indice("Silla"), indice("Nodo"), indice("Nodo Especial"), indice("Centro")],
+        default=indice("Foco o Espiral")).astype(np.uint8)
+    codigo_estabilidad = np.select(
+        [(signo_det < 0) | (signo_traza > 0), (signo_det > 0) & (signo_traza < 0)],
+        [ESTABILIDADES.index("Inestable"), ESTABILIDADES.index("Asintóticamente Estable")],
+        default=ESTABILIDADES.index("Estable")).astype(np.uint8)
+    return codigo_tipo, codigo_estabilidad
+
+
+def _fraccion(valor):
+    """
+    Convierte un coeficiente en Fraction; los float y Decimal se leen por su
+    representación decimal (0.1 -> 1/10), no por su valor binario exacto
+    """
+    if isinstance(valor, Rational):
+        return Fraction(valor)
+    try:
+        return Fraction(str(valor))
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"Coeficiente no representable como fracción: {valor!r}") from None
+
+
+def _invariantes_exactos(coeficientes):
+    """
+    Determinante, traza y discriminante de cada sistema en aritmética racional
+    
+    Args:
+        coeficientes: Tupla con una secuencia de filas (a1, b1, a2, b2) o con
+            cuatro secuencias a1, b1, a2, b2
+            
+    Returns:
+        list: Ternas (determinante, traza, discriminante) de Fraction
+    """
+    if len(coeficientes) == 1:
+        filas = coeficientes[0]
+    elif len(coeficientes) == 4:
+        if len({len(c) for c in coeficientes}) != 1:
+            raise ValueError("Los coeficientes deben ser secuencias de igual longitud")
+        filas = zip(*coeficientes)
+    else:
+        raise ValueError("Se esperaban filas (a1, b1, a2, b2) o cuatro secuencias a1, b1, a2, b2")
+    
+    invariantes = []
+    for fila in filas:
+        if len(fila) != 4:
+            raise ValueError("Cada sistema debe tener cuatro coeficientes a1, b1, a2, b2")
+        a1, b1, a2, b2 = (_fraccion(c) for c in fila)
+        invariantes.append((a1 * b2 - b1 * a2, a1 + b2, (a1 - b2) ** 2 + 4 * b1 * a2))
+    return invariantes
+
+
+def clasificar_robusto(*coeficientes, tolerancia_relativa=TOLERANCIA_RELATIVA, exacto=False,
+                       etiquetas=True):
+    """
+    Clasifica muchos sistemas solo con traza, determinante y discriminante
+    
+    No calcula valores propios: el tipo y la estabilidad salen de los signos
+    de los tres invariantes, de modo que en las fronteras no aparecen "Caso
+    especial complejo" ni "Caso degenerado". Cada invariante se toma como
+    cero cuando su valor absoluto no supera tolerancia_relativa por la
+    escala de la matriz (mayor coeficiente en valor absoluto; al cuadrado
+    para el determinante y el discriminante), así que la clasificación no
+    cambia al multiplicar la matriz por una constante. Solo usa sumas y
+    productos de float64, sin LAPACK ni raíces, por lo que da el mismo
+    resultado en cualquier plataforma.
+    
+    Con exacto=True los invariantes se calculan con fractions.Fraction a
+    partir de la representación decimal de cada coeficiente (enteros,
+    Fraction, Decimal, float o cadenas como "1/3"), sin tolerancias. Es un
+    bucle de Python por sistema, pensado para lotes pequeños.
+    
+    Args:
+        *coeficientes: Un arreglo de forma (N, 4) con columnas (a1, b1, a2, b2),
+            o bien cuatro arreglos 1-D a1, b1, a2, b2 de igual longitud
+        tolerancia_relativa: Tolerancia relativa a la escala de la matriz
+        exacto: Si es True, usa aritmética racional exacta
+        etiquetas: Si es True, incluye también 'tipo' y 'estabilidad' como texto
+        
+    Returns:
+        dict: Arreglos de longitud N con 'determinante', 'traza',
+        'discriminante' (float), 'es_unico', 'codigo_tipo',
+        'codigo_estabilidad' (como en analizar_lote) y 'confiable', que es
+        False cuando algún invariante que decide la clasificación cayó dentro
+        de la tolerancia sin ser exactamente cero: el sistema está sobre una
+        frontera salvo error de redondeo y se clasifica como tal (Centro,
+        Nodo Especial, No único), pero una perturbación mínima lo cambiaría.
+        También es False en las filas cuyos invariantes no son finitos
+        (coeficientes NaN o infinitos, o tan grandes que se desbordan)
+    """
+    if exacto:
+        invariantes = _invariantes_exactos(coeficientes)
+        determinante, traza, discriminante = (
+            np.array([float(fila[i]) for fila in invariantes], dtype=float) for i in range(3))
+        signo_det, signo_traza, signo_disc = (
+            np.array([(fila[i] > 0) - (fila[i] < 0) for fila in invariantes], dtype=np.int8)
+            for i in range(3))
+        confiable = np.ones(len(invariantes), dtype=bool)
+    else:
+        a1, b1, a2, b2 = _columnas_lote(coeficientes)
+        # Con coeficientes no finitos o enormes los invariantes son NaN o
+        # infinitos; se clasifican sin avisos y se marcan como no confiables
+        with np.errstate(over='ignore', invalid='ignore'):
+            determinante = a1 * b2 - b1 * a2
+            traza = a1 + b2
+            discriminante = (a1 - b2) ** 2 + 4.0 * b1 * a2
+            
+            escala = np.maximum(np.maximum(np.abs(a1), np.abs(b1)), np.maximum(np.abs(a2), np.abs(b2)))
+            signo_det, dudoso_det = _signos_con_tolerancia(determinante, tolerancia_relativa * escala ** 2)
+            signo_traza, dudoso_traza = _signos_con_tolerancia(traza, tolerancia_relativa * escala)
+            signo_disc, dudoso_disc = _signos_con_tolerancia(discriminante, tolerancia_relativa * escala ** 2)
+        # La traza solo decide con det >= 0 y el discriminante solo con det > 0
+        confiable = ~(dudoso_det | ((signo_det >= 0) & dudoso_traza) | ((signo_det > 0) & dudoso_disc))
+        confiable &= np.isfinite(determinante) & np.isfinite(traza) & np.isfinite(discriminante)
+    
+    codigo_tipo, codigo_estabilidad = _clasificar_por_signos(signo_det, signo_traza, signo_disc)
+    resultado = {
+        'determinante': determinante,
+        'traza': traza,
+        'discriminante': discriminante,
+        'es_unico': signo_det != 0,
+        'codigo_tipo': codigo_tipo,
+        'codigo_estabilidad': codigo_estabilidad,
+        'confiable': confiable,
+    }
+    if etiquetas:
+        resultado['tipo'] = np.asarray(TIPOS_PUNTO_CRITICO)[codigo_tipo]
+        resultado['estabilidad'] = np.asarray(ESTABILIDADES)[codigo_estabilidad]
+    return resultado
+
+
+def describir_clasificacion(codigo_tipo, codigo_estabilidad, valores_propios):
+    """
+    Texto de analizar_tipo_y_estabilidad a partir de los códigos de analizar_lote
+    
+    Args:
+        codigo_tipo: Índice sobre TIPOS_PUNTO_CRITICO
+        codigo_estabilidad: Índice sobre ESTABILIDADES
+        valores_propios: Par (m1, m2) con los valores propios
+        
+    Returns:
+        str: Tipo, estabilidad y valores propios, o MENSAJE_NO_UNICO
+    """
+    tipo = TIPOS_PUNTO_CRITICO[codigo_tipo]
+    if tipo == "No único":
+        return MENSAJE_NO_UNICO
+    m1, m2 = valores_propios
+    return f"{tipo}\n{ESTABILIDADES[codigo_estabilidad]}\nValores propios: {m1:.3f}, {m2:.3f}"
+
+
+def informacion_completa_lote(coeficientes):
+    """
+    Equivalente de AnalizadorEstabilidad.obtener_informacion_completa para
+    muchos sistemas, con una sola llamada vectorizada a analizar_lote
+    
+    Args:
+        coeficientes: Arreglo de forma (N, 4) con columnas (a1, b1, a2, b2)
+    
+    Returns:
+        list: N diccionarios con las mismas claves y valores que
+        obtener_informacion_completa
+    """
+    coeficientes = np.asarray(coeficientes, dtype=float)
+    lote = analizar_lote(coeficientes, etiquetas=False)
+    informaciones = []
+    for i, (a1, b1, a2, b2) in enumerate(coeficientes):
+        valores_propios = lote['valores_propios'][i]
+        if not valores_propios.imag.any():
+            valores_propios = valores_propios.real
+        tipo_estabilidad = describir_clasificacion(lote['codigo_tipo'][i], lote['codigo_estabilidad'][i],
+                                                   valores_propios)
+        informaciones.append({
+            'coeficientes': {'a1': a1, 'b1': b1, 'a2': a2, 'b2': b2},
+            'matriz': np.array([[a1, b1], [a2, b2]]),
+            'determinante': lote['determinante'][i],
+            'traza': lote['traza'][i],
+            'valores_propios': valores_propios,
+            'es_unico': bool(lote['es_unico'][i]),
+            'tipo_estabilidad': tipo_estabilidad,
+        })
+    return informaciones
+
 
 class AnalizadorEstabilidad:
     """Clase para analizar la estabilidad del punto crítico (0,0)"""
     
+    # Caché compartida de resultados; None desactiva la memoización
+    cache = CACHE_ANALISIS
+    
     def __init__(self, a1, b1, a2, b2):
         """
         Inicializa el analizador con los coeficientes del sistema
@@ -21,18 +493,97 @@ class AnalizadorEstabilidad:
         self.a2 = a2
         self.b2 = b2
         self.matriz = np.array([[a1, b1], [a2, b2]])
+        self._calculos = None
+        
+    def _descomposicion(self):
+        """
+        Obtiene determinante, traza y valores propios, calculados una sola vez
+        
+        El resultado se busca en la caché compartida por los coeficientes
+        cuantizados, de modo que reanalizar la misma matriz no repite cálculos.
+        
+        Returns:
+            dict: Determinante, traza y valores propios (y la clasificación
+            en cuanto se haya calculado)
+        """
+        if self._calculos is None:
+            if self.cache is None:
+                self._calculos = self._calcular_descomposicion()
+            else:
+                clave = cuantizar((self.a1, self.b1, self.a2, self.b2))
+                self._calculos = self.cache.obtener_o_calcular(clave, self._calcular_descomposicion)
+        return self._calculos
+    
+    def _calcular_descomposicion(self):
+        """Calcula determinante, traza y valores propios en forma cerrada"""
+        # Usa el mismo cálculo que analizar_lote, de modo que ambas rutas
+        # clasifican igual incluso en los casos límite de tolerancia
+        traza, determinante, _, m1, m2 = _invariantes_cerrados(self.a1, self.b1, self.a2, self.b2)
+        determinante, traza = float(determinante), float(traza)
+        valores_propios = np.array([m1, m2])
+        if not valores_propios.imag.any():
+            valores_propios = valores_propios.real
+        valores_propios.setflags(write=False)  # Compartido a través de la caché
         
+        return {
+            'determinante': determinante,
+            'traza': traza,
+            'valores_propios': valores_propios,
+        }
+    
     def calcular_determinante(self):
         """Calcula el determinante de la matriz del sistema"""
-        return np.linalg.det(self.matriz)
+        return self._descomposicion()['determinante']
     
     def calcular_traza(self):
         """Calcula la traza de la matriz del sistema"""
-        return np.trace(self.matriz)
+        return self._descomposicion()['traza']
     
     def calcular_valores_propios(self):
-        """Calcula los valores propios de la matriz del sistema"""
-        return np.linalg.eigvals(self.matriz)
+        """
+        Calcula los valores propios de la matriz del sistema en forma cerrada
+        
+        Returns:
+            np.ndarray: Valores propios (reales si el discriminante es no
+            negativo); el arreglo es de solo lectura
+        """
+        return self._descomposicion()['valores_propios']
+    
+    def calcular_vectores_propios(self):
+        """
+        Calcula los vectores propios en forma cerrada, una sola vez por matriz
+        
+        Para cada valor propio real λ, el vector propio es la fila de A - λI
+        de mayor norma girada 90°: (b1, λ - a1) o (λ - b2, a2).
+        
+        Returns:
+            np.ndarray: Arreglo (2, 2) de solo lectura con un vector propio
+            unitario por columna, en el orden de calcular_valores_propios (como
+            np.linalg.eig); None si los valores propios son complejos. Si A es
+            múltiplo de la identidad las columnas son los ejes; con un único
+            vector propio (bloque de Jordan) las dos columnas coinciden
+        """
+        calculos = self._descomposicion()
+        if 'vectores_propios' not in calculos:
+            calculos['vectores_propios'] = self._calcular_vectores_propios(calculos['valores_propios'])
+        return calculos['vectores_propios']
+    
+    def _calcular_vectores_propios(self, valores_propios):
+        """Vectores propios unitarios de valores propios reales (ver calcular_vectores_propios)"""
+        if np.iscomplexobj(valores_propios):
+            return None
+        columnas = []
+        for indice, valor in enumerate(valores_propios):
+            candidatos = np.array([[self.b1, valor - self.a1], [valor - self.b2, self.a2]], dtype=float)
+            normas = np.hypot(candidatos[:, 0], candidatos[:, 1])
+            if normas.max() <= TOLERANCIA * max(1.0, np.abs(self.matriz).max()):
+                # A = λI: cualquier vector es propio
+                columnas.append(np.eye(2)[indice])
+            else:
+                columnas.append(candidatos[normas.argmax()] / normas.max())
+        vectores = np.array(columnas).T
+        vectores.setflags(write=False)  # Compartido a través de la caché
+        return vectores
     
     def es_punto_critico_unico(self):
         """
@@ -42,7 +593,7 @@ class AnalizadorEstabilidad:
             bool: True si es único, False si no es único
         """
         det = self.calcular_determinante()
-        return abs(det) >= 1e-10  # Usar tolerancia numérica
+        return abs(det) >= TOLERANCIA  # Usar tolerancia numérica
     
     def analizar_tipo_y_estabilidad(self):
         """
@@ -51,9 +602,16 @@ class AnalizadorEstabilidad:
         Returns:
             str: Descripción del tipo de punto crítico y su estabilidad
         """
+        calculos = self._descomposicion()
+        if 'resultado' not in calculos:
+            calculos['resultado'] = self._clasificar_sistema()
+        return calculos['resultado']
+    
+    def _clasificar_sistema(self):
+        """Aplica los teoremas de clasificación a los valores propios"""
         # Verificar si el punto crítico es único
         if not self.es_punto_critico_unico():
-            return "El punto crítico (0,0) no es único"
+            return MENSAJE_NO_UNICO
         
         valores_propios = self.calcular_valores_propios()
         m1, m2 = valores_propios[0], valores_propios[1]
@@ -78,7 +636,7 @@ class AnalizadorEstabilidad:
         # Verificar si son valores propios reales
         if np.isreal(m1) and np.isreal(m2):
             # Caso 1: M1 y M2 son reales diferentes
-            if abs(m1 - m2) > 1e-10:
+            if abs(m1 - m2) > TOLERANCIA:
                 if np.sign(m1) == np.sign(m2):
                     return "Nodo"
                 else:
@@ -90,9 +648,9 @@ class AnalizadorEstabilidad:
         # Verificar si son valores propios complejos
         elif not np.isreal(m1) and not np.isreal(m2):
             # Verificar si son conjugados complejos
-            if abs(m1 - np.conj(m2)) < 1e-10:
+            if abs(m1 - np.conj(m2)) < TOLERANCIA:
                 # Verificar si son imaginarios puros (parte real = 0)
-                if abs(np.real(m1)) < 1e-10 and abs(np.real(m2)) < 1e-10:
+                if abs(np.real(m1)) < TOLERANCIA and abs(np.real(m2)) < TOLERANCIA:
                     return "Centro"
                 else:
                     return "Foco o Espiral"
@@ -129,19 +687,47 @@ class AnalizadorEstabilidad:
         else:
             return "Inestable"
     
+    def clasificacion_robusta(self, exacto=False):
+        """
+        Clasifica el sistema con clasificar_robusto (sin valores propios)
+        
+        Args:
+            exacto: Si es True, usa aritmética racional exacta
+            
+        Returns:
+            dict: 'tipo', 'estabilidad' y 'confiable' (False si el sistema
+            está sobre una frontera solo dentro de la tolerancia)
+        """
+        lote = clasificar_robusto([(self.a1, self.b1, self.a2, self.b2)], exacto=exacto)
+        return {
+            'tipo': str(lote['tipo'][0]),
+            'estabilidad': str(lote['estabilidad'][0]),
+            'confiable': bool(lote['confiable'][0]),
+        }
+    
     def obtener_informacion_completa(self):
         """
         Obtiene toda la información del análisis
         
         Returns:
-            dict: Diccionario con toda la información del análisis
+            dict: Diccionario con toda la información del análisis; los
+            valores propios son una copia modificable (los de
+            calcular_valores_propios se comparten a través de la caché)
         """
+        calculos = self._descomposicion()
         return {
             'coeficientes': {'a1': self.a1, 'b1': self.b1, 'a2': self.a2, 'b2': self.b2},
             'matriz': self.matriz,
-            'determinante': self.calcular_determinante(),
-            'traza': self.calcular_traza(),
-            'valores_propios': self.calcular_valores_propios(),
+            'determinante': calculos['determinante'],
+            'traza': calculos['traza'],
+            'valores_propios': calculos['valores_propios'].copy(),
             'es_unico': self.es_punto_critico_unico(),
             'tipo_estabilidad': self.analizar_tipo_y_estabilidad()
         }
+
+
+if __name__ == "__main__":
+    # Línea de comandos sin interfaz gráfica: python -m analisis_estabilidad batch ...
+    import sys
+    from analisis_lotes import main as main_lotes
+    sys.exit(main_lotes())
@@ -0,0 +1,480 @@
+"""
+Módulo para el análisis por lotes sin interfaz gráfica
+
+Lee coeficientes (a1, b1, a2, b2) por trozos desde un archivo o la entrada
+estándar, los clasifica con analizar_lote y escribe los resultados de forma
+incremental en CSV, NPY o Parquet, con memoria acotada por el tamaño del trozo.
+
+Uso:
+    python -m analisis_estabilidad batch entrada.csv -o salida.npy
+    cat entrada.csv | python -m analisis_estabilidad batch - -o - > salida.csv
+
+No importa tkinter ni matplotlib.
+"""
+
+import argparse
+import csv
+import itertools
+import sys
+
+import numpy as np
+
+from analisis_estabilidad import analizar_lote, TIPOS_PUNTO_CRITICO, ESTABILIDADES
+
+
+COLUMNAS_ENTRADA = ('a1', 'b1', 'a2', 'b2')
+COLUMNAS_SALIDA = ('a1', 'b1', 'a2', 'b2', 'determinante', 'traza',
+                   'm1_real', 'm1_imag', 'm2_real', 'm2_imag',
+                   'es_unico', 'tipo', 'estabilidad')
+FORMATOS = ('csv', 'npy', 'parquet')
+FORMATOS_SALIDA = FORMATOS + ('almacen',)  # almacen: directorio columnar (almacen_resultados)
+TAMANO_TROZO = 65536
+
+# Registro de salida NPY: tipo y estabilidad se guardan como códigos sobre
+# TIPOS_PUNTO_CRITICO y ESTABILIDADES
+DTYPE_NPY = np.dtype([(nombre, np.float64) for nombre in COLUMNAS_SALIDA[:10]]
+                     + [('es_unico', np.bool_), ('tipo', np.uint8), ('estabilidad', np.uint8)])
+
+
+def detectar_formato(ruta, por_defecto='csv', formatos=FORMATOS):
+    """
+    Deduce el formato a partir de la extensión del archivo
+    
+    Args:
+        ruta: Ruta del archivo o '-' para entrada/salida estándar
+        por_defecto: Formato usado si la extensión no es reconocida
+        formatos: Formatos admitidos
+    
+    Returns:
+        str: Uno de formatos
+    """
+    extension = ruta.rstrip('/\\').rsplit('.', 1)[-1].lower() if '.' in ruta else ''
+    return extension if extension in formatos else por_defecto
+
+
+def _a_columnas(arreglo):
+    """Convierte un arreglo (N, 4) o estructurado con campos a1..b2 a (N, 4) float"""
+    if arreglo.dtype.names:
+        faltantes = [c for c in COLUMNAS_ENTRADA if c not in arreglo.dtype.names]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en la entrada: {', '.join(faltantes)}")
+        return np.stack([np.asarray(arreglo[c], dtype=float) for c in COLUMNAS_ENTRADA], axis=1)
+    arreglo = np.asarray(arreglo, dtype=float)
+    if arreglo.ndim != 2 or arreglo.shape[1] != 4:
+        raise ValueError("Se esperaba un arreglo de forma (N, 4) con columnas a1, b1, a2, b2")
+    return arreglo
+
+
+def _validar_tamano_trozo(tamano_trozo):
+    """Rechaza tamaños de trozo nulos o negativos"""
+    if tamano_trozo < 1:
+        raise ValueError(f"El tamaño de trozo debe ser mayor que cero: {tamano_trozo}")
+
+
+def leer_trozos_csv(archivo, tamano_trozo=TAMANO_TROZO):
+    """
+    Lee un CSV de coeficientes por trozos
+    
+    Si la primera línea no es numérica se toma como cabecera; si nombra las
+    columnas a1, b1, a2, b2 se usan esas, si no las cuatro primeras.
+    
+    Args:
+        archivo: Objeto de archivo de texto
+        tamano_trozo: Número máximo de filas por trozo
+    
+    Yields:
+        np.ndarray: Trozos de forma (n, 4)
+    
+    Raises:
+        ValueError: Si tamano_trozo es menor que 1
+    """
+    _validar_tamano_trozo(tamano_trozo)
+    lineas = (linea for linea in archivo if linea.strip())
+    primera = next(lineas, None)
+    if primera is None:
+        return
+    
+    campos = [campo.strip() for campo in primera.split(',')]
+    try:
+        [float(campo) for campo in campos]
+        columnas = (0, 1, 2, 3)
+        lineas = itertools.chain([primera], lineas)
+    except ValueError:
+        if all(c in campos for c in COLUMNAS_ENTRADA):
+            columnas = tuple(campos.index(c) for c in COLUMNAS_ENTRADA)
+        else:
+            columnas = (0, 1, 2, 3)
+    
+    while True:
+        bloque = list(itertools.islice(lineas, tamano_trozo))
+        if not bloque:
+            return
+        yield np.loadtxt(bloque, delimiter=',', usecols=columnas, ndmin=2, dtype=float)
+
+
+def leer_trozos_npy(archivo, tamano_trozo=TAMANO_TROZO):
+    """
+    Lee un arreglo NPY por trozos sin cargarlo completo en memoria
+    
+    Los archivos en disco se abren con mmap; los flujos (entrada estándar)
+    se leen secuencialmente a partir de la cabecera.
+    
+    Args:
+        archivo: Ruta del archivo u objeto de archivo binario
+        tamano_trozo: Número máximo de filas por trozo
+    
+    Yields:
+        np.ndarray: Trozos de forma (n, 4)
+    
+    Raises:
+        ValueError: Si tamano_trozo es menor que 1
+    """
+    _validar_tamano_trozo(tamano_trozo)
+    if isinstance(archivo, str):
+        datos = np.load(archivo, mmap_mode='r')
+        for inicio in range(0, len(datos), tamano_trozo):
+            yield _a_columnas(datos[inicio:inicio + tamano_trozo])
+        return
+    
+    version = np.lib.format.read_magic(archivo)
+    if version == (1, 0):
+        forma, orden_fortran, dtype = np.lib.format.read_array_header_1_0(archivo)
+    else:
+        forma, orden_fortran, dtype = np.lib.format.read_array_header_2_0(archivo)
+    if orden_fortran:
+        raise ValueError("No se pueden leer por trozos arreglos NPY en orden Fortran")
+    filas = forma[0] if forma else 0
+    elementos_fila = int(np.prod(forma[1:], dtype=np.int64))
+    
+    for inicio in range(0, filas, tamano_trozo):
+        n = min(tamano_trozo, filas - inicio)
+        contenido = archivo.read(n * elementos_fila * dtype.itemsize)
+        trozo = np.frombuffer(contenido, dtype=dtype).reshape((n,) + tuple(forma[1:]))
+        yield _a_columnas(trozo)
+
+
+def leer_trozos_parquet(ruta, tamano_trozo=TAMANO_TROZO):
+    """
+    Lee un archivo Parquet por lotes de filas (requiere pyarrow)
+    
+    Args:
+        ruta: Ruta del archivo Parquet
+        tamano_trozo: Número máximo de filas por trozo
+    
+    Yields:
+        np.ndarray: Trozos de forma (n, 4)
+    """
+    _validar_tamano_trozo(tamano_trozo)
+    pq = _importar_pyarrow()[1]
+    
+    archivo = pq.ParquetFile(ruta)
+    for lote in archivo.iter_batches(batch_size=tamano_trozo, columns=list(COLUMNAS_ENTRADA)):
+        yield np.stack([lote.column(c).to_numpy(zero_copy_only=False).astype(float)
+                        for c in COLUMNAS_ENTRADA], axis=1)
+
+
+def leer_trozos(ruta, formato=None, tamano_trozo=TAMANO_TROZO):
+    """
+    Lee coeficientes por trozos desde un archivo o la entrada estándar
+    
+    Args:
+        ruta: Ruta del archivo o '-' para la entrada estándar
+        formato: 'csv', 'npy' o 'parquet'; por defecto según la extensión
+        tamano_trozo: Número máximo de filas por trozo
+    
+    Yields:
+        np.ndarray: Trozos de forma (n, 4)
+    """
+    formato = formato or detectar_formato(ruta)
+    
+    if formato == 'csv':
+        if ruta == '-':
+            yield from leer_trozos_csv(sys.stdin, tamano_trozo)
+        else:
+            with open(ruta, newline='') as archivo:
+                yield from leer_trozos_csv(archivo, tamano_trozo)
+    elif formato == 'npy':
+        yield from leer_trozos_npy(sys.stdin.buffer if ruta == '-' else ruta, tamano_trozo)
+    elif formato == 'parquet':
+        if ruta == '-':
+            raise ValueError("Parquet no se puede leer desde la entrada estándar")
+        yield from leer_trozos_parquet(ruta, tamano_trozo)
+    else:
+        raise ValueError(f"Formato de entrada desconocido: {formato}")
+
+
+def _importar_pyarrow():
+    """Importa pyarrow, que solo es necesario para Parquet"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("El formato Parquet requiere pyarrow: pip install pyarrow") from None
+    return pa, pq
+
+
+def cabecera_npy(dtype, forma, longitud=None):
+    """
+    Construye una cabecera NPY v1.0
+    
+    Reservando al abrir la cabecera del mayor número de filas posible, se
+    puede reescribir al cerrar con el número final sin mover los datos.
+    
+    Args:
+        dtype: Tipo de los elementos
+        forma: Forma del arreglo
+        longitud: Longitud total en bytes; por defecto el menor múltiplo de 64
+        
+    Returns:
+        bytes: Cabecera con relleno hasta la longitud
+    """
+    texto = repr({'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                  'fortran_order': False,
+                  'shape': tuple(forma)})
+    if longitud is None:
+        longitud = -(-(10 + len(texto) + 1) // 64) * 64
+    relleno = longitud - 10 - len(texto) - 1
+    cabecera = (texto + ' ' * relleno + '\n').encode('latin1')
+    return b'\x93NUMPY\x01\x00' + len(cabecera).to_bytes(2, 'little') + cabecera
+
+
+class EscritorCSV:
+    """Escribe resultados en CSV fila a fila, con tipo y estabilidad como texto"""
+    
+    def __init__(self, ruta):
+        """
+        Args:
+            ruta: Ruta del archivo o '-' para la salida estándar
+        """
+        self._archivo = sys.stdout if ruta == '-' else open(ruta, 'w', newline='', encoding='utf-8')
+        self._escritor = csv.writer(self._archivo, lineterminator='\n')
+        self._escritor.writerow(COLUMNAS_SALIDA)
+    
+    def escribir(self, coeficientes, resultado):
+        """Escribe un trozo de resultados"""
+        valores_propios = resultado['valores_propios']
+        columnas = [
+            *coeficientes.T,
+            resultado['determinante'], resultado['traza'],
+            valores_propios[:, 0].real, valores_propios[:, 0].imag,
+            valores_propios[:, 1].real, valores_propios[:, 1].imag,
+        ]
+        numeros = np.stack(columnas, axis=1).tolist()
+        tipos = np.asarray(TIPOS_PUNTO_CRITICO)[resultado['codigo_tipo']]
+        estabilidades = np.asarray(ESTABILIDADES)[resultado['codigo_estabilidad']]
+        self._escritor.writerows(
+            fila + [unico, tipo, estabilidad]
+            for fila, unico, tipo, estabilidad
+            in zip(numeros, resultado['es_unico'].tolist(), tipos, estabilidades))
+    
+    def cerrar(self, completo=True):
+        """Vacía y cierra el archivo (completo se acepta por uniformidad con los demás escritores)"""
+        self._archivo.flush()
+        if self._archivo is not sys.stdout:
+            self._archivo.close()
+
+
+class EscritorNPY:
+    """
+    Escribe resultados en un NPY estructurado (DTYPE_NPY) de forma incremental
+    
+    La cabecera se reserva al abrir y se reescribe al cerrar con el número
+    final de filas, por lo que la salida debe ser un archivo con posición.
+    """
+    
+    def __init__(self, ruta):
+        """
+        Args:
+            ruta: Ruta del archivo de salida
+        """
+        if ruta == '-':
+            raise ValueError("La salida NPY requiere un archivo (no la salida estándar)")
+        self._archivo = open(ruta, 'wb')
+        self._filas = 0
+        # Reservar espacio para la cabecera con el mayor número de filas posible
+        self._longitud_cabecera = len(self._cabecera(10 ** 19))
+        self._archivo.write(self._cabecera(0))
+    
+    def _cabecera(self, filas):
+        """Construye la cabecera NPY con la longitud reservada al abrir"""
+        return cabecera_npy(DTYPE_NPY, (filas,), getattr(self, '_longitud_cabecera', None))
+    
+    def escribir(self, coeficientes, resultado):
+        """Escribe un trozo de resultados"""
+        registros = np.empty(len(coeficientes), dtype=DTYPE_NPY)
+        for indice, nombre in enumerate(COLUMNAS_ENTRADA):
+            registros[nombre] = coeficientes[:, indice]
+        registros['determinante'] = resultado['determinante']
+        registros['traza'] = resultado['traza']
+        for indice, nombre in enumerate(('m1', 'm2')):
+            registros[f'{nombre}_real'] = resultado['valores_propios'][:, indice].real
+            registros[f'{nombre}_imag'] = resultado['valores_propios'][:, indice].imag
+        registros['es_unico'] = resultado['es_unico']
+        registros['tipo'] = resultado['codigo_tipo']
+        registros['estabilidad'] = resultado['codigo_estabilidad']
+        
+        self._archivo.write(registros.tobytes())
+        self._filas += len(registros)
+    
+    def cerrar(self, completo=True):
+        """
+        Reescribe la cabecera con el número final de filas y cierra
+        
+        Args:
+            completo: Si es False (la escritura falló) la cabecera conserva
+                cero filas y el archivo se lee como vacío
+        """
+        if completo:
+            self._archivo.seek(0)
+            self._archivo.write(self._cabecera(self._filas))
+        self._archivo.close()
+
+
+class EscritorParquet:
+    """Escribe resultados en Parquet por grupos de filas (requiere pyarrow)"""
+    
+    def __init__(self, ruta):
+        """
+        Args:
+            ruta: Ruta del archivo o '-' para la salida estándar
+        """
+        self._pa, pq = _importar_pyarrow()
+        destino = sys.stdout.buffer if ruta == '-' else ruta
+        self._escritor = None
+        self._crear_escritor = lambda esquema: pq.ParquetWriter(destino, esquema)
+    
+    def escribir(self, coeficientes, resultado):
+        """Escribe un trozo de resultados como un grupo de filas"""
+        pa = self._pa
+        valores_propios = resultado['valores_propios']
+        columnas = {nombre: coeficientes[:, indice] for indice, nombre in enumerate(COLUMNAS_ENTRADA)}
+        columnas.update({
+            'determinante': resultado['determinante'],
+            'traza': resultado['traza'],
+            'm1_real': valores_propios[:, 0].real,
+            'm1_imag': valores_propios[:, 0].imag,
+            'm2_real': valores_propios[:, 1].real,
+            'm2_imag': valores_propios[:, 1].imag,
+            'es_unico': resultado['es_unico'],
+        })
+        tabla = pa.table({
+            **{nombre: pa.array(valores) for nombre, valores in columnas.items()},
+            'tipo': pa.DictionaryArray.from_arrays(resultado['codigo_tipo'],
+                                                   list(TIPOS_PUNTO_CRITICO)),
+            'estabilidad': pa.DictionaryArray.from_arrays(resultado['codigo_estabilidad'],
+                                                          list(ESTABILIDADES)),
+        })
+        if self._escritor is None:
+            self._escritor = self._crear_escritor(tabla.schema)
+        self._escritor.write_table(tabla)
+    
+    def cerrar(self, completo=True):
+        """Cierra el archivo Parquet (completo se acepta por uniformidad con los demás escritores)"""
+        if self._escritor is not None:
+            self._escritor.close()
+
+
+def _escritor_almacen(ruta):
+    """Crea un EscritorAlmacen (importado aquí: almacen_resultados importa este módulo)"""
+    from almacen_resultados import EscritorAlmacen
+    return EscritorAlmacen(ruta)
+
+
+ESCRITORES = {'csv': EscritorCSV, 'npy': EscritorNPY, 'parquet': EscritorParquet,
+              'almacen': _escritor_almacen}
+
+
+def procesar_lotes(entrada, salida, formato_entrada=None, formato_salida=None,
+                   tamano_trozo=TAMANO_TROZO):
+    """
+    Clasifica todos los coeficientes de la entrada y escribe los resultados
+    
+    Args:
+        entrada: Ruta de entrada o '-' para la entrada estándar
+        salida: Ruta de salida o '-' para la salida estándar
+        formato_entrada: Formato de entrada; por defecto según la extensión
+        formato_salida: Formato de salida; por defecto según la extensión
+        tamano_trozo: Número máximo de filas en memoria a la vez
+    
+    Returns:
+        int: Número de sistemas procesados
+    """
+    # Antes de crear la salida, para no dejar un archivo vacío
+    _validar_tamano_trozo(tamano_trozo)
+    formato_salida = formato_salida or detectar_formato(salida, formatos=FORMATOS_SALIDA)
+    if formato_salida not in ESCRITORES:
+        raise ValueError(f"Formato de salida desconocido: {formato_salida}")
+    
+    total = 0
+    escritor = ESCRITORES[formato_salida](salida)
+    try:
+        for trozo in leer_trozos(entrada, formato_entrada, tamano_trozo):
+            escritor.escribir(trozo, analizar_lote(trozo, etiquetas=False))
+            total += len(trozo)
+    except BaseException:
+        # Sin marcar la salida como completa (p. ej. el almacén queda sin esquema)
+        escritor.cerrar(completo=False)
+        raise
+    escritor.cerrar()
+    return total
+
+
+def _entero_positivo(texto):
+    """Tipo de argparse para enteros mayores que cero"""
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaba un entero: {texto!r}") from None
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"debe ser mayor que cero: {valor}")
+    return valor
+
+
+def crear_parser():
+    """Crea el parser de argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog='python -m analisis_estabilidad',
+        description="Análisis de estabilidad sin interfaz gráfica")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+    
+    batch = subparsers.add_parser('batch', aliases=['lote'],
+                                  help="Clasifica coeficientes leídos por trozos")
+    batch.add_argument('entrada', nargs='?', default='-',
+                       help="Archivo CSV/NPY/Parquet con columnas a1, b1, a2, b2 ('-' = stdin)")
+    batch.add_argument('-o', '--salida', default='-',
+                       help="Archivo de salida ('-' = stdout, solo CSV o Parquet), o directorio con "
+                            "--formato-salida almacen")
+    batch.add_argument('--formato-entrada', choices=FORMATOS,
+                       help="Formato de entrada (por defecto según la extensión, o CSV)")
+    batch.add_argument('--formato-salida', choices=FORMATOS_SALIDA,
+                       help="Formato de salida (por defecto según la extensión, o CSV)")
+    batch.add_argument('--tamano-trozo', type=_entero_positivo, default=TAMANO_TROZO,
+                       help=f"Filas procesadas a la vez (por defecto {TAMANO_TROZO})")
+    return parser
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos
+    
+    Args:
+        argv: Lista de argumentos (por defecto sys.argv[1:])
+    
+    Returns:
+        int: Código de salida del proceso
+    """
+    args = crear_parser().parse_args(argv)
+    
+    try:
+        total = procesar_lotes(args.entrada, args.salida, args.formato_entrada,
+                               args.formato_salida, args.tamano_trozo)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    print(f"{total} sistemas procesados", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Módulo para el análisis de estabilidad de sistemas lineales n-dimensionales
+Sistema: x' = Ax con A de tamaño n x n, o una pila de matrices (..., n, n)
+
+Cada matriz se resuelve por la ruta más rápida que le corresponde:
+- n = 2: valores propios en forma cerrada, los mismos que AnalizadorEstabilidad
+- matrices simétricas: eigvalsh (valores propios reales)
+- resto: eigvals de LAPACK sobre la pila completa
+
+La prueba de Hurwitz puede hacerse sin valores propios: con el criterio de
+Routh-Hurwitz para n <= 3, con Cholesky de -A para matrices simétricas o con
+la ecuación de Lyapunov (requiere scipy).
+"""
+
+import numpy as np
+
+from analisis_estabilidad import (_invariantes_cerrados, _clasificar, TOLERANCIA,
+                                  TIPOS_PUNTO_CRITICO, ESTABILIDADES)
+
+
+METODOS_HURWITZ = ('auto', 'valores_propios', 'routh', 'lyapunov')
+
+# Número de matrices por llamada a LAPACK en los lotes grandes
+TAMANO_TROZO = 8192
+
+
+def _escalar(valor, es_lote):
+    """Devuelve el arreglo tal cual en lotes y como escalar de Python si no"""
+    return valor if es_lote else valor[()].item()
+
+
+class AnalizadorLineal:
+    """Clase para analizar la estabilidad del origen en x' = Ax, con A de n x n"""
+    
+    def __init__(self, matriz, tolerancia=TOLERANCIA):
+        """
+        Inicializa el analizador
+        
+        Args:
+            matriz: Matriz (n, n) o pila de matrices (..., n, n)
+            tolerancia: Parte real por debajo de la cual (en valor absoluto)
+                un valor propio se considera del subespacio centro
+        """
+        matriz = np.asarray(matriz, dtype=float)
+        if matriz.ndim < 2 or matriz.shape[-1] != matriz.shape[-2]:
+            raise ValueError("Se esperaba una matriz cuadrada (n, n) o una pila (..., n, n)")
+        self.matriz = matriz
+        self.n = matriz.shape[-1]
+        self.forma_lote = matriz.shape[:-2]
+        self.es_lote = matriz.ndim > 2
+        self.tolerancia = tolerancia
+        self._valores_propios = None
+        self._simetricas = None
+    
+    @classmethod
+    def desde_coeficientes(cls, a1, b1, a2, b2, tolerancia=TOLERANCIA):
+        """
+        Crea el analizador del sistema 2x2 x' = a1*x + b1*y, y' = a2*x + b2*y
+        
+        Args:
+            a1, b1, a2, b2: Coeficientes (escalares o arreglos de igual forma)
+            tolerancia: Ver __init__
+        
+        Returns:
+            AnalizadorLineal: Analizador de la matriz o pila de matrices 2x2
+        """
+        a1, b1, a2, b2 = np.broadcast_arrays(*(np.asarray(c, dtype=float) for c in (a1, b1, a2, b2)))
+        matriz = np.stack([np.stack([a1, b1], axis=-1), np.stack([a2, b2], axis=-1)], axis=-2)
+        return cls(matriz, tolerancia)
+    
+    def _lote(self):
+        """Las matrices como pila plana (N, n, n)"""
+        return self.matriz.reshape(-1, self.n, self.n)
+    
+    def _es_simetrica(self):
+        """Máscara plana (N,) de las matrices simétricas (salvo redondeo)"""
+        if self._simetricas is None:
+            lote = self._lote()
+            asimetria = np.abs(lote - lote.transpose(0, 2, 1)).max(axis=(1, 2), initial=0.0)
+            escala = np.abs(lote).max(axis=(1, 2), initial=0.0)
+            self._simetricas = asimetria <= 1e-12 * np.maximum(escala, 1.0)
+        return self._simetricas
+    
+    def valores_propios(self):
+        """
+        Calcula los valores propios por la ruta más rápida de cada matriz
+        
+        Returns:
+            np.ndarray: Arreglo complejo (..., n); para n = 2 en el orden de
+            AnalizadorEstabilidad y para matrices simétricas en orden creciente
+        """
+        if self._valores_propios is None:
+            lote = self._lote()
+            valores = np.empty(lote.shape[:2], dtype=complex)
+            
+            if self.n == 2:
+                a1, b1 = lote[:, 0, 0], lote[:, 0, 1]
+                a2, b2 = lote[:, 1, 0], lote[:, 1, 1]
+                m1, m2 = _invariantes_cerrados(a1, b1, a2, b2)[3:]
+                valores[:, 0], valores[:, 1] = m1, m2
+            else:
+                simetricas = self._es_simetrica()
+                for inicio in range(0, len(lote), TAMANO_TROZO):
+                    trozo = slice(inicio, inicio + TAMANO_TROZO)
+                    sim = simetricas[trozo]
+                    indices = np.arange(inicio, min(inicio + TAMANO_TROZO, len(lote)))
+                    if sim.any():
+                        valores[indices[sim]] = np.linalg.eigvalsh(lote[indices[sim]])
+                    if not sim.all():
+                        valores[indices[~sim]] = np.linalg.eigvals(lote[indices[~sim]])
+            
+            self._valores_propios = valores.reshape(self.forma_lote + (self.n,))
+        return self._valores_propios
+    
+    def abscisa_espectral(self):
+        """
+        Calcula la abscisa espectral: la mayor parte real de los valores propios
+        
+        Returns:
+            float o np.ndarray: Abscisa de cada matriz
+        """
+        return _escalar(np.real(self.valores_propios()).max(axis=-1), self.es_lote)
+    
+    def dimensiones_subespacios(self):
+        """
+        Calcula las dimensiones de los subespacios estable, inestable y centro
+        
+        Returns:
+            dict: 'estable', 'inestable' y 'centro' (enteros o arreglos de enteros)
+        """
+        partes_reales = np.real(self.valores_propios())
+        centro = np.abs(partes_reales) <= self.tolerancia
+        return {
+            'estable': _escalar(np.sum((partes_reales < 0) & ~centro, axis=-1), self.es_lote),
+            'inestable': _escalar(np.sum((partes_reales > 0) & ~centro, axis=-1), self.es_lote),
+            'centro': _escalar(np.sum(centro, axis=-1), self.es_lote),
+        }
+    
+    def es_hurwitz(self, metodo='auto'):
+        """
+        Indica si la matriz es de Hurwitz (todos los valores propios con parte
+        real negativa), es decir, si el origen es asintóticamente estable
+        
+        Args:
+            metodo: 'valores_propios'; 'routh' (criterio de Routh-Hurwitz,
+                n <= 3); 'lyapunov' (ecuación de Lyapunov, requiere scipy); o
+                'auto', que evita calcular valores propios cuando puede
+        
+        Returns:
+            bool o np.ndarray: Resultado de cada matriz
+        """
+        if metodo not in METODOS_HURWITZ:
+            raise ValueError(f"Método de Hurwitz desconocido: {metodo}")
+        if metodo == 'auto':
+            if self._valores_propios is not None:
+                metodo = 'valores_propios'
+            elif self.n <= 3:
+                metodo = 'routh'
+        
+        if metodo == 'valores_propios':
+            resultado = np.real(self.valores_propios()).max(axis=-1) < 0
+        elif metodo == 'routh':
+            resultado = self._hurwitz_routh()
+        elif metodo == 'lyapunov':
+            resultado = self._hurwitz_lyapunov()
+        else:
+            resultado = self._hurwitz_general()
+        
+        return _escalar(np.asarray(resultado).reshape(self.forma_lote), self.es_lote)
+    
+    def _hurwitz_routh(self):
+        """
+        Criterio de Routh-Hurwitz con los coeficientes del polinomio
+        característico s^n + c1 s^(n-1) + ... + cn, sin valores propios
+        """
+        if self.n > 3:
+            raise ValueError("El criterio de Routh-Hurwitz solo está implementado para n <= 3")
+        lote = self._lote()
+        traza = np.trace(lote, axis1=1, axis2=2)
+        if self.n == 1:
+            return traza < 0
+        
+        determinante = np.linalg.det(lote)
+        if self.n == 2:
+            return (traza < 0) & (determinante > 0)
+        
+        # c2 es la suma de los menores principales 2x2: (tr(A)^2 - tr(A^2)) / 2
+        c1 = -traza
+        c2 = 0.5 * (traza ** 2 - np.einsum('kij,kji->k', lote, lote))
+        c3 = -determinante
+        return (c1 > 0) & (c3 > 0) & (c1 * c2 > c3)
+    
+    def _hurwitz_general(self):
+        """Cholesky de -A para las simétricas y valores propios para el resto"""
+        lote = self._lote()
+        simetricas = self._es_simetrica()
+        resultado = np.empty(len(lote), dtype=bool)
+        
+        if simetricas.any():
+            # Una matriz simétrica es de Hurwitz si y solo si -A es definida positiva
+            try:
+                np.linalg.cholesky(-lote[simetricas])
+                resultado[simetricas] = True
+            except np.linalg.LinAlgError:
+                # Algún elemento de la pila no lo es: un solo eigvalsh por lotes sobre
+                # todas las simétricas decide cuáles son de Hurwitz
+                resultado[simetricas] = np.linalg.eigvalsh(lote[simetricas]).max(axis=1) < 0
+        if not simetricas.all():
+            resultado[~simetricas] = np.real(np.linalg.eigvals(lote[~simetricas])).max(axis=1) < 0
+        return resultado
+    
+    def _hurwitz_lyapunov(self):
+        """
+        Resuelve A^T P + P A = -I: A es de Hurwitz si y solo si P es definida
+        positiva
+        """
+        from scipy.linalg import solve_continuous_lyapunov
+        
+        identidad = np.eye(self.n)
+        resultado = []
+        for matriz in self._lote():
+            try:
+                P = solve_continuous_lyapunov(matriz.T, -identidad)
+                np.linalg.cholesky(0.5 * (P + P.T))
+                resultado.append(bool(np.all(np.isfinite(P))))
+            except (np.linalg.LinAlgError, ValueError):
+                resultado.append(False)
+        return np.array(resultado, dtype=bool)
+    
+    def clasificar_2x2(self):
+        """
+        Clasifica sistemas 2x2 con las reglas de AnalizadorEstabilidad
+        
+        Returns:
+            tuple: (tipo, estabilidad) como etiquetas de TIPOS_PUNTO_CRITICO y
+            ESTABILIDADES (arreglos de texto en lotes)
+        """
+        if self.n != 2:
+            raise ValueError("La clasificación por tipo de punto crítico solo aplica a sistemas 2x2")
+        valores = self.valores_propios()
+        lote = self._lote()
+        determinante = lote[:, 0, 0] * lote[:, 1, 1] - lote[:, 0, 1] * lote[:, 1, 0]
+        codigo_tipo, codigo_estabilidad = _clasificar(valores[..., 0].ravel(), valores[..., 1].ravel(),
+                                                      np.abs(determinante) >= TOLERANCIA)
+        tipo = np.asarray(TIPOS_PUNTO_CRITICO)[codigo_tipo].reshape(self.forma_lote)
+        estabilidad = np.asarray(ESTABILIDADES)[codigo_estabilidad].reshape(self.forma_lote)
+        return _escalar(tipo, self.es_lote), _escalar(estabilidad, self.es_lote)
+    
+    def analizar(self):
+        """
+        Obtiene toda la información de estabilidad
+        
+        Returns:
+            dict: Valores propios, abscisa espectral, dimensiones de los
+            subespacios y si la matriz es de Hurwitz
+        """
+        valores = self.valores_propios()
+        return {
+            'n': self.n,
+            'valores_propios': valores,
+            'abscisa_espectral': self.abscisa_espectral(),
+            'dimensiones': self.dimensiones_subespacios(),
+            'es_hurwitz': self.es_hurwitz('valores_propios'),
+        }
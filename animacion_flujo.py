@@ -0,0 +1,229 @@
+"""
+Módulo para animar partículas que siguen el flujo de un sistema lineal
+
+Como el sistema es lineal, un paso de tiempo Δt es una multiplicación por la
+matriz e^{AΔt}: cada cuadro se obtiene del anterior con un único producto de
+matrices sobre todas las partículas. Los cuadros se precalculan en un búfer
+contiguo (cuadros, partículas, 2) de float32 que se usa como anillo: tras
+mostrar un cuadro, su hueco se rellena con el cuadro que va "cuadros" pasos
+por delante, así que la memoria no crece por larga que sea la animación.
+
+La reproducción actualiza un único scatter animado y lo pinta con blitting
+sobre el fondo guardado de la gráfica (ejes, campo y trayectorias).
+"""
+
+import time
+
+import numpy as np
+import tkinter as tk
+
+from instrumentacion import etapa
+
+
+FPS_OBJETIVO = 60
+
+
+class AnimacionFlujo:
+    """Partículas animadas sobre una GraficaTrayectorias conectada a su canvas"""
+    
+    def __init__(self, grafica, matriz_paso, limites=None, particulas=2000, cuadros=120,
+                 vida=90, semilla=0):
+        """
+        Precalcula los cuadros y crea el scatter de las partículas
+        
+        Args:
+            grafica: GraficaTrayectorias con canvas (ver conectar_canvas)
+            matriz_paso: Matriz 2x2 e^{AΔt} que avanza un cuadro
+            limites: Tupla (x_min, x_max, y_min, y_max); por defecto los de la
+                gráfica
+            particulas: Número de partículas
+            cuadros: Cuadros del búfer en anillo
+            vida: Vida media en cuadros; las partículas renacen en un punto
+                aleatorio al agotarla o al salir de la región, para que los
+                flujos convergentes no se vacíen
+            semilla: Semilla del generador aleatorio
+        """
+        self.grafica = grafica
+        self.canvas = grafica.canvas
+        self.limites = tuple(limites if limites is not None else grafica.limites)
+        self.cuadros = cuadros
+        self._paso_t = np.ascontiguousarray(np.asarray(matriz_paso, dtype=np.float32).T)
+        self._generador = np.random.default_rng(semilla)
+        self._vidas = self._generador.integers(max(1, vida // 2), vida + vida // 2 + 1, particulas)
+        self._edades = self._generador.integers(0, vida, particulas)  # Escalonadas
+        self._id_after = None
+        self._fondo = None
+        self._intervalo = 1.0 / FPS_OBJETIVO
+        self._ultimo_tick = None
+        self.fps = 0.0
+        
+        # Búfer en anillo: el hueco k contiene el cuadro que se mostrará k pasos después
+        self.buffer = np.empty((cuadros, particulas, 2), dtype=np.float32)
+        self.buffer[0] = self._posiciones_aleatorias(particulas)
+        for k in range(1, cuadros):
+            self._avanzar(self.buffer[k - 1], self.buffer[k])
+        self._cuadro = 0
+        
+        self.scatter = grafica.ax.scatter(self.buffer[0, :, 0], self.buffer[0, :, 1], s=4, c='black',
+                                          alpha=0.6, linewidths=0, zorder=5, animated=True)
+        self._id_dibujo = self.canvas.mpl_connect('draw_event', self._al_dibujar)
+        self._guardar_fondo()
+    
+    def _posiciones_aleatorias(self, n):
+        """Posiciones uniformes en la región"""
+        x_min, x_max, y_min, y_max = self.limites
+        return self._generador.uniform((x_min, y_min), (x_max, y_max), (n, 2)).astype(np.float32)
+    
+    def _avanzar(self, origen, destino):
+        """Calcula en destino el cuadro siguiente a origen (un producto de matrices)"""
+        np.matmul(origen, self._paso_t, out=destino)
+        self._edades += 1
+        
+        x_min, x_max, y_min, y_max = self.limites
+        with np.errstate(invalid='ignore'):
+            fuera = ~((destino[:, 0] >= x_min) & (destino[:, 0] <= x_max)
+                      & (destino[:, 1] >= y_min) & (destino[:, 1] <= y_max))
+        renacen = fuera | (self._edades >= self._vidas)
+        if renacen.any():
+            destino[renacen] = self._posiciones_aleatorias(np.count_nonzero(renacen))
+            self._edades[renacen] = 0
+    
+    def _guardar_fondo(self):
+        """Copia la gráfica tal como está dibujada, sin las partículas"""
+        try:
+            self._fondo = self.canvas.copy_from_bbox(self.grafica.ax.bbox)
+        except (AttributeError, RuntimeError):
+            self._fondo = None  # Aún no hay un dibujo completo
+    
+    def _al_dibujar(self, evento):
+        """Tras un dibujo completo (p. ej. al redimensionar), renovar el fondo"""
+        self._guardar_fondo()
+        self.dibujar_cuadro(avanzar=False)
+    
+    def dibujar_cuadro(self, avanzar=True):
+        """
+        Pinta el cuadro actual con blitting y rellena su hueco del anillo
+        
+        Args:
+            avanzar: Si es False, repinta el cuadro actual sin consumirlo
+        """
+        if self._fondo is None:
+            return
+        with etapa('animacion/cuadro'):
+            posiciones = self.buffer[self._cuadro]
+            self.canvas.restore_region(self._fondo)
+            self.scatter.set_offsets(posiciones)
+            self.grafica.ax.draw_artist(self.scatter)
+            self.canvas.blit(self.grafica.ax.bbox)
+            
+            if avanzar:
+                # El hueco mostrado pasa a ser el cuadro más adelantado del anillo
+                anterior = (self._cuadro - 1) % self.cuadros
+                self._avanzar(self.buffer[anterior], posiciones)
+                self._cuadro = (self._cuadro + 1) % self.cuadros
+    
+    def iniciar(self, fps=FPS_OBJETIVO):
+        """
+        Reproduce la animación con el bucle de eventos de Tk
+        
+        Args:
+            fps: Cuadros por segundo objetivo
+        """
+        self.detener(quitar=False)
+        self._intervalo = 1.0 / fps
+        self._ultimo_tick = time.perf_counter()
+        self._id_after = self.canvas.get_tk_widget().after(0, self._tick)
+    
+    def _tick(self):
+        """Dibuja un cuadro y agenda el siguiente descontando el tiempo empleado"""
+        widget = self.canvas.get_tk_widget()
+        if not widget.winfo_exists():
+            self._id_after = None
+            return
+        inicio = time.perf_counter()
+        self.dibujar_cuadro()
+        
+        transcurrido = inicio - self._ultimo_tick
+        if transcurrido > 0:
+            self.fps = 0.9 * self.fps + 0.1 / transcurrido if self.fps else 1.0 / transcurrido
+        self._ultimo_tick = inicio
+        espera = self._intervalo - (time.perf_counter() - inicio)
+        self._id_after = widget.after(max(1, int(espera * 1000)), self._tick)
+    
+    @property
+    def activa(self):
+        """Indica si la animación se está reproduciendo"""
+        return self._id_after is not None
+    
+    def detener(self, quitar=True):
+        """
+        Detiene la reproducción
+        
+        Args:
+            quitar: Si es True, retira además las partículas de la gráfica
+        """
+        if self._id_after is not None:
+            try:
+                self.canvas.get_tk_widget().after_cancel(self._id_after)
+            except tk.TclError:
+                pass  # El widget ya se destruyó
+            self._id_after = None
+        if quitar and self.scatter is not None:
+            self.canvas.mpl_disconnect(self._id_dibujo)
+            self.scatter.remove()
+            self.scatter = None
+            if self._fondo is not None:
+                # Restaurar la gráfica sin partículas
+                self.canvas.restore_region(self._fondo)
+                self.canvas.blit(self.grafica.ax.bbox)
+
+
+def crear_animacion_sin_ventana(particulas=2000, cuadros=120, figura_tamano=(8, 6),
+                                coeficientes=(-0.3, 2.0, -2.0, -0.3)):
+    """
+    Crea una animación sobre una figura con canvas Agg, sin ventana
+    
+    Args:
+        particulas: Número de partículas
+        cuadros: Cuadros del búfer en anillo
+        figura_tamano: Tamaño de la figura en pulgadas
+        coeficientes: Tupla (a1, b1, a2, b2) del sistema; por defecto un foco
+    
+    Returns:
+        AnimacionFlujo: Animación lista para dibujar_cuadro
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from visualizador_sistema import VisualizadorSistema, GraficaTrayectorias
+    
+    visualizador = VisualizadorSistema(figura_tamano)
+    fig = Figure(figsize=figura_tamano)
+    canvas = FigureCanvasAgg(fig)
+    grafica = GraficaTrayectorias(fig, animada=True)
+    grafica.actualizar(visualizador.calcular_datos_grafica(*coeficientes))
+    grafica.conectar_canvas(canvas)
+    canvas.draw()
+    return AnimacionFlujo(grafica, visualizador.matriz_paso(*coeficientes, grafica.limites),
+                          particulas=particulas, cuadros=cuadros)
+
+
+def medir_fps_animacion(particulas=2000, cuadros=120, repeticiones=300, figura_tamano=(8, 6)):
+    """
+    Mide los cuadros por segundo de la animación sin ventana (backend Agg)
+    
+    Solo mide el dibujo y el avance del anillo, sin esperas entre cuadros.
+    
+    Args:
+        particulas: Número de partículas
+        cuadros: Cuadros del búfer en anillo
+        repeticiones: Cuadros a dibujar
+        figura_tamano: Tamaño de la figura en pulgadas
+    
+    Returns:
+        float: Cuadros por segundo
+    """
+    animacion = crear_animacion_sin_ventana(particulas, cuadros, figura_tamano)
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        animacion.dibujar_cuadro()
+    return repeticiones / (time.perf_counter() - inicio)
@@ -0,0 +1,284 @@
+"""
+Módulo para barridos de parámetros en varios núcleos
+
+Recorre la rejilla cartesiana de coeficientes (a1, b1, a2, b2), la divide en
+trozos y los clasifica con analizar_lote en un ProcessPoolExecutor. Los
+resultados se escriben directamente en arreglos de memoria compartida, de
+modo que no se serializan de vuelta al proceso principal.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from almacen_resultados import EscritorAlmacen
+from analisis_estabilidad import analizar_lote, TIPOS_PUNTO_CRITICO
+
+
+TAMANO_TROZO = 262144
+
+# Arreglos de salida: nombre -> (dtype, columnas por sistema)
+SALIDAS = {
+    'codigo_tipo': (np.uint8, 1),
+    'codigo_estabilidad': (np.uint8, 1),
+    'determinante': (np.float64, 1),
+    'traza': (np.float64, 1),
+    'valores_propios': (np.complex128, 2),
+}
+
+# Estado de cada proceso trabajador, fijado por _inicializar_trabajador
+_estado_trabajador = {}
+
+
+def construir_ejes(rangos):
+    """
+    Convierte la especificación de rangos en los valores de cada eje
+    
+    Args:
+        rangos: Secuencia de cuatro elementos (a1, b1, a2, b2); cada uno es
+            una tupla (minimo, maximo, n) o un arreglo 1-D de valores
+    
+    Returns:
+        tuple: Cuatro arreglos 1-D de float
+    """
+    if len(rangos) != 4:
+        raise ValueError("Se esperaban cuatro rangos: a1, b1, a2, b2")
+    
+    ejes = []
+    for rango in rangos:
+        if isinstance(rango, tuple) and len(rango) == 3:
+            minimo, maximo, n = rango
+            eje = np.linspace(minimo, maximo, int(n))
+        else:
+            eje = np.asarray(rango, dtype=float).ravel()
+        if eje.size == 0:
+            raise ValueError("Cada rango debe contener al menos un valor")
+        ejes.append(eje)
+    return tuple(ejes)
+
+
+def _procesar_trozo(ejes, salidas, inicio, fin):
+    """
+    Clasifica los sistemas [inicio, fin) de la rejilla y escribe en salidas
+    
+    Args:
+        ejes: Valores de los cuatro ejes
+        salidas: Diccionario de arreglos de salida (longitud total)
+        inicio, fin: Índices planos del trozo
+    
+    Returns:
+        int: Número de sistemas procesados
+    """
+    forma = tuple(len(eje) for eje in ejes)
+    indices = np.unravel_index(np.arange(inicio, fin), forma)
+    coeficientes = [eje[indice] for eje, indice in zip(ejes, indices)]
+    
+    resultado = analizar_lote(*coeficientes, etiquetas=False)
+    for nombre, arreglo in salidas.items():
+        arreglo[inicio:fin] = resultado[nombre]
+    return fin - inicio
+
+
+def _adjuntar_memoria(nombre):
+    """Se adjunta a un bloque de memoria compartida creado por el proceso principal"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    
+    # Antes de 3.13 el trabajador registraría el bloque en el resource_tracker
+    # y este lo liberaría o avisaría de una fuga; solo el proceso principal lo libera
+    from multiprocessing import resource_tracker
+    registrar = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=nombre)
+    finally:
+        resource_tracker.register = registrar
+
+
+def _vista(memoria, nombre, total):
+    """Crea la vista NumPy de un arreglo de salida sobre su bloque compartido"""
+    dtype, columnas = SALIDAS[nombre]
+    forma = (total,) if columnas == 1 else (total, columnas)
+    return np.ndarray(forma, dtype=dtype, buffer=memoria.buf)
+
+
+def _vista_local(nombre, total):
+    """Crea un arreglo de salida en memoria del proceso actual"""
+    dtype, columnas = SALIDAS[nombre]
+    forma = (total,) if columnas == 1 else (total, columnas)
+    return np.empty(forma, dtype=dtype)
+
+
+def _inicializar_trabajador(ejes, nombres_memoria, total):
+    """Inicializa un proceso trabajador con los ejes y las vistas compartidas"""
+    memorias = {nombre: _adjuntar_memoria(bloque) for nombre, bloque in nombres_memoria.items()}
+    _estado_trabajador['ejes'] = ejes
+    _estado_trabajador['memorias'] = memorias
+    _estado_trabajador['salidas'] = {nombre: _vista(memoria, nombre, total)
+                                     for nombre, memoria in memorias.items()}
+
+
+def _procesar_trozo_trabajador(inicio, fin):
+    """Procesa un trozo dentro de un proceso trabajador"""
+    return _procesar_trozo(_estado_trabajador['ejes'], _estado_trabajador['salidas'], inicio, fin)
+
+
+def imprimir_progreso(completados, total, sistemas_por_segundo):
+    """Callback de progreso que escribe una línea en stderr"""
+    porcentaje = 100.0 * completados / total if total else 100.0
+    print(f"\r{completados}/{total} sistemas ({porcentaje:5.1f}%) "
+          f"- {sistemas_por_segundo:,.0f} sistemas/s", end='', file=sys.stderr)
+    if completados == total:
+        print(file=sys.stderr)
+
+
+class ResultadoBarrido:
+    """Resultados de un barrido de parámetros sobre una rejilla cartesiana"""
+    
+    def __init__(self, ejes, salidas, duracion):
+        """
+        Args:
+            ejes: Valores de los cuatro ejes (a1, b1, a2, b2)
+            salidas: Diccionario de arreglos planos por nombre
+            duracion: Tiempo total del barrido en segundos
+        """
+        self.ejes = ejes
+        self.forma = tuple(len(eje) for eje in ejes)
+        self.total = int(np.prod(self.forma))
+        self.duracion = duracion
+        self.sistemas_por_segundo = self.total / duracion if duracion > 0 else float('inf')
+        for nombre, arreglo in salidas.items():
+            setattr(self, nombre, arreglo)
+        self.valores_propios = salidas.get('valores_propios')
+    
+    def coeficientes(self, indices=None):
+        """
+        Obtiene los coeficientes de los sistemas con los índices planos dados
+        
+        Args:
+            indices: Índices planos; por defecto todos los sistemas
+        
+        Returns:
+            np.ndarray: Arreglo (n, 4) con columnas a1, b1, a2, b2
+        """
+        if indices is None:
+            indices = np.arange(self.total)
+        indices = np.unravel_index(np.asarray(indices), self.forma)
+        return np.stack([eje[indice] for eje, indice in zip(self.ejes, indices)], axis=-1)
+    
+    def guardar(self, directorio, tamano_trozo=TAMANO_TROZO):
+        """
+        Guarda el barrido en un almacén columnar (ver almacen_resultados)
+        
+        Si el barrido no guardó los valores propios, se recalculan por trozos.
+        
+        Args:
+            directorio: Directorio del almacén
+            tamano_trozo: Sistemas escritos a la vez
+        
+        Returns:
+            int: Número de sistemas guardados
+        """
+        escritor = EscritorAlmacen(directorio)
+        try:
+            for inicio in range(0, self.total, tamano_trozo):
+                fin = min(inicio + tamano_trozo, self.total)
+                coeficientes = self.coeficientes(np.arange(inicio, fin))
+                if self.valores_propios is None:
+                    resultado = analizar_lote(coeficientes, etiquetas=False)
+                else:
+                    resultado = {nombre: getattr(self, nombre)[inicio:fin] for nombre in SALIDAS}
+                resultado['es_unico'] = resultado['codigo_tipo'] != TIPOS_PUNTO_CRITICO.index("No único")
+                escritor.escribir(coeficientes, resultado)
+        except BaseException:
+            escritor.cerrar(completo=False)
+            raise
+        escritor.cerrar()
+        return self.total
+    
+    def como_rejilla(self, nombre):
+        """
+        Devuelve un arreglo de salida con la forma de la rejilla (n_a1, n_b1, n_a2, n_b2)
+        
+        Args:
+            nombre: Nombre del arreglo, p. ej. 'codigo_tipo'
+        
+        Returns:
+            np.ndarray: Vista del arreglo con la forma de la rejilla
+        """
+        arreglo = getattr(self, nombre)
+        return arreglo.reshape(self.forma + arreglo.shape[1:])
+
+
+def barrer_parametros(rangos, trabajadores=None, tamano_trozo=TAMANO_TROZO,
+                      progreso=None, valores_propios=False):
+    """
+    Clasifica todos los sistemas de una rejilla de coeficientes en paralelo
+    
+    Los resultados no dependen del número de trabajadores: cada sistema se
+    clasifica de forma independiente con las mismas operaciones elemento a
+    elemento.
+    
+    Args:
+        rangos: Rangos de (a1, b1, a2, b2); ver construir_ejes
+        trabajadores: Número de procesos (por defecto os.cpu_count()); con 1
+            se procesa en el proceso actual
+        tamano_trozo: Número de sistemas por tarea
+        progreso: Callback progreso(completados, total, sistemas_por_segundo)
+        valores_propios: Si es True, guarda también los valores propios (N, 2)
+    
+    Returns:
+        ResultadoBarrido: Arreglos de resultados y rendimiento del barrido
+    """
+    ejes = construir_ejes(rangos)
+    total = int(np.prod([len(eje) for eje in ejes]))
+    trabajadores = trabajadores or os.cpu_count() or 1
+    nombres = [nombre for nombre in SALIDAS if valores_propios or nombre != 'valores_propios']
+    trozos = [(inicio, min(inicio + tamano_trozo, total))
+              for inicio in range(0, total, tamano_trozo)]
+    
+    inicio_reloj = time.perf_counter()
+    completados = 0
+    
+    def notificar(n):
+        nonlocal completados
+        completados += n
+        if progreso:
+            transcurrido = time.perf_counter() - inicio_reloj
+            progreso(completados, total, completados / transcurrido if transcurrido > 0 else 0.0)
+    
+    if trabajadores == 1 or len(trozos) <= 1:
+        salidas = {nombre: _vista_local(nombre, total) for nombre in nombres}
+        for inicio, fin in trozos:
+            notificar(_procesar_trozo(ejes, salidas, inicio, fin))
+        return ResultadoBarrido(ejes, salidas, time.perf_counter() - inicio_reloj)
+    
+    memorias = {}
+    try:
+        for nombre in nombres:
+            dtype, columnas = SALIDAS[nombre]
+            tamano = max(total * columnas * np.dtype(dtype).itemsize, 1)
+            memorias[nombre] = shared_memory.SharedMemory(create=True, size=tamano)
+        
+        nombres_memoria = {nombre: memoria.name for nombre, memoria in memorias.items()}
+        with ProcessPoolExecutor(max_workers=trabajadores,
+                                 initializer=_inicializar_trabajador,
+                                 initargs=(ejes, nombres_memoria, total)) as ejecutor:
+            futuros = [ejecutor.submit(_procesar_trozo_trabajador, inicio, fin)
+                       for inicio, fin in trozos]
+            for futuro in as_completed(futuros):
+                notificar(futuro.result())
+        
+        # Copiar fuera de la memoria compartida antes de liberarla
+        salidas = {nombre: _vista(memoria, nombre, total).copy()
+                   for nombre, memoria in memorias.items()}
+    finally:
+        for memoria in memorias.values():
+            memoria.close()
+            memoria.unlink()
+    
+    return ResultadoBarrido(ejes, salidas, time.perf_counter() - inicio_reloj)
@@ -0,0 +1,126 @@
+"""
+Prueba de carga del servicio HTTP local contra localhost
+
+Arranca servidor_analisis.py en un proceso aparte (puerto libre), lanza
+clientes concurrentes contra /analyze y /portrait y muestra el rendimiento
+medido por los clientes y las métricas del servidor (/metrics):
+
+    python benchmarks/carga_servidor.py
+    python benchmarks/carga_servidor.py --clientes 64 --peticiones 200 --retratos 20
+
+Termina con código 1 si alguna respuesta no es 200 (o 503 en /portrait,
+que es la contrapresión esperada cuando la cola de retratos se llena).
+"""
+
+import argparse
+import http.client
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_DIRECCION = re.compile(r"http://([^:]+):(\d+)")
+
+
+def arrancar_servidor(trabajadores):
+    """
+    Arranca el servidor en un proceso nuevo y espera a que escuche
+    
+    Returns:
+        tuple: (proceso, host, puerto)
+    """
+    orden = [sys.executable, os.path.join(RAIZ, 'servidor_analisis.py'), '--puerto', '0']
+    if trabajadores:
+        orden += ['--trabajadores', str(trabajadores)]
+    proceso = subprocess.Popen(orden, cwd=RAIZ, stderr=subprocess.PIPE, text=True)
+    linea = proceso.stderr.readline()
+    coincidencia = _DIRECCION.search(linea)
+    if coincidencia is None:
+        proceso.kill()
+        raise RuntimeError(f"El servidor no arrancó: {linea.strip()}")
+    return proceso, coincidencia.group(1), int(coincidencia.group(2))
+
+
+def _cliente(host, puerto, ruta, sistemas):
+    """Hace una petición GET por sistema sobre una conexión keep-alive"""
+    conexion = http.client.HTTPConnection(host, puerto, timeout=60)
+    estados = []
+    try:
+        for a1, b1, a2, b2 in sistemas:
+            conexion.request('GET', f"{ruta}?a1={a1}&b1={b1}&a2={a2}&b2={b2}")
+            respuesta = conexion.getresponse()
+            respuesta.read()
+            estados.append(respuesta.status)
+    finally:
+        conexion.close()
+    return estados
+
+
+def cargar(host, puerto, ruta, clientes, peticiones, semilla=0):
+    """
+    Lanza clientes concurrentes con peticiones por cliente
+    
+    Returns:
+        tuple: (peticiones por segundo, diccionario estado -> número)
+    """
+    generador = np.random.default_rng(semilla)
+    lotes = [generador.uniform(-3, 3, (peticiones, 4)).round(3) for _ in range(clientes)]
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as ejecutor:
+        resultados = list(ejecutor.map(lambda sistemas: _cliente(host, puerto, ruta, sistemas), lotes))
+    duracion = time.perf_counter() - inicio
+    
+    estados = {}
+    for estado in (e for resultado in resultados for e in resultado):
+        estados[estado] = estados.get(estado, 0) + 1
+    return clientes * peticiones / duracion, estados
+
+
+def metricas(host, puerto):
+    """Devuelve el JSON de /metrics"""
+    conexion = http.client.HTTPConnection(host, puerto, timeout=10)
+    try:
+        conexion.request('GET', '/metrics')
+        return json.loads(conexion.getresponse().read())
+    finally:
+        conexion.close()
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clientes', type=int, default=32,
+                        help="Clientes concurrentes (por defecto %(default)s)")
+    parser.add_argument('--peticiones', type=int, default=100,
+                        help="Peticiones de análisis por cliente (por defecto %(default)s)")
+    parser.add_argument('--retratos', type=int, default=4,
+                        help="Retratos por cliente (por defecto %(default)s)")
+    parser.add_argument('--trabajadores', type=int, default=None,
+                        help="Procesos de dibujo del servidor (por defecto uno por núcleo)")
+    args = parser.parse_args(argv)
+    
+    proceso, host, puerto = arrancar_servidor(args.trabajadores)
+    try:
+        correcto = True
+        for ruta, peticiones, aceptables in (('/analyze', args.peticiones, {200}),
+                                             ('/portrait', args.retratos, {200, 503})):
+            por_segundo, estados = cargar(host, puerto, ruta, args.clientes, peticiones)
+            correcto &= set(estados) <= aceptables
+            print(f"{ruta:10s} {por_segundo:9.1f} peticiones/s  estados {estados}")
+        print(json.dumps(metricas(host, puerto), indent=2, ensure_ascii=False))
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=30)
+    return 0 if correcto else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""
+Benchmarks de clasificación, campo, trayectorias, gráfica completa, animación y bifurcaciones
+
+Se ejecutan sin ventana (backend Agg), guardan los resultados en JSON y los
+comparan con una línea base guardada para detectar regresiones:
+
+    python benchmarks/ejecutar_benchmarks.py -o resultados.json
+    python benchmarks/ejecutar_benchmarks.py --guardar-linea-base
+    python benchmarks/ejecutar_benchmarks.py --umbral 0.25 --filtro trayectorias
+
+La línea base depende de la máquina y no se incluye en el repositorio: hay
+que generarla primero con --guardar-linea-base (p. ej. en la rama principal).
+Con regresiones respecto a la línea base el programa termina con código 1.
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+# Los módulos del programa están en el directorio padre
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+
+from analisis_estabilidad import AnalizadorEstabilidad, analizar_lote, clasificar_robusto
+from animacion_flujo import crear_animacion_sin_ventana
+from trazador_bifurcaciones import CaminosCoeficientes, trazar_transiciones
+from visualizador_sistema import VisualizadorSistema
+
+
+LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'linea_base.json')
+UMBRAL = 0.20
+TIEMPO_MINIMO = 0.05  # Segundos mínimos por repetición al calibrar los bucles
+
+# Matrices representativas de cada rama de la clasificación
+MATRICES = {
+    'nodo': (-3.0, 1.0, 0.0, -1.0),
+    'silla': (1.0, 2.0, 3.0, -1.0),
+    'foco': (-1.0, 2.0, -2.0, -1.0),
+    'centro': (0.0, 1.0, -1.0, 0.0),
+    'nodo_especial': (-2.0, 0.0, 0.0, -2.0),
+}
+
+TAMANOS_LOTE = (1_000, 100_000, 1_000_000)
+DENSIDADES_CAMPO = (13, 25, 50, 100)
+SEMILLAS_TRAYECTORIAS = (4, 36, 144)
+HORIZONTES = (3.0, 10.0)
+PARTICULAS_ANIMACION = (1_000, 5_000)
+CAMINOS_BIFURCACION = (1, 1_000)
+
+
+def medir(funcion, repeticiones):
+    """
+    Mide el tiempo por llamada de una función
+    
+    El número de llamadas por repetición se calibra para que cada repetición
+    dure al menos TIEMPO_MINIMO, y se informa la mediana y el mínimo.
+    
+    Args:
+        funcion: Función sin argumentos a medir
+        repeticiones: Número de repeticiones
+    
+    Returns:
+        dict: Mediana y mínimo en segundos por llamada, repeticiones y bucles
+    """
+    funcion()  # Calentamiento
+    bucles = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(bucles):
+            funcion()
+        duracion = time.perf_counter() - inicio
+        if duracion >= TIEMPO_MINIMO or bucles >= 1_000_000:
+            break
+        bucles *= max(2, int(TIEMPO_MINIMO / max(duracion, 1e-9)))
+    
+    tiempos = [duracion / bucles]
+    for _ in range(repeticiones - 1):
+        inicio = time.perf_counter()
+        for _ in range(bucles):
+            funcion()
+        tiempos.append((time.perf_counter() - inicio) / bucles)
+    
+    return {
+        'mediana_s': statistics.median(tiempos),
+        'minimo_s': min(tiempos),
+        'repeticiones': repeticiones,
+        'bucles': bucles,
+    }
+
+
+class _SinCache:
+    """Caché que nunca guarda nada, para medir el cálculo y no la búsqueda"""
+    
+    def obtener(self, clave, por_defecto=None):
+        return por_defecto
+    
+    def guardar(self, clave, valor):
+        pass
+    
+    def obtener_o_calcular(self, clave, calcular):
+        return calcular()
+    
+    def limpiar(self):
+        pass
+
+
+@contextlib.contextmanager
+def _sin_cache_analisis():
+    """Desactiva la caché de los análisis mientras dura el bloque y la restaura al salir"""
+    anterior = AnalizadorEstabilidad.cache
+    AnalizadorEstabilidad.cache = None
+    try:
+        yield
+    finally:
+        AnalizadorEstabilidad.cache = anterior
+
+
+@functools.lru_cache(maxsize=1)
+def _coeficientes_lote(tamano):
+    """
+    Coeficientes enteros para los benchmarks por lotes, creados al primer uso
+    
+    Así un filtro que no incluye los lotes grandes no reserva su memoria; solo
+    se conserva el último tamaño, que comparten el lote y la clasificación robusta.
+    """
+    return np.random.default_rng(tamano).integers(-3, 4, size=(tamano, 4)).astype(float)
+
+
+def definir_benchmarks():
+    """
+    Construye la lista de benchmarks
+    
+    Returns:
+        list: Tuplas (nombre, parámetros, función sin argumentos)
+    """
+    visualizador = VisualizadorSistema()
+    solver = VisualizadorSistema(metodo_trayectorias='solver')
+    rejilla = VisualizadorSistema(estilo_campo='rejilla')
+    for instancia in (visualizador, solver, rejilla):
+        instancia.cache = _SinCache()
+    benchmarks = []
+    
+    # Clasificación escalar por rama
+    for rama, coeficientes in MATRICES.items():
+        benchmarks.append((f"clasificacion/escalar/{rama}", {'coeficientes': coeficientes},
+                           lambda c=coeficientes: AnalizadorEstabilidad(*c).analizar_tipo_y_estabilidad()))
+    
+    # Clasificación por lotes, con coeficientes enteros para cubrir los casos límite
+    for tamano in TAMANOS_LOTE:
+        benchmarks.append((f"clasificacion/lote/{tamano}", {'sistemas': tamano},
+                           lambda t=tamano: analizar_lote(_coeficientes_lote(t))))
+        benchmarks.append((f"clasificacion/robusta/{tamano}", {'sistemas': tamano},
+                           lambda t=tamano: clasificar_robusto(_coeficientes_lote(t))))
+    
+    # Campo vectorial a varias densidades
+    for densidad in DENSIDADES_CAMPO:
+        benchmarks.append((f"campo/densidad_{densidad}", {'densidad': densidad},
+                           lambda d=densidad: visualizador.calcular_campo_vectorial(
+                               (-3, 3), (-3, 3), *MATRICES['foco'], densidad=d)))
+    
+    # Trayectorias por número de semillas, horizonte y método
+    for metodo, instancia in (('exacto', visualizador), ('solver', solver)):
+        for n_semillas in SEMILLAS_TRAYECTORIAS:
+            lado = np.linspace(-2.5, 2.5, int(np.sqrt(n_semillas)))
+            semillas = np.stack(np.meshgrid(lado, lado), axis=-1).reshape(-1, 2)
+            for t_max in HORIZONTES:
+                if metodo == 'solver' and n_semillas > 36:
+                    continue  # Solo tamaños moderados: el solver domina el tiempo total
+                for rama in ('silla', 'foco'):
+                    parametros = {'metodo': metodo, 'semillas': len(semillas), 't_max': t_max,
+                                  'coeficientes': MATRICES[rama]}
+                    benchmarks.append((
+                        f"trayectorias/{metodo}/{rama}/semillas_{len(semillas)}/t_{t_max:g}",
+                        parametros,
+                        lambda v=instancia, s=semillas, c=MATRICES[rama], t=t_max:
+                            v.calcular_trayectorias(s, *c, t_max=t)))
+        benchmarks.append((f"trayectoria/{metodo}/foco", {'metodo': metodo},
+                           lambda v=instancia: v.calcular_trayectoria(1.0, 1.0, *MATRICES['foco'])))
+    
+    # Trayectorias recortadas a la vista, con horizonte fijo o hasta salir
+    lado = np.linspace(-2.5, 2.5, 12)
+    semillas = np.stack(np.meshgrid(lado, lado), axis=-1).reshape(-1, 2)
+    for rama in ('silla', 'foco', 'centro'):
+        for t_max in HORIZONTES + (None,):
+            parametros = {'semillas': len(semillas), 't_max': t_max, 'coeficientes': MATRICES[rama]}
+            benchmarks.append((
+                f"trayectorias/recortadas/{rama}/t_{t_max or 'libre'}", parametros,
+                lambda s=semillas, c=MATRICES[rama], t=t_max:
+                    visualizador.calcular_trayectorias_recortadas(s, *c, 3.6, t_max=t)))
+    
+    # Gráfica completa: cálculo y dibujo en Agg, con el estilo adaptativo
+    # (por defecto) y con la rejilla fija
+    def grafica_completa(instancia, coeficientes):
+        fig = instancia.crear_grafica_completa(*coeficientes)
+        FigureCanvasAgg(fig).draw()
+    
+    for rama, coeficientes in MATRICES.items():
+        benchmarks.append((f"grafica/completa/{rama}", {'coeficientes': coeficientes},
+                           lambda c=coeficientes: grafica_completa(visualizador, c)))
+        benchmarks.append((f"grafica/rejilla/{rama}", {'coeficientes': coeficientes},
+                           lambda c=coeficientes: grafica_completa(rejilla, c)))
+    
+    # Un cuadro de la animación de partículas (blitting y avance del anillo)
+    for particulas in PARTICULAS_ANIMACION:
+        animacion = crear_animacion_sin_ventana(particulas)
+        benchmarks.append((f"animacion/cuadro/particulas_{particulas}", {'particulas': particulas},
+                           animacion.dibujar_cuadro))
+    
+    # Transiciones a lo largo de caminos rectos aleatorios (un solo lote vectorizado)
+    generador = np.random.default_rng(0)
+    for n_caminos in CAMINOS_BIFURCACION:
+        caminos = CaminosCoeficientes.rectos(generador.uniform(-3, 3, (n_caminos, 4)),
+                                             generador.uniform(-3, 3, (n_caminos, 4)))
+        benchmarks.append((f"bifurcaciones/caminos_{n_caminos}", {'caminos': n_caminos},
+                           lambda c=caminos: trazar_transiciones(c)))
+    
+    return benchmarks
+
+
+def ejecutar(filtro=None, repeticiones=5, salida=sys.stderr):
+    """
+    Ejecuta los benchmarks
+    
+    Args:
+        filtro: Patrón tipo glob sobre los nombres (p. ej. 'campo/*')
+        repeticiones: Repeticiones por benchmark
+        salida: Flujo donde se informa el avance
+    
+    Returns:
+        dict: Metadatos del entorno y resultados por nombre
+    """
+    resultados = {}
+    with _sin_cache_analisis():
+        for nombre, parametros, funcion in definir_benchmarks():
+            if filtro and not fnmatch.fnmatch(nombre, filtro) and filtro not in nombre:
+                continue
+            medida = medir(funcion, repeticiones)
+            medida['parametros'] = parametros
+            resultados[nombre] = medida
+            print(f"{nombre:60s} {medida['mediana_s'] * 1e3:10.3f} ms", file=salida)
+    _coeficientes_lote.cache_clear()
+    
+    return {
+        'metadatos': {
+            'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'plataforma': platform.platform(),
+            'procesador': platform.processor() or platform.machine(),
+        },
+        'resultados': resultados,
+    }
+
+
+def comparar(actual, base, umbral=UMBRAL):
+    """
+    Compara unos resultados con la línea base
+    
+    Args:
+        actual: Resultados de ejecutar
+        base: Resultados guardados como línea base
+        umbral: Aumento relativo de la mediana considerado regresión (0.2 = 20 %)
+    
+    Returns:
+        list: Tuplas (nombre, mediana_base, mediana_actual, razon, es_regresion)
+        para los benchmarks presentes en ambos
+    """
+    comparacion = []
+    for nombre, medida in actual['resultados'].items():
+        anterior = base['resultados'].get(nombre)
+        if anterior is None:
+            continue
+        razon = medida['mediana_s'] / anterior['mediana_s']
+        comparacion.append((nombre, anterior['mediana_s'], medida['mediana_s'], razon,
+                            razon > 1.0 + umbral))
+    return comparacion
+
+
+def crear_parser():
+    """Crea el parser de argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-o', '--salida', help="Archivo JSON donde guardar los resultados")
+    parser.add_argument('--linea-base', default=LINEA_BASE,
+                        help="Archivo JSON de la línea base (por defecto %(default)s)")
+    parser.add_argument('--guardar-linea-base', action='store_true',
+                        help="Guarda los resultados como nueva línea base")
+    parser.add_argument('--umbral', type=float, default=UMBRAL,
+                        help="Aumento relativo tolerado antes de marcar regresión (por defecto %(default)s)")
+    parser.add_argument('--repeticiones', type=int, default=5,
+                        help="Repeticiones por benchmark (por defecto %(default)s)")
+    parser.add_argument('--filtro', help="Ejecutar solo los benchmarks cuyo nombre coincide")
+    return parser
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    args = crear_parser().parse_args(argv)
+    actual = ejecutar(args.filtro, args.repeticiones)
+    
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(actual, archivo, indent=2)
+    
+    if args.guardar_linea_base:
+        with open(args.linea_base, 'w', encoding='utf-8') as archivo:
+            json.dump(actual, archivo, indent=2)
+        print(f"Línea base guardada en {args.linea_base}", file=sys.stderr)
+        return 0
+    
+    try:
+        with open(args.linea_base, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+    except FileNotFoundError:
+        print(f"Sin línea base en {args.linea_base}; use --guardar-linea-base", file=sys.stderr)
+        return 0
+    
+    regresiones = 0
+    print(f"\nComparación con la línea base (umbral {args.umbral:.0%}):", file=sys.stderr)
+    for nombre, anterior, nueva, razon, es_regresion in comparar(actual, base, args.umbral):
+        marca = "REGRESIÓN" if es_regresion else ""
+        print(f"{nombre:60s} {anterior * 1e3:10.3f} -> {nueva * 1e3:10.3f} ms "
+              f"(x{razon:.2f}) {marca}", file=sys.stderr)
+        regresiones += es_regresion
+    
+    if regresiones:
+        print(f"{regresiones} benchmark(s) más lentos que la línea base", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Comprueba el tiempo de importación de los módulos de arranque
+
+Ejecuta `python -X importtime -c "import <modulo>"` en procesos nuevos y
+compara el tiempo acumulado con un objetivo por módulo. Comprueba además que
+los módulos no cargan las bibliotecas pesadas que se importan de forma
+diferida (matplotlib, scipy y, en el análisis sin interfaz, tkinter):
+
+    python benchmarks/tiempo_arranque.py
+    python benchmarks/tiempo_arranque.py --repeticiones 10 --factor 1.5
+
+Termina con código 1 si algún módulo supera su objetivo o carga un módulo
+prohibido.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Objetivo de tiempo acumulado de importación (ms) y módulos que no deben cargarse
+OBJETIVOS = {
+    'analisis_estabilidad': (400, ('matplotlib', 'scipy', 'tkinter')),
+    'main': (500, ('matplotlib', 'scipy')),
+}
+
+_LINEA = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def medir_importacion(modulo):
+    """
+    Importa un módulo en un proceso nuevo con -X importtime
+    
+    Args:
+        modulo: Nombre del módulo
+    
+    Returns:
+        tuple: (milisegundos acumulados del módulo, conjunto de módulos cargados)
+    """
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {modulo}"],
+                             cwd=RAIZ, capture_output=True, text=True, check=True)
+    acumulado = None
+    cargados = set()
+    for linea in proceso.stderr.splitlines():
+        coincidencia = _LINEA.match(linea)
+        if coincidencia is None:
+            continue
+        nombre = coincidencia.group(4)
+        cargados.add(nombre)
+        if nombre == modulo and len(coincidencia.group(3)) <= 1:  # Nivel superior
+            acumulado = int(coincidencia.group(2)) / 1000.0
+    return acumulado, cargados
+
+
+def comprobar(repeticiones=5, factor=1.0):
+    """
+    Mide cada módulo de OBJETIVOS y lo compara con su objetivo
+    
+    Args:
+        repeticiones: Importaciones por módulo; se usa la mediana
+        factor: Multiplicador de los objetivos (p. ej. para máquinas lentas)
+    
+    Returns:
+        bool: True si todos los módulos cumplen
+    """
+    correcto = True
+    for modulo, (objetivo_ms, prohibidos) in OBJETIVOS.items():
+        medidas = [medir_importacion(modulo) for _ in range(repeticiones)]
+        mediana = statistics.median(ms for ms, _ in medidas)
+        cargados = set().union(*(modulos for _, modulos in medidas))
+        indebidos = sorted(nombre for nombre in cargados
+                           if nombre.split('.')[0] in prohibidos)
+        
+        cumple = mediana <= objetivo_ms * factor and not indebidos
+        correcto &= cumple
+        print(f"{modulo:22s} {mediana:8.1f} ms (objetivo {objetivo_ms * factor:.0f} ms) "
+              f"{'OK' if cumple else 'FALLA'}")
+        if indebidos:
+            print(f"  carga módulos diferidos: {', '.join(indebidos[:5])}")
+    return correcto
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=5,
+                        help="Importaciones por módulo (por defecto %(default)s)")
+    parser.add_argument('--factor', type=float, default=1.0,
+                        help="Multiplicador de los objetivos (por defecto %(default)s)")
+    args = parser.parse_args(argv)
+    return 0 if comprobar(args.repeticiones, args.factor) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Módulo con una caché LRU acotada para reutilizar resultados costosos
+
+Las cachés pueden guardarse en disco y cargarse en la siguiente sesión con
+guardar_caches y cargar_caches.
+"""
+
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+
+# Versión del formato de los archivos de caché; los de otra versión se ignoran.
+# Incrementarla al cambiar las claves o los datos guardados (p. ej. los de las gráficas)
+VERSION_FORMATO = 2
+
+
+class CacheLRU:
+    """Caché con capacidad fija que desaloja la entrada usada hace más tiempo"""
+    
+    def __init__(self, capacidad=64):
+        """
+        Inicializa la caché
+        
+        Args:
+            capacidad: Número máximo de entradas almacenadas
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad de la caché debe ser al menos 1")
+        self.capacidad = capacidad
+        self._entradas = OrderedDict()
+        self._candado = threading.RLock()  # La comparten el hilo de Tk y el trabajador
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+    
+    def __len__(self):
+        return len(self._entradas)
+    
+    def __contains__(self, clave):
+        return clave in self._entradas
+    
+    def obtener(self, clave, por_defecto=None):
+        """
+        Busca una entrada y la marca como usada recientemente
+        
+        Args:
+            clave: Clave de la entrada
+            por_defecto: Valor devuelto si la clave no está
+        
+        Returns:
+            Valor almacenado o por_defecto
+        """
+        with self._candado:
+            try:
+                valor = self._entradas[clave]
+            except KeyError:
+                self.fallos += 1
+                return por_defecto
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+    
+    def guardar(self, clave, valor):
+        """
+        Guarda una entrada, desalojando la menos usada si se supera la capacidad
+        
+        Args:
+            clave: Clave de la entrada
+            valor: Valor a almacenar
+        """
+        with self._candado:
+            self._entradas[clave] = valor
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+                self.desalojos += 1
+    
+    def obtener_o_calcular(self, clave, calcular):
+        """
+        Devuelve la entrada de la caché o la calcula y guarda si no existe
+        
+        Args:
+            clave: Clave de la entrada
+            calcular: Función sin argumentos que produce el valor
+        
+        Returns:
+            Valor almacenado o recién calculado
+        """
+        valor = self.obtener(clave, _AUSENTE)
+        if valor is _AUSENTE:
+            valor = calcular()
+            self.guardar(clave, valor)
+        return valor
+    
+    def limpiar(self):
+        """Elimina todas las entradas (los contadores se conservan)"""
+        with self._candado:
+            self._entradas.clear()
+    
+    def exportar(self):
+        """
+        Obtiene las entradas de la menos a la más usada recientemente
+        
+        Returns:
+            list: Pares (clave, valor)
+        """
+        with self._candado:
+            return list(self._entradas.items())
+    
+    def importar(self, entradas):
+        """
+        Añade entradas exportadas conservando su orden de uso
+        
+        Args:
+            entradas: Pares (clave, valor) de la menos a la más usada
+        """
+        for clave, valor in entradas:
+            self.guardar(clave, valor)
+    
+    def estadisticas(self):
+        """
+        Obtiene los contadores de uso de la caché
+        
+        Returns:
+            dict: Entradas, capacidad, aciertos, fallos y desalojos
+        """
+        return {
+            'entradas': len(self),
+            'capacidad': self.capacidad,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+        }
+
+
+def cuantizar(valores, cifras=12):
+    """
+    Redondea valores a un número de cifras significativas para usarlos como clave
+    
+    Valores que solo difieren en los últimos bits (p. ej. 0.1 + 0.2 y 0.3)
+    comparten así la misma entrada de caché.
+    
+    Args:
+        valores: Secuencia de números
+        cifras: Cifras significativas conservadas
+    
+    Returns:
+        tuple: Valores redondeados como float (sin ceros negativos)
+    """
+    return tuple(float(f"{float(valor):.{cifras}g}") + 0.0 for valor in valores)
+
+
+def guardar_caches(ruta, **caches):
+    """
+    Guarda varias cachés en un archivo para reutilizarlas en otra sesión
+    
+    Args:
+        ruta: Ruta del archivo
+        **caches: Cachés a guardar, por nombre
+    """
+    contenido = {
+        'version': VERSION_FORMATO,
+        'caches': {nombre: cache.exportar() for nombre, cache in caches.items()},
+    }
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'wb') as archivo:
+        pickle.dump(contenido, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, ruta)  # No dejar un archivo a medias si se interrumpe
+
+
+def cargar_caches(ruta, **caches):
+    """
+    Carga en las cachés dadas las entradas guardadas con guardar_caches
+    
+    El archivo se lee con pickle: usar solo archivos creados por el propio
+    programa. Un archivo inexistente, dañado, con entradas mal formadas o de
+    otra versión se ignora sin modificar las cachés.
+    
+    Args:
+        ruta: Ruta del archivo
+        **caches: Cachés a rellenar, por nombre
+    
+    Returns:
+        bool: True si se cargó el archivo
+    """
+    try:
+        with open(ruta, 'rb') as archivo:
+            contenido = pickle.load(archivo)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return False
+    
+    if not isinstance(contenido, dict) or contenido.get('version') != VERSION_FORMATO:
+        return False
+    guardadas = contenido.get('caches')
+    if not isinstance(guardadas, dict):
+        return False
+    
+    # Validar todas las entradas antes de tocar las cachés
+    try:
+        entradas = {nombre: [(clave, valor) for clave, valor in guardadas.get(nombre, ())]
+                    for nombre in caches}
+        for pares in entradas.values():
+            for clave, _ in pares:
+                hash(clave)
+    except (TypeError, ValueError):
+        return False
+    for nombre, cache in caches.items():
+        cache.importar(entradas[nombre])
+    return True
+
+
+_AUSENTE = object()
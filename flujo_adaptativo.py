@@ -0,0 +1,281 @@
+"""
+Módulo para el muestreo adaptativo del campo y las líneas de flujo uniformes
+
+- muestrear_campo_adaptativo: árbol cuaternario que subdivide las celdas
+  donde la dirección del flujo cambia deprisa (p. ej. cerca de las
+  direcciones propias de una silla) y deja celdas grandes en el resto.
+- lineas_flujo_uniformes: líneas de flujo separadas de forma uniforme al
+  estilo de Jobard y Lefer. Las candidatas de cada ronda se integran juntas
+  (RK2 vectorizado sobre el campo de direcciones) y se aceptan en orden
+  sobre una rejilla de ocupación.
+
+El campo es cualquier función vectorizada campo(x, y) -> (u, v).
+"""
+
+import numpy as np
+
+
+def _direcciones(campo, x, y):
+    """Evalúa el campo y devuelve (u, v, magnitud) sin avisos por ceros o infinitos"""
+    with np.errstate(all='ignore'):
+        u, v = campo(x, y)
+        u = np.nan_to_num(np.asarray(u, dtype=float), nan=0.0, posinf=0.0, neginf=0.0)
+        v = np.nan_to_num(np.asarray(v, dtype=float), nan=0.0, posinf=0.0, neginf=0.0)
+    return u, v, np.hypot(u, v)
+
+
+def muestrear_campo_adaptativo(campo, limites, celdas_base=8, niveles=2, umbral_angulo=25.0):
+    """
+    Coloca las flechas del campo en las hojas de un árbol cuaternario
+    
+    Una celda se subdivide si la dirección del campo en alguna esquina difiere
+    de la del centro en más de umbral_angulo grados o si la magnitud varía
+    mucho dentro de ella (cerca de un punto crítico).
+    
+    Args:
+        campo: Función vectorizada campo(x, y) -> (u, v)
+        limites: Tupla (x_min, x_max, y_min, y_max)
+        celdas_base: Celdas por eje en el nivel más grueso
+        niveles: Número máximo de subdivisiones
+        umbral_angulo: Cambio de dirección (grados) que provoca la subdivisión
+    
+    Returns:
+        tuple: (X, Y, U, V, tamanos) como arreglos 1-D, con tamanos el lado
+        de la celda de cada flecha
+    """
+    x_min, x_max, y_min, y_max = limites
+    lado_x = (x_max - x_min) / celdas_base
+    lado_y = (y_max - y_min) / celdas_base
+    i, j = np.meshgrid(np.arange(celdas_base), np.arange(celdas_base))
+    cx = x_min + lado_x * (i.ravel() + 0.5)
+    cy = y_min + lado_y * (j.ravel() + 0.5)
+    coseno_umbral = np.cos(np.radians(umbral_angulo))
+    
+    hojas_x, hojas_y, hojas_lado = [], [], []
+    for nivel in range(niveles + 1):
+        if nivel == niveles:
+            refinar = np.zeros(cx.shape, dtype=bool)
+        else:
+            # Centro y cuatro esquinas de todas las celdas en una sola evaluación
+            dx = 0.5 * lado_x * np.array([0, -1, 1, -1, 1])
+            dy = 0.5 * lado_y * np.array([0, -1, -1, 1, 1])
+            u, v, magnitud = _direcciones(campo, cx[:, None] + dx, cy[:, None] + dy)
+            with np.errstate(all='ignore'):
+                ux, uy = u / magnitud, v / magnitud
+            cosenos = ux[:, :1] * ux[:, 1:] + uy[:, :1] * uy[:, 1:]
+            giro = np.any(~(cosenos >= coseno_umbral), axis=1)  # NaN (velocidad nula) también refina
+            variacion = magnitud.max(axis=1) > 4.0 * np.maximum(magnitud.min(axis=1), 1e-300)
+            refinar = giro | variacion
+        
+        hojas_x.append(cx[~refinar])
+        hojas_y.append(cy[~refinar])
+        hojas_lado.append(np.full(np.count_nonzero(~refinar), min(lado_x, lado_y)))
+        
+        # Las celdas refinadas se dividen en cuatro hijas
+        lado_x, lado_y = 0.5 * lado_x, 0.5 * lado_y
+        cx = (cx[refinar][:, None] + 0.5 * lado_x * np.array([-1, 1, -1, 1])).ravel()
+        cy = (cy[refinar][:, None] + 0.5 * lado_y * np.array([-1, -1, 1, 1])).ravel()
+        if cx.size == 0:
+            break
+    
+    X = np.concatenate(hojas_x)
+    Y = np.concatenate(hojas_y)
+    U, V, _ = _direcciones(campo, X, Y)
+    return X, Y, U, V, np.concatenate(hojas_lado)
+
+
+class _Ocupacion:
+    """Rejilla de ocupación de las líneas aceptadas"""
+    
+    def __init__(self, limites, celda):
+        self.x_min, _, self.y_min, _ = limites
+        self.celda = celda
+        self.nx = int(np.ceil((limites[1] - limites[0]) / celda)) + 1
+        self.ny = int(np.ceil((limites[3] - limites[2]) / celda)) + 1
+        self.ocupada = np.zeros((self.ny + 2, self.nx + 2), dtype=bool)  # Con borde
+        self._marcas = np.zeros(self.ocupada.size, dtype=bool)  # Auxiliar de pertenecen
+    
+    def indices(self, puntos):
+        """Índices (fila, columna) de las celdas de cada punto"""
+        columnas = np.clip(((puntos[:, 0] - self.x_min) / self.celda).astype(int) + 1, 0, self.nx + 1)
+        filas = np.clip(((puntos[:, 1] - self.y_min) / self.celda).astype(int) + 1, 0, self.ny + 1)
+        return filas, columnas
+    
+    def libres(self, puntos):
+        """Máscara de los puntos cuya celda está libre"""
+        return ~self.ocupada[self.indices(puntos)]
+    
+    def marcar(self, puntos):
+        """Marca las celdas de los puntos y sus vecinas (separación mínima)"""
+        filas, columnas = self.indices(puntos)
+        for df in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                self.ocupada[np.clip(filas + df, 0, self.ny + 1), np.clip(columnas + dc, 0, self.nx + 1)] = True
+    
+    def pertenecen(self, celdas, conjunto):
+        """
+        Máscara de las celdas (índices planos) que están en conjunto
+        
+        Marca el conjunto en un arreglo auxiliar del tamaño de la rejilla en
+        lugar de ordenar como np.isin, y lo deja limpio al terminar.
+        """
+        self._marcas[conjunto] = True
+        dentro = self._marcas[celdas]
+        self._marcas[conjunto] = False
+        return dentro
+
+
+def _integrar_direcciones(campo, semillas, paso, pasos, limites, velocidad_minima, ocupacion):
+    """
+    Integra el campo de direcciones unitario con RK2 (punto medio) desde todas
+    las semillas a la vez, hacia delante y hacia atrás en el mismo bucle
+    
+    Cada semilínea se detiene al salir de la región, al llegar a un punto
+    crítico o al entrar en una celda ya ocupada, así que las candidatas
+    descartadas cuestan pocos pasos.
+    
+    Returns:
+        tuple: (puntos (2, K, pasos + 1, 2), longitudes (2, K)) con la
+        semilínea hacia delante en [0], la de hacia atrás en [1] y la
+        longitud de la parte válida de cada una
+    """
+    x_min, x_max, y_min, y_max = limites
+    K = len(semillas)
+    signo = np.repeat([1.0, -1.0], K)[:, None]
+    
+    def direccion(p):
+        with np.errstate(all='ignore'):
+            u, v = campo(p[:, 0], p[:, 1])
+            magnitud = np.hypot(u, v)
+            d = signo * np.stack([u / magnitud, v / magnitud], axis=-1)
+        lenta = ~(magnitud > velocidad_minima) | ~np.isfinite(magnitud)
+        d[lenta] = 0.0
+        return d, lenta
+    
+    puntos = np.empty((2 * K, pasos + 1, 2))
+    puntos[:, 0] = p = np.concatenate([semillas, semillas])
+    longitudes = np.full(2 * K, pasos + 1)
+    activas = np.ones(2 * K, dtype=bool)
+    for k in range(1, pasos + 1):
+        d1, lenta = direccion(p)
+        d2, lenta_medio = direccion(p + 0.5 * paso * d1)
+        p = p + paso * d2
+        puntos[:, k] = p
+        
+        fuera = (p[:, 0] < x_min) | (p[:, 0] > x_max) | (p[:, 1] < y_min) | (p[:, 1] > y_max)
+        detenidas = activas & (fuera | lenta | lenta_medio | ~ocupacion.libres(p))
+        longitudes[detenidas] = k
+        activas &= ~detenidas
+        if not activas.any():
+            break
+    return puntos.reshape(2, K, pasos + 1, 2), longitudes.reshape(2, K)
+
+
+def _truncar(mitad, longitud, ocupacion, retardo, celdas_previas=None):
+    """
+    Longitud de una semilínea hasta su primer choque con la rejilla de
+    ocupación, consigo misma (celdas visitadas hace más de retardo pasos) o
+    con las celdas_previas de la otra semilínea
+    
+    Returns:
+        tuple: (longitud, celdas visitadas hasta ese punto)
+    """
+    mitad = mitad[:longitud]
+    libres = ocupacion.libres(mitad)
+    choque = np.flatnonzero(~libres[1:])
+    fin = choque[0] + 1 if choque.size else longitud
+    
+    filas, columnas = ocupacion.indices(mitad[:fin])
+    celdas = filas * (ocupacion.nx + 2) + columnas
+    if fin <= retardo:
+        return fin, celdas
+    
+    _, primera, inversa = np.unique(celdas, return_index=True, return_inverse=True)
+    choque = primera[inversa] < np.arange(fin) - retardo
+    if celdas_previas is not None and celdas_previas.size:
+        choque[retardo:] |= ocupacion.pertenecen(celdas[retardo:], celdas_previas)
+    propio = np.flatnonzero(choque)
+    fin = propio[0] if propio.size else fin
+    return fin, celdas[:fin]
+
+
+def lineas_flujo_uniformes(campo, limites, separacion, max_puntos=None, max_rondas=12, cancelado=None):
+    """
+    Coloca líneas de flujo separadas de forma aproximadamente uniforme
+    
+    Args:
+        campo: Función vectorizada campo(x, y) -> (u, v)
+        limites: Tupla (x_min, x_max, y_min, y_max)
+        separacion: Distancia deseada entre líneas (unidades del plano)
+        max_puntos: Puntos máximos de cada semilínea; por defecto los de
+            recorrer el perímetro de la región
+        max_rondas: Rondas máximas de siembra
+        cancelado: Función opcional sin argumentos; si devuelve True entre
+            rondas, se devuelven las líneas aceptadas hasta ese momento
+    
+    Returns:
+        tuple: (lineas, semillas) con una lista de arreglos (P, 2) y las
+        semillas (K, 2) de las líneas aceptadas
+    """
+    x_min, x_max, y_min, y_max = limites
+    paso = separacion / 2.0
+    ocupacion = _Ocupacion(limites, 0.5 * separacion)
+    retardo = int(np.ceil(3 * ocupacion.celda / paso))
+    longitud_minima = max(3, int(2 * separacion / paso))
+    if max_puntos is None:
+        max_puntos = int(2 * ((x_max - x_min) + (y_max - y_min)) / paso)
+    
+    # Velocidad por debajo de la cual se considera que se llegó a un punto crítico
+    _, _, magnitudes = _direcciones(campo, *np.meshgrid(np.linspace(x_min, x_max, 9),
+                                                        np.linspace(y_min, y_max, 9)))
+    velocidad_minima = 1e-4 * max(magnitudes.max(), 1e-300)
+    
+    # Primera ronda: rejilla de semillas separadas 2*separacion
+    gx = np.arange(x_min + separacion, x_max, 2 * separacion)
+    gy = np.arange(y_min + separacion, y_max, 2 * separacion)
+    candidatas = np.stack(np.meshgrid(gx, gy), axis=-1).reshape(-1, 2)
+    
+    lineas, semillas = [], []
+    for _ in range(max_rondas):
+        # Una candidata por celda libre
+        candidatas = candidatas[ocupacion.libres(candidatas)]
+        filas, columnas = ocupacion.indices(candidatas)
+        _, unicas = np.unique(filas * (ocupacion.nx + 2) + columnas, return_index=True)
+        candidatas = candidatas[np.sort(unicas)]
+        if len(candidatas) == 0 or (cancelado and cancelado()):
+            break
+        
+        (adelante, atras), (largo_adelante, largo_atras) = _integrar_direcciones(
+            campo, candidatas, paso, max_puntos, limites, velocidad_minima, ocupacion)
+        
+        nuevas = []
+        for k, semilla in enumerate(candidatas):
+            if not ocupacion.libres(semilla[None])[0]:
+                continue  # Ocupada por una línea aceptada en esta misma ronda
+            fin_adelante, celdas = _truncar(adelante[k], largo_adelante[k], ocupacion, retardo)
+            fin_atras, _ = _truncar(atras[k], largo_atras[k], ocupacion, retardo, celdas[retardo:])
+            linea = np.concatenate([atras[k, fin_atras - 1:0:-1], adelante[k, :fin_adelante]])
+            if len(linea) < longitud_minima:
+                continue
+            
+            ocupacion.marcar(linea)
+            lineas.append(linea)
+            semillas.append(semilla)
+            
+            # Nuevas candidatas a una separación a cada lado de la línea
+            tangente = np.gradient(linea, axis=0)
+            normal = np.stack([-tangente[:, 1], tangente[:, 0]], axis=-1)
+            with np.errstate(all='ignore'):
+                normal /= np.linalg.norm(normal, axis=1, keepdims=True)
+            muestras = slice(0, None, max(1, int(separacion / paso)))
+            for signo in (1.0, -1.0):
+                nuevas.append(linea[muestras] + signo * separacion * normal[muestras])
+        
+        if not nuevas:
+            break
+        candidatas = np.concatenate(nuevas)
+        candidatas = candidatas[np.all(np.isfinite(candidatas), axis=1)
+                                & (candidatas[:, 0] > x_min) & (candidatas[:, 0] < x_max)
+                                & (candidatas[:, 1] > y_min) & (candidatas[:, 1] < y_max)]
+    
+    return lineas, np.array(semillas).reshape(-1, 2)
@@ -0,0 +1,255 @@
+"""
+Módulo para generar informes de muchos sistemas sin interfaz gráfica
+
+Cada sistema produce una página (PNG, SVG o PDF) con su retrato de fase y
+los datos de obtener_informacion_completa. Las páginas se dibujan con Agg
+en un ProcessPoolExecutor (matplotlib no es seguro entre hilos), cada figura
+se libera nada más escribirse y las páginas y el índice (JSON Lines) se
+escriben a medida que terminan, con un número acotado de tareas en vuelo,
+así que la memoria no crece con el número de sistemas.
+
+Uso:
+    python generador_informes.py sistemas.csv -o informe/ --formato pdf
+    python generador_informes.py sistemas.npy -o informe/ --trabajadores 4
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from analisis_estabilidad import AnalizadorEstabilidad
+from analisis_lotes import leer_trozos, FORMATOS
+
+
+FORMATOS_PAGINA = ('png', 'svg', 'pdf')
+TAMANO_PAGINA = (8.27, 11.69)  # A4 vertical, en pulgadas
+NOMBRE_INDICE = 'indice.jsonl'
+
+# Tareas en vuelo por trabajador: acota la memoria con entradas muy largas
+TAREAS_POR_TRABAJADOR = 4
+
+# Estado de cada proceso trabajador, fijado por _inicializar_trabajador
+_estado_trabajador = {}
+
+
+def convertir_a_json(valor):
+    """Convierte los valores de NumPy (incluidos complejos) a tipos de JSON"""
+    if isinstance(valor, dict):
+        return {clave: convertir_a_json(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple, np.ndarray)):
+        return [convertir_a_json(v) for v in valor]
+    if isinstance(valor, (complex, np.complexfloating)):
+        return [float(valor.real), float(valor.imag)]
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+def informacion_a_json(informacion):
+    """
+    Convierte un resultado de obtener_informacion_completa a tipos de JSON
+    
+    Args:
+        informacion: Diccionario de obtener_informacion_completa
+    
+    Returns:
+        dict: Copia con los valores propios como pares [real, imaginaria]
+    """
+    informacion = dict(informacion)
+    informacion['valores_propios'] = [[float(np.real(m)), float(np.imag(m))]
+                                      for m in informacion['valores_propios']]
+    return convertir_a_json(informacion)
+
+
+def informacion_sistema(a1, b1, a2, b2):
+    """
+    Obtiene la información completa de un sistema en tipos de JSON
+    
+    Args:
+        a1, b1, a2, b2: Coeficientes del sistema
+    
+    Returns:
+        dict: Ver informacion_a_json
+    """
+    return informacion_a_json(AnalizadorEstabilidad(a1, b1, a2, b2).obtener_informacion_completa())
+
+
+def _texto_pagina(informacion):
+    """Bloque de texto con los datos del análisis para la página"""
+    c = informacion['coeficientes']
+    (m11, m12), (m21, m22) = informacion['matriz']
+    lineas = informacion['tipo_estabilidad'].split('\n')
+    valores = ", ".join(f"{re:.4g}{im:+.4g}i" if im else f"{re:.4g}"
+                        for re, im in informacion['valores_propios'])
+    return "\n".join([
+        f"x' = {c['a1']:g}·x + {c['b1']:g}·y",
+        f"y' = {c['a2']:g}·x + {c['b2']:g}·y",
+        "",
+        f"Matriz:        [[{m11:g}, {m12:g}], [{m21:g}, {m22:g}]]",
+        f"Determinante:  {informacion['determinante']:.6g}",
+        f"Traza:         {informacion['traza']:.6g}",
+        f"Valores propios: {valores}",
+        f"Punto crítico único: {'sí' if informacion['es_unico'] else 'no'}",
+        "",
+        f"Tipo:          {lineas[0]}",
+        f"Estabilidad:   {lineas[1] if len(lineas) > 1 else '-'}",
+    ])
+
+
+def renderizar_pagina(visualizador, indice, coeficientes, ruta, dpi=100):
+    """
+    Dibuja y escribe la página de un sistema
+    
+    La figura se crea sin pyplot (no queda registrada en ningún gestor) y
+    se vacía tras escribirla, así que su memoria se libera enseguida.
+    
+    Args:
+        visualizador: VisualizadorSistema con el que calcular el retrato
+        indice: Número del sistema en el informe
+        coeficientes: Tupla (a1, b1, a2, b2)
+        ruta: Archivo de salida; la extensión decide el formato
+        dpi: Resolución de las páginas PNG
+    
+    Returns:
+        dict: Entrada del índice con indice, archivo e información del sistema
+    """
+    from matplotlib.figure import Figure
+    
+    a1, b1, a2, b2 = (float(c) for c in coeficientes)
+    informacion = informacion_sistema(a1, b1, a2, b2)
+    
+    fig = Figure(figsize=TAMANO_PAGINA, dpi=dpi)
+    try:
+        retrato, texto = fig.subfigures(2, 1, height_ratios=(3, 1.3))
+        lado_px = TAMANO_PAGINA[0] * dpi  # El retrato ocupa el ancho de la página
+        datos_grafica = visualizador.calcular_datos_grafica(a1, b1, a2, b2, tamano_px=(lado_px, lado_px))
+        visualizador.dibujar_grafica(retrato, datos_grafica, f"Sistema {indice}")
+        texto.text(0.08, 0.95, _texto_pagina(informacion), family='monospace', fontsize=11,
+                   va='top', ha='left')
+        fig.savefig(ruta)
+    finally:
+        fig.clear()
+    
+    return {'indice': indice, 'archivo': os.path.basename(ruta), **informacion}
+
+
+def _inicializar_trabajador():
+    """Crea el visualizador de cada proceso trabajador (uno por proceso)"""
+    from visualizador_sistema import VisualizadorSistema
+    _estado_trabajador['visualizador'] = VisualizadorSistema()
+
+
+def _renderizar_pagina_trabajador(indice, coeficientes, ruta, dpi):
+    """Renderiza una página dentro de un proceso trabajador"""
+    return renderizar_pagina(_estado_trabajador['visualizador'], indice, coeficientes, ruta, dpi)
+
+
+def generar_informe(sistemas, directorio, formato='png', trabajadores=None, dpi=100, progreso=None):
+    """
+    Genera una página por sistema y un índice JSON Lines en el directorio
+    
+    Args:
+        sistemas: Iterable de coeficientes (a1, b1, a2, b2); se consume de
+            forma perezosa
+        directorio: Directorio de salida (se crea si no existe)
+        formato: 'png', 'svg' o 'pdf'
+        trabajadores: Número de procesos (por defecto os.cpu_count()); con 1
+            se renderiza en el proceso actual
+        dpi: Resolución de las páginas PNG
+        progreso: Callback progreso(completadas, paginas_por_segundo)
+    
+    Returns:
+        int: Número de páginas escritas
+    """
+    if formato not in FORMATOS_PAGINA:
+        raise ValueError(f"Formato de página desconocido: {formato}")
+    os.makedirs(directorio, exist_ok=True)
+    trabajadores = trabajadores or os.cpu_count() or 1
+    tareas = ((indice, tuple(coeficientes), os.path.join(directorio, f"sistema_{indice:05d}.{formato}"))
+              for indice, coeficientes in enumerate(sistemas, start=1))
+    
+    inicio = time.perf_counter()
+    completadas = 0
+    with open(os.path.join(directorio, NOMBRE_INDICE), 'w', encoding='utf-8') as indice_json:
+        def escribir(entrada):
+            nonlocal completadas
+            indice_json.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+            completadas += 1
+            if progreso:
+                transcurrido = time.perf_counter() - inicio
+                progreso(completadas, completadas / transcurrido if transcurrido > 0 else 0.0)
+        
+        if trabajadores == 1:
+            _inicializar_trabajador()
+            for indice, coeficientes, ruta in tareas:
+                escribir(_renderizar_pagina_trabajador(indice, coeficientes, ruta, dpi))
+            return completadas
+        
+        with ProcessPoolExecutor(max_workers=trabajadores, initializer=_inicializar_trabajador) as ejecutor:
+            en_vuelo = set()
+            limite = trabajadores * TAREAS_POR_TRABAJADOR
+            for indice, coeficientes, ruta in tareas:
+                en_vuelo.add(ejecutor.submit(_renderizar_pagina_trabajador, indice, coeficientes, ruta, dpi))
+                if len(en_vuelo) >= limite:
+                    terminadas, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                    for futuro in terminadas:
+                        escribir(futuro.result())
+            for futuro in wait(en_vuelo).done:
+                escribir(futuro.result())
+    return completadas
+
+
+def imprimir_progreso(completadas, paginas_por_segundo):
+    """Callback de progreso que escribe una línea en stderr"""
+    print(f"\r{completadas} páginas - {paginas_por_segundo:.1f} páginas/s", end='', file=sys.stderr)
+
+
+def crear_parser():
+    """Crea el parser de argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Informe con una página por sistema")
+    parser.add_argument('entrada', nargs='?', default='-',
+                        help="Archivo CSV/NPY/Parquet con columnas a1, b1, a2, b2 ('-' = stdin)")
+    parser.add_argument('-o', '--directorio', default='informe',
+                        help="Directorio de salida (por defecto %(default)s)")
+    parser.add_argument('--formato', choices=FORMATOS_PAGINA, default='png',
+                        help="Formato de las páginas (por defecto %(default)s)")
+    parser.add_argument('--formato-entrada', choices=FORMATOS,
+                        help="Formato de entrada (por defecto según la extensión, o CSV)")
+    parser.add_argument('--trabajadores', type=int, default=None,
+                        help="Procesos de dibujo (por defecto uno por núcleo)")
+    parser.add_argument('--dpi', type=int, default=100,
+                        help="Resolución de las páginas PNG (por defecto %(default)s)")
+    return parser
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos
+    
+    Args:
+        argv: Lista de argumentos (por defecto sys.argv[1:])
+    
+    Returns:
+        int: Código de salida del proceso
+    """
+    args = crear_parser().parse_args(argv)
+    sistemas = (fila for trozo in leer_trozos(args.entrada, args.formato_entrada) for fila in trozo)
+    
+    try:
+        total = generar_informe(sistemas, args.directorio, args.formato, args.trabajadores,
+                                args.dpi, progreso=imprimir_progreso)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"\nError: {e}", file=sys.stderr)
+        return 1
+    
+    print(f"\n{total} páginas escritas en {args.directorio}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Módulo de instrumentación: tiempos y número de llamadas por etapa
+
+Se activa con la variable de entorno ESTABILIDAD_PERFIL=1, con la opción
+--perfil de main.py o llamando a activar(). Desactivada, cada etapa cuesta
+una comprobación y un contexto vacío.
+
+Uso:
+    with etapa('campo'):
+        ...
+    estadisticas()  # {'campo': {'llamadas': ..., 'total_s': ..., ...}}
+"""
+
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+
+_activa = os.environ.get('ESTABILIDAD_PERFIL', '').strip().lower() not in ('', '0', 'no', 'false')
+_candado = threading.Lock()  # Las etapas se registran desde el hilo de Tk y el trabajador
+_registros = {}
+_NULO = nullcontext()
+
+
+class _Medicion:
+    """Contexto que mide una etapa y la registra al salir"""
+    
+    __slots__ = ('nombre', 'inicio')
+    
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.inicio = None
+    
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        registrar(self.nombre, time.perf_counter() - self.inicio)
+        return False
+
+
+def activar(activa=True):
+    """
+    Activa o desactiva la instrumentación
+    
+    Args:
+        activa: True para registrar las etapas
+    """
+    global _activa
+    _activa = bool(activa)
+
+
+def activada():
+    """Indica si la instrumentación está activa"""
+    return _activa
+
+
+def etapa(nombre):
+    """
+    Contexto que mide el tiempo de una etapa
+    
+    Args:
+        nombre: Nombre de la etapa (p. ej. 'trayectorias/euler')
+    
+    Returns:
+        Contexto de medición, o un contexto vacío si está desactivada
+    """
+    if not _activa:
+        return _NULO
+    return _Medicion(nombre)
+
+
+def registrar(nombre, duracion):
+    """
+    Registra una llamada de una etapa con la duración dada
+    
+    Args:
+        nombre: Nombre de la etapa
+        duracion: Tiempo de pared en segundos
+    """
+    if not _activa:
+        return
+    with _candado:
+        registro = _registros.get(nombre)
+        if registro is None:
+            registro = _registros[nombre] = {'llamadas': 0, 'total_s': 0.0, 'maximo_s': 0.0, 'ultimo_s': 0.0}
+        registro['llamadas'] += 1
+        registro['total_s'] += duracion
+        registro['maximo_s'] = max(registro['maximo_s'], duracion)
+        registro['ultimo_s'] = duracion
+
+
+def estadisticas():
+    """
+    Obtiene los registros de todas las etapas
+    
+    Returns:
+        dict: Por etapa, llamadas, total_s, medio_s, maximo_s y ultimo_s
+    """
+    with _candado:
+        return {nombre: dict(registro, medio_s=registro['total_s'] / registro['llamadas'])
+                for nombre, registro in _registros.items()}
+
+
+def reiniciar():
+    """Borra todos los registros"""
+    with _candado:
+        _registros.clear()
+
+
+def resumen():
+    """
+    Formatea los registros como texto, una etapa por línea
+    
+    Returns:
+        str: Líneas 'etapa  llamadas  último  medio' en milisegundos
+    """
+    lineas = []
+    for nombre, registro in sorted(estadisticas().items()):
+        lineas.append(f"{nombre:22s} {registro['llamadas']:5d}x "
+                      f"{registro['ultimo_s'] * 1e3:8.2f} ms (medio {registro['medio_s'] * 1e3:.2f} ms)")
+    return "\n".join(lineas)
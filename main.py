@@ -7,12 +7,36 @@ Módulos:
 - visualizador_sistema.py: Visualización gráfica
 """
 
+import os
+import sys
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
 
-from analisis_estabilidad import AnalizadorEstabilidad
-from visualizador_sistema import VisualizadorSistema
+import numpy as np
+
+from analisis_estabilidad import AnalizadorEstabilidad, CACHE_ANALISIS, MENSAJE_NO_UNICO
+from cache_lru import guardar_caches, cargar_caches
+import instrumentacion
+from instrumentacion import etapa
+from visualizador_sistema import VisualizadorSistema, precargar_modulos
+from sistema_no_lineal import SistemaNoLineal
+from trabajador_calculo import TrabajadorCalculo
+
+
+# Rango de los deslizadores y periodo mínimo entre vistas previas (~30 fps)
+RANGO_DESLIZADOR = 5.0
+INTERVALO_ARRASTRE_MS = 33
+
+# Tiempo sin eventos de redimensionado tras el que se dibuja con calidad completa
+RETARDO_REDIMENSION_MS = 250
+
+# Espera tras crear la ventana antes de cargar matplotlib en segundo plano
+RETARDO_PRECARGA_MS = 100
+
+# Si se define, las cachés de análisis y gráficas se conservan entre sesiones
+RUTA_CACHE = os.environ.get('ESTABILIDAD_CACHE')
 
 
 class InterfazAnalisisEstabilidad:
@@ -22,6 +46,21 @@ class InterfazAnalisisEstabilidad:
         """Inicializa la interfaz principal"""
         self.ventana = tk.Tk()
         self.visualizador = VisualizadorSistema()
+        self.modo_vista = None
+        self.inicio_analisis = None
+        self.trabajador = TrabajadorCalculo(self.ventana)
+        self.deslizadores = {}
+        self._sincronizando = False
+        self._arrastre_pendiente = False
+        self._id_arrastre = None
+        self._ultimo_cuadro = None
+        self._ultimo_trabajo = None
+        self._tamano_grafica = None
+        self._id_vista_redimension = None
+        self._id_fin_redimension = None
+        self.animacion = None
+        if RUTA_CACHE:
+            cargar_caches(RUTA_CACHE, analisis=CACHE_ANALISIS, graficas=self.visualizador.cache)
         self.configurar_ventana()
         self.crear_widgets()
         
@@ -30,6 +69,7 @@ class InterfazAnalisisEstabilidad:
         self.ventana.title("Análisis de Estabilidad - Sistema Lineal")
         self.ventana.geometry("1000x700")
         self.ventana.configure(bg='#f0f0f0')
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cerrar)
         
         # Configurar estilo
         style = ttk.Style()
@@ -56,6 +96,9 @@ class InterfazAnalisisEstabilidad:
         # Frame derecho - Panel de visualización
         self.crear_panel_visualizacion()
         
+        # Barra de estado inferior
+        self.crear_barra_estado()
+        
     def crear_panel_entrada(self):
         """Crea el panel de entrada de datos"""
         self.frame_entrada = ttk.LabelFrame(self.frame_principal, text="Parámetros del Sistema", 
@@ -67,14 +110,14 @@ class InterfazAnalisisEstabilidad:
         titulo_sistema = ttk.Label(self.frame_entrada, 
                                  text="Sistema de Ecuaciones Diferenciales",
                                  font=('Arial', 12, 'bold'))
-        titulo_sistema.grid(row=0, column=0, columnspan=2, pady=(0, 10))
+        titulo_sistema.grid(row=0, column=0, columnspan=3, pady=(0, 10))
         
         # Ecuaciones del sistema
         ecuaciones = ttk.Label(self.frame_entrada,
                               text="x' = a₁x + b₁y\ny' = a₂x + b₂y",
                               font=('Courier', 11),
                               foreground='#2c3e50')
-        ecuaciones.grid(row=1, column=0, columnspan=2, pady=(0, 20))
+        ecuaciones.grid(row=1, column=0, columnspan=3, pady=(0, 20))
         
         # Entradas para coeficientes
         self.crear_entradas_coeficientes()
@@ -82,6 +125,9 @@ class InterfazAnalisisEstabilidad:
         # Botones de control
         self.crear_botones_control()
         
+        # Sistema no lineal opcional
+        self.crear_panel_no_lineal()
+        
         # Panel de resultados
         self.crear_panel_resultados()
         
@@ -96,30 +142,51 @@ class InterfazAnalisisEstabilidad:
             row=2, column=0, sticky=tk.W, pady=5)
         self.entry_a1 = ttk.Entry(self.frame_entrada, width=15, style='Entrada.TEntry')
         self.entry_a1.grid(row=2, column=1, pady=5, padx=(10, 0))
+        self.crear_deslizador(self.entry_a1, 2)
         
         # Coeficiente b1
         ttk.Label(self.frame_entrada, text="b₁:", font=('Arial', 10, 'bold')).grid(
             row=3, column=0, sticky=tk.W, pady=5)
         self.entry_b1 = ttk.Entry(self.frame_entrada, width=15, style='Entrada.TEntry')
         self.entry_b1.grid(row=3, column=1, pady=5, padx=(10, 0))
+        self.crear_deslizador(self.entry_b1, 3)
         
         # Coeficiente a2
         ttk.Label(self.frame_entrada, text="a₂:", font=('Arial', 10, 'bold')).grid(
             row=4, column=0, sticky=tk.W, pady=5)
         self.entry_a2 = ttk.Entry(self.frame_entrada, width=15, style='Entrada.TEntry')
         self.entry_a2.grid(row=4, column=1, pady=5, padx=(10, 0))
+        self.crear_deslizador(self.entry_a2, 4)
         
         # Coeficiente b2
         ttk.Label(self.frame_entrada, text="b₂:", font=('Arial', 10, 'bold')).grid(
             row=5, column=0, sticky=tk.W, pady=5)
         self.entry_b2 = ttk.Entry(self.frame_entrada, width=15, style='Entrada.TEntry')
         self.entry_b2.grid(row=5, column=1, pady=5, padx=(10, 0))
+        self.crear_deslizador(self.entry_b2, 5)
+        
+    def crear_deslizador(self, entrada, fila):
+        """
+        Crea un deslizador junto a una entrada para ajustar el coeficiente en vivo
+        
+        Args:
+            entrada: Entrada del coeficiente que controla el deslizador
+            fila: Fila de la rejilla donde se coloca
+        """
+        deslizador = ttk.Scale(self.frame_entrada, from_=-RANGO_DESLIZADOR, to=RANGO_DESLIZADOR,
+                               orient=tk.HORIZONTAL, length=120,
+                               command=lambda valor: self._al_mover_deslizador(entrada, valor))
+        deslizador.grid(row=fila, column=2, pady=5, padx=(10, 0))
+        
+        # Al soltar el deslizador se hace el render de calidad completa
+        deslizador.bind('<ButtonRelease-1>', lambda evento: self._al_soltar_deslizador())
+        self.deslizadores[entrada] = deslizador
         
     def crear_botones_control(self):
         """Crea los botones de control"""
         # Frame para botones
         frame_botones = ttk.Frame(self.frame_entrada)
-        frame_botones.grid(row=6, column=0, columnspan=2, pady=20)
+        frame_botones.grid(row=6, column=0, columnspan=3, pady=20)
         
         # Botón analizar
         self.btn_analizar = ttk.Button(frame_botones, text="🔍 Analizar Estabilidad",
@@ -127,16 +194,49 @@ class InterfazAnalisisEstabilidad:
                                      style='Accent.TButton')
         self.btn_analizar.pack(side=tk.LEFT, padx=5)
         
+        # Botón mapa traza-determinante
+        self.btn_mapa = ttk.Button(frame_botones, text="📈 Mapa Traza-Det",
+                                 command=self.mostrar_mapa)
+        self.btn_mapa.pack(side=tk.LEFT, padx=5)
+        
+        # Botón animación de partículas
+        self.btn_animar = ttk.Button(frame_botones, text="▶ Animar Flujo",
+                                   command=self.alternar_animacion)
+        self.btn_animar.pack(side=tk.LEFT, padx=5)
+        
         # Botón limpiar
         self.btn_limpiar = ttk.Button(frame_botones, text="🗑️ Limpiar",
                                     command=self.limpiar_campos)
         self.btn_limpiar.pack(side=tk.LEFT, padx=5)
         
+    def crear_panel_no_lineal(self):
+        """Crea las entradas de un sistema no lineal x' = f(x, y), y' = g(x, y)"""
+        frame_no_lineal = ttk.LabelFrame(self.frame_entrada, text="Sistema No Lineal (opcional)",
+                                         padding="10")
+        frame_no_lineal.grid(row=7, column=0, columnspan=3, sticky=(tk.W, tk.E))
+        
+        ttk.Label(frame_no_lineal, text="x' = f(x, y):").grid(row=0, column=0, sticky=tk.W, pady=2)
+        self.entry_f = ttk.Entry(frame_no_lineal, width=28, style='Entrada.TEntry')
+        self.entry_f.grid(row=0, column=1, columnspan=2, pady=2, padx=(10, 0))
+        
+        ttk.Label(frame_no_lineal, text="y' = g(x, y):").grid(row=1, column=0, sticky=tk.W, pady=2)
+        self.entry_g = ttk.Entry(frame_no_lineal, width=28, style='Entrada.TEntry')
+        self.entry_g.grid(row=1, column=1, columnspan=2, pady=2, padx=(10, 0))
+        
+        ttk.Label(frame_no_lineal, text="Región |x|, |y| ≤").grid(row=2, column=0, sticky=tk.W, pady=2)
+        self.entry_region = ttk.Entry(frame_no_lineal, width=8, style='Entrada.TEntry')
+        self.entry_region.insert(0, "3")
+        self.entry_region.grid(row=2, column=1, sticky=tk.W, pady=2, padx=(10, 0))
+        
+        self.btn_no_lineal = ttk.Button(frame_no_lineal, text="🌀 Analizar No Lineal",
+                                        command=self.analizar_no_lineal)
+        self.btn_no_lineal.grid(row=2, column=2, sticky=tk.E, pady=2)
+        
     def crear_panel_resultados(self):
         """Crea el panel de resultados"""
         self.frame_resultados = ttk.LabelFrame(self.frame_entrada, text="Resultado del Análisis",
                                              padding="10")
-        self.frame_resultados.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E), 
+        self.frame_resultados.grid(row=8, column=0, columnspan=3, sticky=(tk.W, tk.E), 
                                  pady=(10, 0))
         
         # Área de texto para resultados
@@ -168,6 +268,22 @@ class InterfazAnalisisEstabilidad:
         # Configurar expansión del frame de gráfica
         self.frame_grafica.columnconfigure(0, weight=1)
         self.frame_grafica.rowconfigure(0, weight=1)
+        self.frame_grafica.bind('<Configure>', self._al_redimensionar)
+        
+        # Superposición con los tiempos por etapa (solo con la instrumentación activa)
+        self.superposicion_perfil = tk.Label(self.frame_visualizacion, justify=tk.LEFT, anchor=tk.NW,
+                                             font=('Courier', 8), bg='#ffffe0', relief='solid', bd=1)
+        
+    def crear_barra_estado(self):
+        """Crea la barra de estado con el progreso y la latencia del análisis"""
+        self.estado = tk.StringVar(value="Listo")
+        barra = ttk.Label(self.ventana, textvariable=self.estado, anchor=tk.W,
+                         relief='sunken', padding=(10, 2))
+        barra.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        
+    def mostrar_estado(self, mensaje):
+        """Muestra un mensaje en la barra de estado"""
+        self.estado.set(mensaje)
         
     def obtener_coeficientes(self):
         """Obtiene los coeficientes de las entradas"""
@@ -200,23 +316,350 @@ class InterfazAnalisisEstabilidad:
         self.texto_resultados.insert(tk.END, texto_formateado)
         
     def analizar_sistema(self):
-        """Analiza el sistema y muestra los resultados"""
+        """Lanza el análisis en segundo plano; la interfaz sigue respondiendo"""
         try:
             # Obtener coeficientes
+            with etapa('entrada'):
+                a1, b1, a2, b2 = self.obtener_coeficientes()
+        except ValueError as e:
+            messagebox.showerror("Error de Entrada", str(e))
+            return
+        
+        self.sincronizar_deslizadores()
+        
+        # Un nuevo clic cancela el análisis anterior si aún no terminó
+        self.inicio_analisis = time.perf_counter()
+        self.mostrar_estado("Calculando...")
+        self.enviar_grafica(self._calcular_analisis, (a1, b1, a2, b2), 'alto', self._mostrar_analisis)
+        
+    def sincronizar_deslizadores(self):
+        """Coloca los deslizadores en los valores escritos en las entradas"""
+        self._sincronizando = True
+        try:
+            for entrada, deslizador in self.deslizadores.items():
+                try:
+                    valor = float(entrada.get())
+                except ValueError:
+                    continue
+                # Ampliar el rango si el valor escrito queda fuera
+                limite = max(RANGO_DESLIZADOR, abs(valor))
+                deslizador.configure(from_=-limite, to=limite)
+                deslizador.set(valor)
+        finally:
+            self._sincronizando = False
+        
+    def _al_mover_deslizador(self, entrada, valor):
+        """Actualiza la entrada y agenda una vista previa, agrupando eventos"""
+        if self._sincronizando:
+            return
+        entrada.delete(0, tk.END)
+        entrada.insert(0, f"{float(valor):.2f}")
+        
+        # Solo se conserva el último valor: los eventos intermedios se descartan
+        self._arrastre_pendiente = True
+        if self._id_arrastre is None:
+            self._id_arrastre = self.ventana.after(INTERVALO_ARRASTRE_MS, self._procesar_arrastre)
+        
+    def _procesar_arrastre(self):
+        """Lanza la vista previa de bajo detalle con los valores más recientes"""
+        self._id_arrastre = None
+        if not self._arrastre_pendiente:
+            return
+        
+        # Si el render anterior no ha terminado, esperar en lugar de acumular trabajos
+        if self.trabajador.ocupado:
+            self._id_arrastre = self.ventana.after(INTERVALO_ARRASTRE_MS, self._procesar_arrastre)
+            return
+        self._arrastre_pendiente = False
+        
+        try:
             a1, b1, a2, b2 = self.obtener_coeficientes()
-            
-            # Crear analizador
+        except ValueError:
+            return
+        
+        if self.modo_vista == 'mapa':
+            # En el mapa basta con mover el punto del sistema
+            self.mostrar_mapa()
+            return
+        
+        self.enviar_grafica(self._calcular_analisis, (a1, b1, a2, b2), 'bajo', self._mostrar_analisis)
+        
+    def _al_soltar_deslizador(self):
+        """Al soltar el deslizador, descarta vistas previas y hace el render completo"""
+        if self._id_arrastre is not None:
+            self.ventana.after_cancel(self._id_arrastre)
+            self._id_arrastre = None
+        self._arrastre_pendiente = False
+        self._ultimo_cuadro = None
+        
+        if self.modo_vista == 'mapa':
+            self.mostrar_mapa()
+        else:
+            self.analizar_sistema()
+        
+    def enviar_grafica(self, calcular, argumentos, detalle, al_terminar):
+        """
+        Envía al trabajador el cálculo de una gráfica con el tamaño actual del canvas
+        
+        El trabajo se recuerda para repetirlo con otro detalle y tamaño
+        cuando se redimensiona la ventana.
+        
+        Args:
+            calcular: Método calcular(*argumentos, detalle, tamano_px, cancelado)
+            argumentos: Tupla con los argumentos propios del sistema
+            detalle: Clave de NIVELES_DETALLE ('alto' o 'bajo')
+            al_terminar: Callback con el resultado en el hilo de Tk
+        """
+        self._ultimo_trabajo = (calcular, argumentos, al_terminar)
+        self.trabajador.enviar(calcular, *argumentos, detalle, self.tamano_grafica(),
+                               al_terminar=al_terminar,
+                               al_fallar=self._mostrar_error)
+        
+    def _al_redimensionar(self, evento):
+        """
+        Al cambiar el tamaño de la gráfica, muestra vistas previas de bajo
+        detalle (como mucho una cada INTERVALO_ARRASTRE_MS) y, cuando deja de
+        cambiar durante RETARDO_REDIMENSION_MS, la gráfica con calidad completa
+        """
+        tamano = (evento.width, evento.height)
+        if tamano == self._tamano_grafica:
+            return
+        self._tamano_grafica = tamano
+        if self._ultimo_trabajo is None or self.modo_vista not in ('trayectorias', 'no_lineal'):
+            return
+        
+        if self._id_fin_redimension is not None:
+            self.ventana.after_cancel(self._id_fin_redimension)
+        self._id_fin_redimension = self.ventana.after(RETARDO_REDIMENSION_MS, self._terminar_redimension)
+        if self._id_vista_redimension is None:
+            self._id_vista_redimension = self.ventana.after(INTERVALO_ARRASTRE_MS,
+                                                            self._vista_previa_redimension)
+        
+    def _vista_previa_redimension(self):
+        """Repite el último trabajo con bajo detalle al tamaño actual"""
+        self._id_vista_redimension = None
+        if self._id_fin_redimension is None or self.trabajador.ocupado:
+            return  # Ya terminó el redimensionado, o la vista previa anterior sigue en curso
+        calcular, argumentos, al_terminar = self._ultimo_trabajo
+        self.inicio_analisis = time.perf_counter()
+        self.enviar_grafica(calcular, argumentos, 'bajo', al_terminar)
+        
+    def _terminar_redimension(self):
+        """Repite el último trabajo con calidad completa al tamaño final"""
+        self._id_fin_redimension = None
+        if self._id_vista_redimension is not None:
+            self.ventana.after_cancel(self._id_vista_redimension)
+            self._id_vista_redimension = None
+        if self._ultimo_trabajo is None or self.modo_vista not in ('trayectorias', 'no_lineal'):
+            return
+        calcular, argumentos, al_terminar = self._ultimo_trabajo
+        self.inicio_analisis = time.perf_counter()
+        self.enviar_grafica(calcular, argumentos, 'alto', al_terminar)
+        
+    def tamano_grafica(self):
+        """
+        Tamaño en píxeles del área de la gráfica (se lee en el hilo de Tk)
+        
+        Returns:
+            tuple: (ancho, alto), o None si la ventana aún no se ha dibujado
+        """
+        ancho = self.frame_grafica.winfo_width()
+        alto = self.frame_grafica.winfo_height()
+        return (ancho, alto) if ancho > 1 and alto > 1 else None
+        
+    def _calcular_analisis(self, a1, b1, a2, b2, detalle, tamano_px, cancelado):
+        """
+        Clasifica el sistema y calcula campo y trayectorias (hilo trabajador)
+        
+        Returns:
+            tuple: (resultado, datos) o None si el trabajo se canceló
+        """
+        with etapa('clasificacion'):
             analizador = AnalizadorEstabilidad(a1, b1, a2, b2)
-            
-            # Realizar análisis
             resultado = analizador.analizar_tipo_y_estabilidad()
-            
+        datos = self.visualizador.calcular_datos_grafica(a1, b1, a2, b2, detalle=detalle,
+                                                         cancelado=cancelado, tamano_px=tamano_px)
+        if datos is None:
+            return None
+        return resultado, datos
+        
+    def _mostrar_analisis(self, valores):
+        """Muestra los resultados del análisis (hilo de Tk)"""
+        if valores is None:
+            return
+        resultado, datos = valores
+        
+        try:
             # Mostrar resultado
             self.mostrar_resultado(resultado)
             
-            # Crear y mostrar gráfica
-            figura = self.visualizador.crear_grafica_completa(a1, b1, a2, b2, parent_frame=self.frame_grafica)
-            self.visualizador.crear_canvas_tkinter(self.frame_grafica, figura)
+            # Con la animación en marcha, las partículas siguen al nuevo sistema:
+            # se retiran antes de dibujar y se reinician sobre la gráfica nueva
+            animada = self.animacion is not None
+            if animada:
+                self.animacion.detener()
+            
+            # Mostrar gráfica reutilizando el canvas y los artistas existentes
+            self.visualizador.mostrar_grafica(self.frame_grafica, datos)
+            self.modo_vista = 'trayectorias'
+            if animada:
+                self.animar(datos['coeficientes'])
+        except Exception as e:
+            self._mostrar_error(e)
+            return
+        
+        self._medir_dibujo(datos)
+        
+    def analizar_no_lineal(self):
+        """Busca y clasifica los puntos críticos del sistema no lineal en segundo plano"""
+        try:
+            semiancho = float(self.entry_region.get())
+            if semiancho <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error de Entrada", "La región debe ser un número positivo")
+            return
+        
+        try:
+            # Compilar aquí para informar de inmediato de errores en las expresiones
+            sistema = SistemaNoLineal.desde_expresiones(self.entry_f.get(), self.entry_g.get(),
+                                                        (-semiancho, semiancho, -semiancho, semiancho))
+        except ValueError as e:
+            messagebox.showerror("Error de Entrada", str(e))
+            return
+        
+        self.inicio_analisis = time.perf_counter()
+        self.mostrar_estado("Buscando puntos críticos...")
+        self.enviar_grafica(self._calcular_no_lineal, (sistema,), 'alto', self._mostrar_no_lineal)
+        
+    def _calcular_no_lineal(self, sistema, detalle, tamano_px, cancelado):
+        """
+        Busca y clasifica los puntos críticos y calcula el retrato de fase (hilo trabajador)
+        
+        Returns:
+            tuple: (resultados, datos) o None si el trabajo se canceló
+        """
+        with etapa('clasificacion'):
+            resultados = sistema.analizar()
+        puntos = np.array([r['punto'] for r in resultados]).reshape(-1, 2)
+        es_silla = any(r['resultado'].startswith("Silla") for r in resultados)
+        datos = self.visualizador.calcular_datos_campo(sistema.campo, sistema.region, puntos,
+                                                       es_silla=es_silla, detalle=detalle,
+                                                       cancelado=cancelado, tamano_px=tamano_px)
+        if datos is None:
+            return None
+        return resultados, datos
+        
+    def _mostrar_no_lineal(self, valores):
+        """Muestra los puntos críticos y el retrato de fase no lineal (hilo de Tk)"""
+        if valores is None:
+            return
+        resultados, datos = valores
+        
+        texto = f"Puntos críticos encontrados: {len(resultados)}\n"
+        for r in resultados:
+            x, y = r['punto']
+            lineas = r['resultado'].split('\n')
+            texto += f"\n({x:.4f}, {y:.4f}): " + " - ".join(lineas[:2])
+            if lineas[0] in ("Centro", MENSAJE_NO_UNICO):
+                texto += " (linealización no concluyente)"
+        self.texto_resultados.delete(1.0, tk.END)
+        self.texto_resultados.insert(tk.END, texto)
+        
+        self.detener_animacion()
+        try:
+            self.visualizador.mostrar_grafica(self.frame_grafica, datos, "Retrato de Fase No Lineal")
+            self.modo_vista = 'no_lineal'
+        except Exception as e:
+            self._mostrar_error(e)
+            return
+        
+        self._medir_dibujo(datos)
+        
+    def _medir_dibujo(self, datos):
+        """Completa el dibujo pendiente e informa de la latencia en la barra de estado"""
+        # Procesar el redibujado pendiente para medir hasta los primeros píxeles
+        with etapa('dibujo/canvas'):
+            self.frame_grafica.update_idletasks()
+        ahora = time.perf_counter()
+        self.mostrar_perfil()
+        
+        if datos['detalle'] == 'bajo':
+            # Vista previa durante el arrastre: informar de los cuadros por segundo
+            if self._ultimo_cuadro is not None:
+                self.mostrar_estado(f"Vista previa: {1.0 / (ahora - self._ultimo_cuadro):.0f} fps")
+            self._ultimo_cuadro = ahora
+            return
+        
+        latencia = (ahora - self.inicio_analisis) * 1000
+        self.mostrar_estado(f"Análisis completado en {latencia:.0f} ms (desde el clic hasta el dibujo)")
+        
+    def mostrar_perfil(self):
+        """Actualiza la superposición con los tiempos por etapa si está activa"""
+        if not instrumentacion.activada():
+            return
+        self.superposicion_perfil.configure(text=instrumentacion.resumen())
+        self.superposicion_perfil.place(relx=1.0, rely=0.0, x=-8, y=8, anchor=tk.NE)
+        self.superposicion_perfil.lift()
+        
+    def _mostrar_error(self, error):
+        """Muestra un error ocurrido en el hilo trabajador"""
+        self.mostrar_estado("Error en el análisis")
+        messagebox.showerror("Error", f"Ha ocurrido un error inesperado: {str(error)}")
+    
+    def alternar_animacion(self):
+        """Inicia o detiene las partículas que siguen el flujo del sistema lineal"""
+        if self.animacion is not None:
+            self.detener_animacion()
+            return
+        if self.modo_vista != 'trayectorias':
+            messagebox.showinfo("Animación", "Analice primero un sistema lineal para animar su flujo")
+            return
+        try:
+            self.animar(self.obtener_coeficientes())
+        except (ValueError, RuntimeError) as e:
+            messagebox.showerror("Error", str(e))
+        
+    def animar(self, coeficientes):
+        """
+        (Re)inicia la animación de partículas sobre la gráfica mostrada
+        
+        Args:
+            coeficientes: Tupla (a1, b1, a2, b2) del sistema mostrado
+        """
+        if self.animacion is not None:
+            self.animacion.detener()
+        self.animacion = self.visualizador.crear_animacion(*coeficientes)
+        self.animacion.iniciar()
+        self.btn_animar.configure(text="⏸ Detener Animación")
+        
+    def detener_animacion(self):
+        """Detiene la animación y retira las partículas"""
+        if self.animacion is not None:
+            self.animacion.detener()
+            self.animacion = None
+        self.btn_animar.configure(text="▶ Animar Flujo")
+        
+    def mostrar_mapa(self):
+        """Muestra el sistema sobre el diagrama traza-determinante"""
+        self.trabajador.cancelar()
+        self.detener_animacion()
+        try:
+            a1, b1, a2, b2 = self.obtener_coeficientes()
+            analizador = AnalizadorEstabilidad(a1, b1, a2, b2)
+            self.mostrar_resultado(analizador.analizar_tipo_y_estabilidad())
+            
+            if self.modo_vista == 'mapa':
+                # El mapa ya está visible: mover solo el punto del sistema
+                self.visualizador.mapa_estabilidad.marcar_sistema(
+                    float(analizador.calcular_traza()), float(analizador.calcular_determinante()))
+                return
+            
+            figura = self.visualizador.crear_mapa_traza_determinante(a1, b1, a2, b2,
+                                                                     parent_frame=self.frame_grafica)
+            canvas = self.visualizador.crear_canvas_tkinter(self.frame_grafica, figura)
+            self.visualizador.mapa_estabilidad.conectar_canvas(canvas)
+            self.modo_vista = 'mapa'
             
         except ValueError as e:
             messagebox.showerror("Error de Entrada", str(e))
@@ -230,21 +673,48 @@ class InterfazAnalisisEstabilidad:
         self.entry_a2.delete(0, tk.END)
         self.entry_b2.delete(0, tk.END)
         self.texto_resultados.delete(1.0, tk.END)
+        self.trabajador.cancelar()
+        self.detener_animacion()
+        self.mostrar_estado("Listo")
         
         # Limpiar gráfica completamente
         for widget in self.frame_grafica.winfo_children():
             widget.destroy()
+        self.modo_vista = None
+        self._ultimo_trabajo = None
         
         # Forzar actualización del layout
         self.frame_grafica.update_idletasks()
     
+    def cerrar(self):
+        """Guarda las cachés (si está configurado) y cierra la ventana"""
+        self.trabajador.cancelar()
+        self.detener_animacion()
+        if RUTA_CACHE:
+            try:
+                guardar_caches(RUTA_CACHE, analisis=CACHE_ANALISIS, graficas=self.visualizador.cache)
+            except OSError as e:
+                # La ventana se cierra a continuación: avisar con un diálogo, no en la barra de estado
+                self.mostrar_estado("No se pudo guardar la caché")
+                messagebox.showwarning("Caché", f"No se pudo guardar la caché en {RUTA_CACHE}: {e}")
+        self.ventana.destroy()
+    
+    def precargar(self):
+        """Carga matplotlib y el backend en segundo plano, tras mostrar la ventana"""
+        solver = self.visualizador.metodo_trayectorias == 'solver'
+        threading.Thread(target=precargar_modulos, args=(solver,), name='Precarga',
+                         daemon=True).start()
+    
     def ejecutar(self):
         """Ejecuta la aplicación"""
+        self.ventana.after(RETARDO_PRECARGA_MS, self.precargar)
         self.ventana.mainloop()
 
 
 def main():
     """Función principal"""
+    if '--perfil' in sys.argv[1:]:
+        instrumentacion.activar()
     app = InterfazAnalisisEstabilidad()
     app.ejecutar()
 
@@ -0,0 +1,268 @@
+"""
+Módulo para el diagrama traza-determinante (diagrama de Poincaré)
+
+El fondo se calcula como un ráster vectorizado dividido en teselas que se
+guardan en una caché LRU por (límites, resolución), de modo que desplazar o
+hacer zoom reutiliza las teselas ya calculadas. El sistema actual se dibuja
+como una capa superpuesta que se actualiza sin reconstruir el fondo.
+"""
+
+import numpy as np
+from matplotlib.colors import to_rgba
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+
+from analisis_estabilidad import clasificar_traza_determinante, TIPOS_PUNTO_CRITICO, ESTABILIDADES
+from cache_lru import CacheLRU
+
+
+# Colores de cada región según (tipo, estabilidad)
+COLORES_REGION = {
+    ("Nodo", "Asintóticamente Estable"): '#4c9be8',
+    ("Nodo", "Inestable"): '#f08a5d',
+    ("Silla", "Inestable"): '#b83b5e',
+    ("Foco o Espiral", "Asintóticamente Estable"): '#5ec576',
+    ("Foco o Espiral", "Inestable"): '#f9d56e',
+    ("Centro", "Estable"): '#222222',
+    ("Nodo Especial", "Asintóticamente Estable"): '#2f6fb3',
+    ("Nodo Especial", "Inestable"): '#c0602e',
+}
+COLOR_OTROS = '#bbbbbb'
+
+
+def tabla_colores():
+    """Construye la tabla RGBA indexada por codigo_tipo * len(ESTABILIDADES) + codigo_estabilidad"""
+    tabla = np.empty((len(TIPOS_PUNTO_CRITICO) * len(ESTABILIDADES), 4), dtype=np.float32)
+    for i, tipo in enumerate(TIPOS_PUNTO_CRITICO):
+        for j, estabilidad in enumerate(ESTABILIDADES):
+            color = COLORES_REGION.get((tipo, estabilidad), COLOR_OTROS)
+            tabla[i * len(ESTABILIDADES) + j] = to_rgba(color)
+    return tabla
+
+
+class MapaTrazaDeterminante:
+    """Ráster del diagrama traza-determinante con teselas en caché"""
+    
+    def __init__(self, resolucion=128, capacidad_cache=64):
+        """
+        Inicializa el mapa
+        
+        Args:
+            resolucion: Píxeles por lado de cada tesela
+            capacidad_cache: Número máximo de teselas en la caché LRU
+        """
+        self.resolucion = resolucion
+        self.cache = CacheLRU(capacidad_cache)
+        self._tabla_colores = tabla_colores()
+        self.ax = None
+        self.canvas = None
+        self._imagen = None
+        self._fronteras = {}
+        self._punto = None
+        self._etiqueta = None
+        self._fondo = None
+        self._actualizando = False
+    
+    def _calcular_tesela(self, limites):
+        """
+        Clasifica los centros de los píxeles de una tesela
+        
+        Args:
+            limites: Tupla (traza_min, traza_max, det_min, det_max)
+        
+        Returns:
+            np.ndarray: Códigos de región (resolucion, resolucion) en uint8,
+            con filas según el determinante y columnas según la traza
+        """
+        x0, x1, y0, y1 = limites
+        paso_x = (x1 - x0) / self.resolucion
+        paso_y = (y1 - y0) / self.resolucion
+        traza = x0 + paso_x * (np.arange(self.resolucion) + 0.5)
+        determinante = y0 + paso_y * (np.arange(self.resolucion) + 0.5)
+        T, D = np.meshgrid(traza, determinante)
+        
+        codigo_tipo, codigo_estabilidad = clasificar_traza_determinante(T, D)
+        return (codigo_tipo * len(ESTABILIDADES) + codigo_estabilidad).astype(np.uint8)
+    
+    def tesela(self, nivel, ix, iy):
+        """
+        Obtiene una tesela de la caché o la calcula
+        
+        Args:
+            nivel: Las teselas del nivel miden 2**nivel unidades por lado
+            ix, iy: Índices de la tesela en traza y determinante
+        
+        Returns:
+            np.ndarray: Códigos de región de la tesela
+        """
+        tamano = 2.0 ** nivel
+        limites = (ix * tamano, (ix + 1) * tamano, iy * tamano, (iy + 1) * tamano)
+        return self.cache.obtener_o_calcular((limites, self.resolucion),
+                                             lambda: self._calcular_tesela(limites))
+    
+    def raster(self, limites):
+        """
+        Compone el mosaico de teselas que cubre los límites dados
+        
+        Args:
+            limites: Tupla (traza_min, traza_max, det_min, det_max)
+        
+        Returns:
+            tuple: (codigos, extension) con los códigos del mosaico y su
+            extensión (x0, x1, y0, y1) en coordenadas traza-determinante
+        """
+        x0, x1, y0, y1 = limites
+        # Teselas de tamaño potencia de dos: la vista abarca de 2 a 3 por eje
+        nivel = int(np.ceil(np.log2(max(x1 - x0, y1 - y0) / 2.0)))
+        tamano = 2.0 ** nivel
+        columnas = range(int(np.floor(x0 / tamano)), int(np.ceil(x1 / tamano)))
+        filas = range(int(np.floor(y0 / tamano)), int(np.ceil(y1 / tamano)))
+        
+        codigos = np.block([[self.tesela(nivel, ix, iy) for ix in columnas] for iy in filas])
+        extension = (columnas[0] * tamano, (columnas[-1] + 1) * tamano,
+                     filas[0] * tamano, (filas[-1] + 1) * tamano)
+        return codigos, extension
+    
+    def dibujar(self, ax, limites):
+        """
+        Dibuja el mapa completo (fondo, fronteras y leyenda) en unos ejes
+        
+        Args:
+            ax: Ejes de matplotlib
+            limites: Tupla (traza_min, traza_max, det_min, det_max)
+        """
+        self.ax = ax
+        self.canvas = None
+        self._fondo = None
+        
+        self._imagen = ax.imshow(np.zeros((1, 1, 4), dtype=np.float32), origin='lower',
+                                 interpolation='nearest', aspect='auto', zorder=0)
+        estilo = dict(color='black', linewidth=1.2, zorder=2)
+        self._fronteras = {
+            'det_cero': ax.plot([], [], linestyle='-', **estilo)[0],
+            'centro': ax.plot([], [], linestyle='--', **estilo)[0],
+            'nodo_especial': ax.plot([], [], linestyle=':', **estilo)[0],
+        }
+        self._punto = ax.plot([], [], 'o', color='white', markeredgecolor='black',
+                              markersize=10, markeredgewidth=2, zorder=5)[0]
+        self._etiqueta = ax.annotate('', (0, 0), xytext=(8, 8), textcoords='offset points',
+                                     fontsize=9, fontweight='bold', zorder=5,
+                                     bbox=dict(boxstyle='round,pad=0.2', facecolor='white', alpha=0.8))
+        
+        ax.set_xlabel('Traza (τ)', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Determinante (Δ)', fontsize=12, fontweight='bold')
+        ax.set_title('Diagrama Traza-Determinante', fontsize=14, fontweight='bold', pad=20)
+        
+        leyenda = [Patch(facecolor=color, edgecolor='black', label=f"{tipo} ({estabilidad})")
+                   for (tipo, estabilidad), color in COLORES_REGION.items()
+                   if tipo not in ("Centro", "Nodo Especial")]
+        leyenda += [
+            Line2D([], [], color='black', linestyle='--', label='Centro (τ = 0, Δ > 0)'),
+            Line2D([], [], color='black', linestyle=':', label='Nodo Especial (τ² = 4Δ)'),
+            Line2D([], [], color='black', linestyle='-', label='No único (Δ = 0)'),
+        ]
+        ax.legend(handles=leyenda, loc='lower left', fontsize=7, framealpha=0.9)
+        
+        self.establecer_vista(limites)
+    
+    def establecer_vista(self, limites):
+        """
+        Cambia la vista reutilizando las teselas en caché
+        
+        Args:
+            limites: Tupla (traza_min, traza_max, det_min, det_max)
+        """
+        self._actualizando = True
+        try:
+            self.ax.set_xlim(limites[0], limites[1])
+            self.ax.set_ylim(limites[2], limites[3])
+        finally:
+            self._actualizando = False
+        self._actualizar_fondo(limites)
+    
+    def _actualizar_fondo(self, limites):
+        """Actualiza el ráster y las curvas frontera para los límites dados"""
+        codigos, extension = self.raster(limites)
+        self._imagen.set_data(self._tabla_colores[codigos])
+        self._imagen.set_extent(extension)
+        
+        x0, x1, y0, y1 = limites
+        traza = np.linspace(x0, x1, 200)
+        self._fronteras['det_cero'].set_data([x0, x1], [0, 0])
+        self._fronteras['centro'].set_data([0, 0], [0, max(y1, 0)])
+        self._fronteras['nodo_especial'].set_data(traza, traza ** 2 / 4.0)
+    
+    def _al_cambiar_limites(self, ax):
+        """Callback de matplotlib al desplazar o hacer zoom sobre los ejes"""
+        if not self._actualizando:
+            self._actualizar_fondo(ax.get_xlim() + ax.get_ylim())
+    
+    def conectar_canvas(self, canvas):
+        """
+        Activa el redibujado parcial (blitting) de la capa del sistema actual
+        
+        Args:
+            canvas: Canvas de matplotlib donde se muestra la figura
+        """
+        self.canvas = canvas
+        self._punto.set_animated(True)
+        self._etiqueta.set_animated(True)
+        canvas.mpl_connect('draw_event', self._al_dibujar)
+        self.ax.callbacks.connect('xlim_changed', self._al_cambiar_limites)
+        self.ax.callbacks.connect('ylim_changed', self._al_cambiar_limites)
+        canvas.draw_idle()
+    
+    def _al_dibujar(self, evento):
+        """Guarda el fondo tras un redibujado completo y pinta la capa superpuesta"""
+        if not self.canvas.supports_blit:
+            return
+        self._fondo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._dibujar_superposicion()
+    
+    def _dibujar_superposicion(self):
+        """Pinta solo el punto del sistema sobre el fondo guardado"""
+        self.canvas.restore_region(self._fondo)
+        self.ax.draw_artist(self._punto)
+        self.ax.draw_artist(self._etiqueta)
+        self.canvas.blit(self.ax.bbox)
+    
+    def marcar_sistema(self, traza, determinante, etiqueta=None):
+        """
+        Marca el sistema actual sin reconstruir el fondo
+        
+        Si el punto queda fuera de la vista, la vista se recentra usando las
+        teselas de la caché.
+        
+        Args:
+            traza, determinante: Coordenadas del sistema en el diagrama
+            etiqueta: Texto que acompaña al punto (por defecto sus coordenadas)
+        """
+        self._punto.set_data([traza], [determinante])
+        self._etiqueta.xy = (traza, determinante)
+        self._etiqueta.set_text(etiqueta or f"τ={traza:.2f}, Δ={determinante:.2f}")
+        
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        if not (x0 <= traza <= x1 and y0 <= determinante <= y1):
+            self.establecer_vista(limites_para(traza, determinante))
+            if self.canvas is not None:
+                self.canvas.draw_idle()
+        elif self.canvas is not None:
+            if self._fondo is not None:
+                self._dibujar_superposicion()
+            else:
+                self.canvas.draw_idle()
+
+
+def limites_para(traza, determinante):
+    """
+    Calcula una vista centrada en el origen que incluye el sistema dado
+    
+    Args:
+        traza, determinante: Coordenadas del sistema
+    
+    Returns:
+        tuple: (traza_min, traza_max, det_min, det_max)
+    """
+    semiancho = max(3.0, 1.5 * abs(traza), 1.5 * abs(determinante))
+    return (-semiancho, semiancho, -semiancho, semiancho)
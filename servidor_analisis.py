@@ -0,0 +1,512 @@
+"""
+Módulo con un servicio HTTP local para analizar y dibujar sistemas sin Tk
+
+Rutas:
+    GET/POST /analyze   obtener_informacion_completa en JSON
+    GET      /portrait  Retrato de fase en PNG (crear_grafica_completa)
+    GET      /metrics   Percentiles de latencia y profundidad de las colas
+
+Las peticiones de análisis que llegan a la vez se agrupan en microlotes: se
+acumulan durante unos milisegundos (o hasta llenar un lote) y se clasifican
+con una única llamada vectorizada a analizar_lote. Los retratos se dibujan
+en un ProcessPoolExecutor (matplotlib no es seguro entre hilos) con una cola
+acotada; cuando se llena, el servidor responde 503 con Retry-After en vez de
+acumular trabajo.
+
+Uso:
+    python servidor_analisis.py --puerto 8000
+    curl 'http://127.0.0.1:8000/analyze?a1=1&b1=2&a2=3&b2=-1'
+    curl -d '{"a1": 0, "b1": 1, "a2": -1, "b2": 0}' http://127.0.0.1:8000/analyze
+    curl -o retrato.png 'http://127.0.0.1:8000/portrait?a1=-0.3&b1=2&a2=-2&b2=-0.3'
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from analisis_estabilidad import informacion_completa_lote
+from generador_informes import convertir_a_json, informacion_a_json
+from visualizador_sistema import NIVELES_DETALLE
+
+
+COEFICIENTES = ('a1', 'b1', 'a2', 'b2')
+
+ESPERA_LOTE_S = 0.002     # Tiempo máximo que una petición espera a su lote
+LOTE_MAXIMO = 512         # Sistemas por llamada a analizar_lote
+TAREAS_POR_TRABAJADOR = 2  # Retratos en cola por proceso antes de responder 503
+MAXIMO_CUERPO = 1 << 20   # Bytes
+MUESTRAS_LATENCIA = 4096  # Latencias recientes por ruta para los percentiles
+PERCENTILES = (50, 90, 99)
+
+# Estado de cada proceso trabajador, fijado por _inicializar_trabajador
+_estado_trabajador = {}
+
+
+class PeticionInvalida(ValueError):
+    """Error en los datos de una petición (respuesta 400)"""
+
+
+class ColaLlena(RuntimeError):
+    """La cola de retratos está llena (respuesta 503)"""
+
+
+def leer_coeficientes(datos):
+    """
+    Extrae los coeficientes de un diccionario de parámetros o de JSON
+    
+    Args:
+        datos: Diccionario con las claves a1, b1, a2 y b2
+    
+    Returns:
+        tuple: (a1, b1, a2, b2) como floats finitos
+    
+    Raises:
+        PeticionInvalida: Si falta algún coeficiente o no es un número finito
+    """
+    if not isinstance(datos, dict):
+        raise PeticionInvalida("Se esperaba un objeto con a1, b1, a2 y b2")
+    coeficientes = []
+    for nombre in COEFICIENTES:
+        if nombre not in datos:
+            raise PeticionInvalida(f"Falta el coeficiente {nombre}")
+        try:
+            valor = float(datos[nombre])
+        except (TypeError, ValueError):
+            raise PeticionInvalida(f"El coeficiente {nombre} no es un número") from None
+        if not math.isfinite(valor):
+            raise PeticionInvalida(f"El coeficiente {nombre} no es finito")
+        coeficientes.append(valor)
+    return tuple(coeficientes)
+
+
+class RegistroLatencias:
+    """Número de peticiones, errores y latencias recientes de una ruta"""
+    
+    def __init__(self, muestras=MUESTRAS_LATENCIA):
+        self.peticiones = 0
+        self.errores = 0
+        self._latencias = deque(maxlen=muestras)
+    
+    def registrar(self, duracion, error=False):
+        """Registra una petición atendida en duracion segundos"""
+        self.peticiones += 1
+        self.errores += bool(error)
+        self._latencias.append(duracion)
+    
+    def resumen(self):
+        """Diccionario con los contadores y los percentiles en milisegundos"""
+        resumen = {'peticiones': self.peticiones, 'errores': self.errores}
+        if self._latencias:
+            valores = np.percentile(np.fromiter(self._latencias, dtype=float), PERCENTILES) * 1000.0
+            resumen['latencia_ms'] = {f"p{p}": round(float(v), 3) for p, v in zip(PERCENTILES, valores)}
+        return resumen
+
+
+class AgrupadorAnalisis:
+    """
+    Agrupa las peticiones de análisis concurrentes en microlotes
+    
+    La primera petición de un lote programa su envío tras espera segundos;
+    si antes se reúnen lote_maximo peticiones, el lote sale enseguida. Todo
+    ocurre en el bucle de eventos, así que no hace falta ningún candado.
+    """
+    
+    def __init__(self, espera=ESPERA_LOTE_S, lote_maximo=LOTE_MAXIMO):
+        self.espera = espera
+        self.lote_maximo = lote_maximo
+        self._pendientes = []
+        self._temporizador = None
+        self.lotes = 0
+        self.sistemas = 0
+    
+    async def analizar(self, coeficientes):
+        """
+        Analiza un sistema dentro del próximo lote
+        
+        Args:
+            coeficientes: Tupla (a1, b1, a2, b2)
+        
+        Returns:
+            dict: obtener_informacion_completa del sistema
+        """
+        bucle = asyncio.get_running_loop()
+        futuro = bucle.create_future()
+        self._pendientes.append((coeficientes, futuro))
+        if len(self._pendientes) >= self.lote_maximo:
+            self._enviar()
+        elif self._temporizador is None:
+            self._temporizador = bucle.call_later(self.espera, self._enviar)
+        return await futuro
+    
+    def _enviar(self):
+        """Clasifica las peticiones pendientes con una sola llamada vectorizada"""
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        lote, self._pendientes = self._pendientes, []
+        if not lote:
+            return
+        try:
+            informaciones = informacion_completa_lote([coeficientes for coeficientes, _ in lote])
+        except Exception as e:
+            for _, futuro in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+        self.lotes += 1
+        self.sistemas += len(lote)
+        for (_, futuro), informacion in zip(lote, informaciones):
+            if not futuro.done():  # El cliente pudo desconectarse
+                futuro.set_result(informacion)
+    
+    def resumen(self):
+        """Diccionario con los pendientes y el tamaño medio de los lotes"""
+        return {
+            'pendientes': len(self._pendientes),
+            'lotes': self.lotes,
+            'sistemas': self.sistemas,
+            'tamano_medio': round(self.sistemas / self.lotes, 2) if self.lotes else 0.0,
+        }
+
+
+def _inicializar_trabajador():
+    """Crea el visualizador de cada proceso trabajador (uno por proceso)"""
+    from visualizador_sistema import VisualizadorSistema
+    _estado_trabajador['visualizador'] = VisualizadorSistema()
+
+
+def _renderizar_png_trabajador(coeficientes, detalle):
+    """Dibuja el retrato de fase de un sistema y lo devuelve como PNG"""
+    fig = _estado_trabajador['visualizador'].crear_grafica_completa(*coeficientes, detalle=detalle)
+    try:
+        salida = io.BytesIO()
+        fig.savefig(salida, format='png')
+    finally:
+        fig.clear()
+    return salida.getvalue()
+
+
+class ColaRetratos:
+    """Procesos de dibujo con una cola acotada de retratos en espera"""
+    
+    def __init__(self, trabajadores=None, capacidad=None):
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.capacidad = capacidad or self.trabajadores * TAREAS_POR_TRABAJADOR
+        self.en_cola = 0
+        self.rechazados = 0
+        # Los procesos se crean al llegar el primer retrato, con el servidor ya
+        # escuchando: con fork heredarían el socket de escucha y los de los
+        # clientes, que no recibirían EOF al cerrarse la conexión
+        self._ejecutor = ProcessPoolExecutor(max_workers=self.trabajadores,
+                                             mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=_inicializar_trabajador)
+    
+    async def renderizar(self, coeficientes, detalle='alto'):
+        """
+        Dibuja un retrato en un proceso trabajador
+        
+        Args:
+            coeficientes: Tupla (a1, b1, a2, b2)
+            detalle: Clave de NIVELES_DETALLE
+        
+        Returns:
+            bytes: Imagen PNG
+        
+        Raises:
+            ColaLlena: Si ya hay capacidad retratos en cola o dibujándose
+        """
+        if self.en_cola >= self.capacidad:
+            self.rechazados += 1
+            raise ColaLlena("La cola de retratos está llena")
+        self.en_cola += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._ejecutor, _renderizar_png_trabajador, coeficientes, detalle)
+        finally:
+            self.en_cola -= 1
+    
+    def resumen(self):
+        """Diccionario con la ocupación de la cola"""
+        return {
+            'en_cola': self.en_cola,
+            'capacidad': self.capacidad,
+            'trabajadores': self.trabajadores,
+            'rechazados': self.rechazados,
+        }
+    
+    def cerrar(self):
+        """Termina los procesos trabajadores"""
+        self._ejecutor.shutdown(wait=True, cancel_futures=True)
+
+
+class ServidorAnalisis:
+    """Servidor HTTP/1.1 mínimo sobre asyncio con las rutas del módulo"""
+    
+    def __init__(self, trabajadores=None, espera_lote=ESPERA_LOTE_S, lote_maximo=LOTE_MAXIMO,
+                 capacidad_retratos=None):
+        """
+        Args:
+            trabajadores: Procesos de dibujo (por defecto uno por núcleo)
+            espera_lote: Segundos que se acumulan peticiones de análisis
+            lote_maximo: Sistemas por lote de análisis
+            capacidad_retratos: Retratos en cola antes de responder 503 (por
+                defecto TAREAS_POR_TRABAJADOR por proceso)
+        """
+        self.agrupador = AgrupadorAnalisis(espera_lote, lote_maximo)
+        self.retratos = ColaRetratos(trabajadores, capacidad_retratos)
+        self.registros = {ruta: RegistroLatencias() for ruta in ('/analyze', '/portrait', '/metrics')}
+        self.conexiones = 0
+        self._servidor = None
+        self._rutas = {
+            '/analyze': self._analizar,
+            '/portrait': self._retrato,
+            '/metrics': self._metricas,
+        }
+    
+    async def iniciar(self, host='127.0.0.1', puerto=8000):
+        """
+        Empieza a aceptar conexiones
+        
+        Args:
+            host: Dirección en la que escuchar
+            puerto: Puerto (0 elige uno libre)
+        
+        Returns:
+            int: Puerto en el que escucha
+        """
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self._servidor.sockets[0].getsockname()[1]
+    
+    async def servir(self):
+        """Atiende conexiones hasta que se cancela la tarea"""
+        async with self._servidor:
+            await self._servidor.serve_forever()
+    
+    async def cerrar(self):
+        """Deja de aceptar conexiones y termina los procesos trabajadores"""
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(None, self.retratos.cerrar)
+    
+    async def _atender(self, lector, escritor):
+        """Atiende las peticiones de una conexión (keep-alive en HTTP/1.1)"""
+        self.conexiones += 1
+        try:
+            while True:
+                peticion = await self._leer_peticion(lector)
+                if peticion is None:
+                    break
+                metodo, objetivo, version, cabeceras, cuerpo = peticion
+                estado, tipo, contenido, extra = await self._despachar(metodo, objetivo, cuerpo)
+                mantener = version == 'HTTP/1.1' and cabeceras.get('connection', '').lower() != 'close'
+                self._escribir_respuesta(escritor, estado, tipo, contenido, extra, mantener)
+                await escritor.drain()
+                if not mantener:
+                    break
+        except PeticionInvalida as e:
+            self._escribir_respuesta(escritor, HTTPStatus.BAD_REQUEST, *self._json({'error': str(e)}),
+                                     {}, mantener=False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # El cliente cerró la conexión
+        finally:
+            self.conexiones -= 1
+            escritor.close()
+    
+    async def _leer_peticion(self, lector):
+        """
+        Lee la línea de petición, las cabeceras y el cuerpo
+        
+        Returns:
+            tuple: (metodo, objetivo, version, cabeceras, cuerpo), o None si
+            la conexión se cerró entre peticiones
+        """
+        linea = await lector.readline()
+        if not linea.strip():
+            return None
+        try:
+            metodo, objetivo, version = linea.decode('latin-1').split()
+        except ValueError:
+            raise PeticionInvalida("Línea de petición mal formada") from None
+        
+        cabeceras = {}
+        while True:
+            linea = await lector.readline()
+            if linea in (b'\r\n', b'\n', b''):
+                break
+            nombre, _, valor = linea.decode('latin-1').partition(':')
+            cabeceras[nombre.strip().lower()] = valor.strip()
+        
+        try:
+            longitud = int(cabeceras.get('content-length', 0))
+        except ValueError:
+            raise PeticionInvalida("Content-Length no válido") from None
+        if not 0 <= longitud <= MAXIMO_CUERPO:
+            raise PeticionInvalida("Cuerpo demasiado grande")
+        cuerpo = await lector.readexactly(longitud) if longitud else b''
+        return metodo.upper(), objetivo, version, cabeceras, cuerpo
+    
+    @staticmethod
+    def _json(datos):
+        """Tipo y contenido de una respuesta JSON"""
+        return 'application/json', json.dumps(convertir_a_json(datos), ensure_ascii=False).encode('utf-8')
+    
+    @staticmethod
+    def _escribir_respuesta(escritor, estado, tipo, contenido, extra, mantener):
+        """Escribe la línea de estado, las cabeceras y el contenido"""
+        cabeceras = [
+            f"HTTP/1.1 {estado.value} {estado.phrase}",
+            f"Content-Type: {tipo}",
+            f"Content-Length: {len(contenido)}",
+            f"Connection: {'keep-alive' if mantener else 'close'}",
+        ]
+        cabeceras.extend(f"{nombre}: {valor}" for nombre, valor in extra.items())
+        escritor.write(("\r\n".join(cabeceras) + "\r\n\r\n").encode('latin-1') + contenido)
+    
+    async def _despachar(self, metodo, objetivo, cuerpo):
+        """
+        Ejecuta la ruta pedida y registra su latencia
+        
+        Returns:
+            tuple: (estado, tipo, contenido, cabeceras adicionales)
+        """
+        inicio = time.perf_counter()
+        partes = urlsplit(objetivo)
+        ruta = self._rutas.get(partes.path)
+        extra = {}
+        if ruta is None:
+            return (HTTPStatus.NOT_FOUND, *self._json({'error': f"Ruta desconocida: {partes.path}"}), extra)
+        
+        try:
+            parametros = dict(parse_qsl(partes.query))
+            estado, tipo, contenido = HTTPStatus.OK, *await ruta(metodo, parametros, cuerpo)
+        except PeticionInvalida as e:
+            estado, (tipo, contenido) = HTTPStatus.BAD_REQUEST, self._json({'error': str(e)})
+        except ColaLlena as e:
+            estado, (tipo, contenido) = HTTPStatus.SERVICE_UNAVAILABLE, self._json({'error': str(e)})
+            extra['Retry-After'] = '1'
+        except Exception as e:
+            print(f"Error en {partes.path}: {e!r}", file=sys.stderr)
+            estado, (tipo, contenido) = HTTPStatus.INTERNAL_SERVER_ERROR, self._json({'error': str(e)})
+        
+        self.registros[partes.path].registrar(time.perf_counter() - inicio, error=estado != HTTPStatus.OK)
+        return estado, tipo, contenido, extra
+    
+    async def _analizar(self, metodo, parametros, cuerpo):
+        """/analyze: parámetros de la URL, o cuerpo JSON con un objeto o una lista"""
+        if metodo == 'POST':
+            try:
+                datos = json.loads(cuerpo or b'null')
+            except ValueError:
+                raise PeticionInvalida("El cuerpo no es JSON válido") from None
+        elif metodo == 'GET':
+            datos = parametros
+        else:
+            raise PeticionInvalida(f"Método no admitido: {metodo}")
+        
+        if isinstance(datos, list):
+            sistemas = [leer_coeficientes(d) for d in datos]
+            informaciones = await asyncio.gather(*(self.agrupador.analizar(c) for c in sistemas))
+            return self._json([informacion_a_json(i) for i in informaciones])
+        return self._json(informacion_a_json(await self.agrupador.analizar(leer_coeficientes(datos))))
+    
+    async def _retrato(self, metodo, parametros, cuerpo):
+        """/portrait: PNG del retrato de fase de los coeficientes de la URL"""
+        if metodo != 'GET':
+            raise PeticionInvalida(f"Método no admitido: {metodo}")
+        detalle = parametros.get('detalle', 'alto')
+        if detalle not in NIVELES_DETALLE:
+            raise PeticionInvalida(f"Nivel de detalle desconocido: {detalle}")
+        return 'image/png', await self.retratos.renderizar(leer_coeficientes(parametros), detalle)
+    
+    async def _metricas(self, metodo, parametros, cuerpo):
+        """/metrics: latencias por ruta y profundidad de las colas"""
+        return self._json({
+            'rutas': {ruta: registro.resumen() for ruta, registro in self.registros.items()},
+            'lotes_analisis': self.agrupador.resumen(),
+            'cola_retratos': self.retratos.resumen(),
+            'conexiones': self.conexiones,
+        })
+
+
+async def ejecutar_servidor(host='127.0.0.1', puerto=8000, **opciones):
+    """
+    Arranca el servidor y lo mantiene hasta que se cancela o recibe SIGTERM
+    
+    Args:
+        host, puerto: Dirección en la que escuchar
+        **opciones: Argumentos de ServidorAnalisis
+    """
+    servidor = ServidorAnalisis(**opciones)
+    puerto = await servidor.iniciar(host, puerto)
+    try:
+        # Terminar ordenadamente, sin dejar huérfanos los procesos de dibujo
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass  # Windows no admite manejadores de señales en el bucle
+    print(f"Escuchando en http://{host}:{puerto}", file=sys.stderr)
+    try:
+        await servidor.servir()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await servidor.cerrar()
+
+
+def crear_parser():
+    """Crea el parser de argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Servicio HTTP local de análisis y retratos de fase")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="Dirección en la que escuchar (por defecto %(default)s)")
+    parser.add_argument('--puerto', type=int, default=8000,
+                        help="Puerto (0 elige uno libre; por defecto %(default)s)")
+    parser.add_argument('--trabajadores', type=int, default=None,
+                        help="Procesos de dibujo (por defecto uno por núcleo)")
+    parser.add_argument('--espera-lote-ms', type=float, default=ESPERA_LOTE_S * 1000,
+                        help="Espera máxima de un lote de análisis (por defecto %(default)s ms)")
+    parser.add_argument('--lote-maximo', type=int, default=LOTE_MAXIMO,
+                        help="Sistemas por lote de análisis (por defecto %(default)s)")
+    parser.add_argument('--capacidad-retratos', type=int, default=None,
+                        help="Retratos en cola antes de responder 503")
+    return parser
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos
+    
+    Args:
+        argv: Lista de argumentos (por defecto sys.argv[1:])
+    
+    Returns:
+        int: Código de salida del proceso
+    """
+    args = crear_parser().parse_args(argv)
+    try:
+        asyncio.run(ejecutar_servidor(args.host, args.puerto, trabajadores=args.trabajadores,
+                                      espera_lote=args.espera_lote_ms / 1000.0,
+                                      lote_maximo=args.lote_maximo,
+                                      capacidad_retratos=args.capacidad_retratos))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Módulo para sistemas no lineales x' = f(x, y), y' = g(x, y)
+
+El campo se compila una sola vez en una función vectorizada de NumPy, de modo
+que el campo vectorial, el jacobiano, la búsqueda de puntos críticos y las
+trayectorias trabajan con arreglos completos. Los puntos críticos se buscan
+con Newton desde una rejilla de puntos de partida (todos a la vez), se
+deduplican y se clasifican linealizando con el jacobiano y las reglas de
+AnalizadorEstabilidad.
+"""
+
+import numpy as np
+
+from analisis_estabilidad import AnalizadorEstabilidad
+
+
+# Nombres disponibles en las expresiones, además de x e y
+FUNCIONES_PERMITIDAS = {
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'asin': np.arcsin, 'acos': np.arccos, 'atan': np.arctan, 'atan2': np.arctan2,
+    'sinh': np.sinh, 'cosh': np.cosh, 'tanh': np.tanh,
+    'exp': np.exp, 'log': np.log, 'ln': np.log, 'log10': np.log10, 'sqrt': np.sqrt,
+    'abs': np.abs, 'sign': np.sign, 'hypot': np.hypot,
+    'min': np.minimum, 'max': np.maximum,
+    'pi': np.pi, 'e': np.e,
+}
+REGION_POR_DEFECTO = (-3.0, 3.0, -3.0, 3.0)
+
+
+def _compilar_expresion(expresion):
+    """
+    Compila una expresión en x e y, admitiendo solo FUNCIONES_PERMITIDAS
+    
+    Raises:
+        ValueError: Si la expresión no es válida o usa nombres desconocidos
+    """
+    try:
+        codigo = compile(expresion.replace('^', '**'), '<campo>', 'eval')
+    except SyntaxError as e:
+        raise ValueError(f"Expresión no válida: {expresion}") from e
+    
+    # co_names incluye también atributos (p. ej. x.__class__), que se rechazan
+    desconocidos = set(codigo.co_names) - set(FUNCIONES_PERMITIDAS) - {'x', 'y'}
+    if desconocidos or any(hasattr(constante, 'co_code') for constante in codigo.co_consts):
+        raise ValueError(f"Nombres no permitidos en '{expresion}': {', '.join(sorted(desconocidos)) or 'lambda'}")
+    return codigo
+
+
+def compilar_campo(expresion_f, expresion_g):
+    """
+    Compila f(x, y) y g(x, y) en una función vectorizada
+    
+    Args:
+        expresion_f, expresion_g: Expresiones en x e y, p. ej. 'y' y
+            '-sin(x) - 0.5*y'; admiten las funciones de FUNCIONES_PERMITIDAS
+            y '^' como potencia
+    
+    Returns:
+        callable: campo(x, y) -> (u, v) con arreglos de la forma de x e y
+    
+    Raises:
+        ValueError: Si alguna expresión no es válida
+    """
+    codigo_f = _compilar_expresion(expresion_f)
+    codigo_g = _compilar_expresion(expresion_g)
+    entorno = {'__builtins__': {}, **FUNCIONES_PERMITIDAS}
+    
+    def campo(x, y):
+        variables = {'x': x, 'y': y}
+        with np.errstate(all='ignore'):
+            u = eval(codigo_f, entorno, variables)
+            v = eval(codigo_g, entorno, variables)
+        # Las expresiones constantes devuelven escalares: difundir a la forma de x
+        forma = np.broadcast(x, y).shape
+        return (np.broadcast_to(np.asarray(u, dtype=float), forma),
+                np.broadcast_to(np.asarray(v, dtype=float), forma))
+    
+    campo.expresiones = (expresion_f, expresion_g)
+    return campo
+
+
+class SistemaNoLineal:
+    """Clase para analizar los puntos críticos de un sistema no lineal plano"""
+    
+    def __init__(self, campo, region=REGION_POR_DEFECTO, paso_jacobiano=1e-6):
+        """
+        Inicializa el sistema
+        
+        Args:
+            campo: Función vectorizada campo(x, y) -> (u, v), p. ej. la de
+                compilar_campo
+            region: Tupla (x_min, x_max, y_min, y_max) donde buscar puntos críticos
+            paso_jacobiano: Paso relativo de las diferencias centradas
+        """
+        self.campo = campo
+        self.region = tuple(float(limite) for limite in region)
+        self.paso_jacobiano = paso_jacobiano
+    
+    @classmethod
+    def desde_expresiones(cls, expresion_f, expresion_g, region=REGION_POR_DEFECTO):
+        """Crea el sistema compilando las expresiones de f y g (ver compilar_campo)"""
+        return cls(compilar_campo(expresion_f, expresion_g), region)
+    
+    def jacobiano(self, x, y):
+        """
+        Calcula el jacobiano por diferencias centradas en todos los puntos a la vez
+        
+        Args:
+            x, y: Arreglos de coordenadas de igual forma
+        
+        Returns:
+            tuple: (a1, b1, a2, b2) = (df/dx, df/dy, dg/dx, dg/dy)
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        hx = self.paso_jacobiano * np.maximum(1.0, np.abs(x))
+        hy = self.paso_jacobiano * np.maximum(1.0, np.abs(y))
+        
+        f_xp, g_xp = self.campo(x + hx, y)
+        f_xm, g_xm = self.campo(x - hx, y)
+        f_yp, g_yp = self.campo(x, y + hy)
+        f_ym, g_ym = self.campo(x, y - hy)
+        return ((f_xp - f_xm) / (2 * hx), (f_yp - f_ym) / (2 * hy),
+                (g_xp - g_xm) / (2 * hx), (g_yp - g_ym) / (2 * hy))
+    
+    def buscar_puntos_criticos(self, semillas_por_eje=15, iteraciones=50, tolerancia=1e-10):
+        """
+        Busca los puntos críticos de la región con Newton desde varios puntos
+        
+        Todas las semillas avanzan juntas: en cada iteración se evalúan el
+        campo y el jacobiano de todas y se resuelve cada sistema 2x2 en forma
+        cerrada. Las soluciones repetidas se agrupan.
+        
+        Args:
+            semillas_por_eje: Puntos de partida por eje (rejilla de la región)
+            iteraciones: Máximo de iteraciones de Newton
+            tolerancia: Norma del campo por debajo de la cual se acepta un punto
+        
+        Returns:
+            np.ndarray: Puntos críticos (K, 2) ordenados por x y luego por y
+        """
+        x_min, x_max, y_min, y_max = self.region
+        x, y = np.meshgrid(np.linspace(x_min, x_max, semillas_por_eje),
+                           np.linspace(y_min, y_max, semillas_por_eje))
+        x, y = x.ravel(), y.ravel()
+        activas = np.ones(x.shape, dtype=bool)
+        
+        with np.errstate(all='ignore'):
+            for _ in range(iteraciones):
+                if not activas.any():
+                    break
+                xa, ya = x[activas], y[activas]
+                f, g = self.campo(xa, ya)
+                a1, b1, a2, b2 = self.jacobiano(xa, ya)
+                determinante = a1 * b2 - b1 * a2
+                
+                # Paso de Newton: J·(dx, dy) = -(f, g) resuelto con la inversa 2x2
+                dx = -(b2 * f - b1 * g) / determinante
+                dy = -(a1 * g - a2 * f) / determinante
+                x[activas] = xa + dx
+                y[activas] = ya + dy
+                
+                convergidas = np.hypot(dx, dy) <= tolerancia * (1.0 + np.hypot(xa, ya))
+                divergidas = ~np.isfinite(dx) | ~np.isfinite(dy)
+                indices = np.flatnonzero(activas)
+                activas[indices[convergidas | divergidas]] = False
+            
+            f, g = self.campo(x, y)
+            residuo = np.hypot(f, g)
+        
+        # Aceptar las raíces (con su error de redondeo) dentro de la región
+        margen = 1e-9 * max(x_max - x_min, y_max - y_min)
+        validos = (np.isfinite(residuo) & (residuo <= np.sqrt(tolerancia))
+                   & (x >= x_min - margen) & (x <= x_max + margen)
+                   & (y >= y_min - margen) & (y <= y_max + margen))
+        return self._deduplicar(np.stack([x[validos], y[validos]], axis=-1))
+    
+    def _deduplicar(self, puntos):
+        """Agrupa los puntos más cercanos que 1e-6 veces el tamaño de la región"""
+        if len(puntos) == 0:
+            return puntos.reshape(0, 2)
+        x_min, x_max, y_min, y_max = self.region
+        distancia_minima = 1e-6 * max(x_max - x_min, y_max - y_min, 1.0)
+        
+        distancias = np.hypot(*(puntos[:, None, :] - puntos[None, :, :]).transpose(2, 0, 1))
+        representante = np.argmax(distancias <= distancia_minima, axis=1)  # Primer punto cercano
+        unicos = puntos[np.unique(representante)]
+        orden = np.lexsort((unicos[:, 1], unicos[:, 0]))
+        return unicos[orden]
+    
+    def analizar(self, **opciones_busqueda):
+        """
+        Busca los puntos críticos y clasifica la linealización en cada uno
+        
+        Args:
+            **opciones_busqueda: Opciones de buscar_puntos_criticos
+        
+        Returns:
+            list: Un diccionario por punto con 'punto', 'jacobiano' y
+            'resultado' (texto de AnalizadorEstabilidad)
+        """
+        puntos = self.buscar_puntos_criticos(**opciones_busqueda)
+        a1, b1, a2, b2 = self.jacobiano(puntos[:, 0], puntos[:, 1])
+        
+        resultados = []
+        for k, (x, y) in enumerate(puntos):
+            coeficientes = (float(a1[k]), float(b1[k]), float(a2[k]), float(b2[k]))
+            analizador = AnalizadorEstabilidad(*coeficientes)
+            resultados.append({
+                'punto': (float(x), float(y)),
+                'jacobiano': coeficientes,
+                'resultado': analizador.analizar_tipo_y_estabilidad(),
+            })
+        return resultados
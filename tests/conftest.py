@@ -0,0 +1,20 @@
+"""
+Configuración común de las pruebas
+
+Los módulos del proyecto están en la raíz del repositorio; se añade al
+path para poder ejecutar las pruebas desde cualquier directorio:
+
+    python -m pytest -q
+"""
+
+import os
+import sys
+
+import matplotlib
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+# Las pruebas no abren ventanas
+matplotlib.use('Agg')
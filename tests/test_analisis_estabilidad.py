@@ -0,0 +1,155 @@
+"""Pruebas de la clasificación escalar, por lotes y robusta de sistemas 2x2"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from analisis_estabilidad import (AnalizadorEstabilidad, analizar_lote, clasificar_robusto,
+                                  describir_clasificacion, informacion_completa_lote,
+                                  TIPOS_PUNTO_CRITICO)
+
+
+def coeficientes_aleatorios(n=2000, semilla=0):
+    """Coeficientes continuos: casi seguro lejos de toda frontera"""
+    return np.random.default_rng(semilla).uniform(-5, 5, size=(n, 4))
+
+
+def coeficientes_frontera():
+    """Rejilla entera que cubre centros, nodos especiales y determinante nulo"""
+    valores = (-2.0, -1.0, 0.0, 1.0, 2.0)
+    rejilla = np.array(list(itertools.product(valores, repeat=4)))
+    # Múltiplos de 0.1 que no son exactos en binario (0.1 + 0.2 != 0.3)
+    return np.concatenate([rejilla, 0.1 * rejilla, 1e6 * rejilla])
+
+
+CASOS = {
+    'aleatorios': coeficientes_aleatorios(),
+    'frontera': coeficientes_frontera(),
+}
+
+
+@pytest.mark.parametrize('caso', sorted(CASOS))
+def test_analizar_lote_como_analizador(caso):
+    coeficientes = CASOS[caso]
+    lote = analizar_lote(coeficientes, etiquetas=False)
+    for i, fila in enumerate(coeficientes):
+        analizador = AnalizadorEstabilidad(*fila)
+        esperado = analizador.analizar_tipo_y_estabilidad()
+        assert describir_clasificacion(lote['codigo_tipo'][i], lote['codigo_estabilidad'][i],
+                                       analizador.calcular_valores_propios()) == esperado
+        assert lote['es_unico'][i] == analizador.es_punto_critico_unico()
+        np.testing.assert_allclose(lote['valores_propios'][i], analizador.calcular_valores_propios(),
+                                   rtol=0, atol=0)
+
+
+@pytest.mark.parametrize('caso', sorted(CASOS))
+def test_informacion_completa_lote_como_analizador(caso):
+    coeficientes = CASOS[caso]
+    for fila, informacion in zip(coeficientes, informacion_completa_lote(coeficientes)):
+        esperada = AnalizadorEstabilidad(*fila).obtener_informacion_completa()
+        assert informacion.keys() == esperada.keys()
+        assert informacion['coeficientes'] == esperada['coeficientes']
+        np.testing.assert_array_equal(informacion['matriz'], esperada['matriz'])
+        assert informacion['determinante'] == esperada['determinante']
+        assert informacion['traza'] == esperada['traza']
+        assert informacion['valores_propios'].dtype == esperada['valores_propios'].dtype
+        np.testing.assert_array_equal(informacion['valores_propios'], esperada['valores_propios'])
+        assert informacion['es_unico'] == esperada['es_unico']
+        assert informacion['tipo_estabilidad'] == esperada['tipo_estabilidad']
+
+
+def test_analizar_lote_columnas_y_matriz():
+    coeficientes = coeficientes_aleatorios(100)
+    por_matriz = analizar_lote(coeficientes)
+    por_columnas = analizar_lote(*coeficientes.T)
+    for nombre, valores in por_matriz.items():
+        np.testing.assert_array_equal(valores, por_columnas[nombre])
+
+
+@pytest.mark.parametrize('escala', [1e200, 1e-200])
+def test_coeficientes_extremos(escala):
+    # Sin escalar, el determinante y el discriminante se desbordan o se anulan
+    coeficientes = coeficientes_aleatorios(200) * escala
+    with np.errstate(over='raise', invalid='raise', divide='raise'):
+        lote = analizar_lote(coeficientes, etiquetas=False)
+    referencia = np.linalg.eigvals(coeficientes.reshape(-1, 2, 2))
+    np.testing.assert_allclose(np.sort_complex(lote['valores_propios']), np.sort_complex(referencia),
+                               rtol=1e-12, atol=0)
+    if escala > 1:
+        base = analizar_lote(coeficientes / escala, etiquetas=False)
+        np.testing.assert_array_equal(lote['codigo_tipo'], base['codigo_tipo'])
+        np.testing.assert_array_equal(lote['codigo_estabilidad'], base['codigo_estabilidad'])
+    for fila, valores in zip(coeficientes[:20], lote['valores_propios'][:20]):
+        np.testing.assert_array_equal(AnalizadorEstabilidad(*fila).calcular_valores_propios(), valores)
+
+
+@pytest.mark.parametrize('forma', [(10, 3), (10,), (2, 10, 4)])
+def test_analizar_lote_rechaza_formas(forma):
+    with pytest.raises(ValueError):
+        analizar_lote(np.zeros(forma))
+
+
+def test_robusto_coincide_lejos_de_fronteras():
+    coeficientes = coeficientes_aleatorios()
+    lote = analizar_lote(coeficientes, etiquetas=False)
+    robusto = clasificar_robusto(coeficientes, etiquetas=False)
+    assert robusto['confiable'].all()
+    np.testing.assert_array_equal(robusto['codigo_tipo'], lote['codigo_tipo'])
+    np.testing.assert_array_equal(robusto['codigo_estabilidad'], lote['codigo_estabilidad'])
+    np.testing.assert_array_equal(robusto['es_unico'], lote['es_unico'])
+
+
+def test_robusto_coincide_en_fronteras_enteras():
+    # Con enteros pequeños los invariantes son exactos en float64
+    coeficientes = coeficientes_frontera()[:625]
+    lote = analizar_lote(coeficientes, etiquetas=False)
+    robusto = clasificar_robusto(coeficientes, etiquetas=False)
+    exacto = clasificar_robusto(coeficientes, exacto=True, etiquetas=False)
+    assert robusto['confiable'].all()
+    for nombre in ('codigo_tipo', 'codigo_estabilidad', 'es_unico'):
+        np.testing.assert_array_equal(robusto[nombre], lote[nombre])
+        np.testing.assert_array_equal(exacto[nombre], lote[nombre])
+
+
+def test_robusto_invariante_a_escala():
+    coeficientes = coeficientes_frontera()[:625]
+    base = clasificar_robusto(coeficientes, etiquetas=False)
+    for escala in (0.1, 1e-6, 1e6):
+        escalado = clasificar_robusto(coeficientes * escala, etiquetas=False)
+        np.testing.assert_array_equal(escalado['codigo_tipo'], base['codigo_tipo'])
+        np.testing.assert_array_equal(escalado['codigo_estabilidad'], base['codigo_estabilidad'])
+
+
+def test_robusto_sin_casos_especiales():
+    robusto = clasificar_robusto(coeficientes_frontera(), etiquetas=False)
+    especiales = [TIPOS_PUNTO_CRITICO.index("Caso especial complejo"),
+                  TIPOS_PUNTO_CRITICO.index("Caso degenerado")]
+    assert not np.isin(robusto['codigo_tipo'], especiales).any()
+
+
+def test_robusto_exacto_y_tolerancia_en_frontera():
+    centro = clasificar_robusto([("1/3", 1, -1, "-1/3")], exacto=True)
+    assert centro['tipo'][0] == "Centro"
+    assert centro['confiable'][0]
+    casi = clasificar_robusto([(1 / 3, 1.0, -1.0, -1 / 3 + 1e-15)])
+    assert casi['tipo'][0] == "Centro"
+    assert not casi['confiable'][0]
+
+
+def test_informacion_completa_devuelve_copia():
+    coeficientes = (-1.0, 2.0, -2.0, -1.0)
+    informacion = AnalizadorEstabilidad(*coeficientes).obtener_informacion_completa()
+    informacion['valores_propios'][0] = 0.0
+    assert AnalizadorEstabilidad(*coeficientes).calcular_valores_propios()[0] != 0.0
+    assert not AnalizadorEstabilidad(*coeficientes).calcular_valores_propios().flags.writeable
+
+
+def test_robusto_no_finitos_no_confiables():
+    coeficientes = [(np.nan, 1.0, 2.0, 3.0), (np.inf, 0.0, 0.0, 1.0), (0.0, -np.inf, 1.0, 0.0),
+                    (1e200, 1e200, -1e200, 1e200), (1.0, 2.0, 3.0, -1.0)]
+    with np.errstate(all='raise'):
+        robusto = clasificar_robusto(coeficientes)
+    np.testing.assert_array_equal(robusto['confiable'], [False, False, False, False, True])
+    with pytest.raises(ValueError):
+        clasificar_robusto(coeficientes[:1], exacto=True)
@@ -0,0 +1,143 @@
+"""Pruebas de ida y vuelta de la línea de comandos por lotes (CSV, NPY y almacén)"""
+
+import csv
+import os
+
+import numpy as np
+import pytest
+
+from almacen_resultados import AlmacenResultados, NOMBRE_ESQUEMA, guardar_resultados
+from analisis_estabilidad import (AnalizadorEstabilidad, analizar_lote, TIPOS_PUNTO_CRITICO,
+                                  ESTABILIDADES)
+from analisis_lotes import leer_trozos, leer_trozos_csv, leer_trozos_npy, main, procesar_lotes
+
+
+def coeficientes_prueba():
+    """Mezcla de sistemas aleatorios y de frontera (enteros pequeños)"""
+    generador = np.random.default_rng(1)
+    return np.concatenate([generador.uniform(-4, 4, size=(300, 4)),
+                           generador.integers(-2, 3, size=(200, 4)).astype(float)])
+
+
+@pytest.fixture
+def entrada_csv(tmp_path):
+    coeficientes = coeficientes_prueba()
+    ruta = tmp_path / 'entrada.csv'
+    with open(ruta, 'w', newline='') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(['b2', 'a2', 'b1', 'a1'])  # Columnas desordenadas a propósito
+        escritor.writerows(coeficientes[:, ::-1].tolist())
+    return str(ruta), coeficientes
+
+
+@pytest.mark.parametrize('formato', ['npy', 'csv'])
+def test_leer_trozos(tmp_path, formato, entrada_csv):
+    ruta, coeficientes = entrada_csv
+    if formato == 'npy':
+        ruta = str(tmp_path / 'entrada.npy')
+        np.save(ruta, coeficientes)
+    trozos = list(leer_trozos(ruta, tamano_trozo=128))
+    assert [len(trozo) for trozo in trozos] == [128, 128, 128, 116]
+    np.testing.assert_array_equal(np.concatenate(trozos), coeficientes)
+
+
+def test_csv_ida_y_vuelta(tmp_path, entrada_csv):
+    ruta, coeficientes = entrada_csv
+    salida = str(tmp_path / 'salida.csv')
+    assert procesar_lotes(ruta, salida, tamano_trozo=64) == len(coeficientes)
+    
+    with open(salida, newline='', encoding='utf-8') as archivo:
+        filas = list(csv.DictReader(archivo))
+    assert len(filas) == len(coeficientes)
+    lote = analizar_lote(coeficientes)
+    for i, fila in enumerate(filas):
+        leidos = [float(fila[c]) for c in ('a1', 'b1', 'a2', 'b2')]
+        assert leidos == coeficientes[i].tolist()
+        assert float(fila['determinante']) == lote['determinante'][i]
+        assert complex(float(fila['m1_real']), float(fila['m1_imag'])) == lote['valores_propios'][i, 0]
+        assert fila['es_unico'] == str(bool(lote['es_unico'][i]))
+        assert fila['tipo'] == lote['tipo'][i]
+        assert fila['estabilidad'] == lote['estabilidad'][i]
+
+
+def test_npy_ida_y_vuelta(tmp_path):
+    coeficientes = coeficientes_prueba()
+    entrada = str(tmp_path / 'entrada.npy')
+    salida = str(tmp_path / 'salida.npy')
+    np.save(entrada, coeficientes)
+    assert procesar_lotes(entrada, salida, tamano_trozo=100) == len(coeficientes)
+    
+    registros = np.load(salida)
+    lote = analizar_lote(coeficientes, etiquetas=False)
+    np.testing.assert_array_equal(np.stack([registros[c] for c in ('a1', 'b1', 'a2', 'b2')], axis=1),
+                                  coeficientes)
+    np.testing.assert_array_equal(registros['traza'], lote['traza'])
+    np.testing.assert_array_equal(registros['m2_imag'], lote['valores_propios'][:, 1].imag)
+    np.testing.assert_array_equal(registros['tipo'], lote['codigo_tipo'])
+    np.testing.assert_array_equal(registros['estabilidad'], lote['codigo_estabilidad'])
+    # La salida NPY también sirve como entrada (campos a1..b2 del registro)
+    np.testing.assert_array_equal(np.concatenate(list(leer_trozos(salida))), coeficientes)
+
+
+def test_almacen_ida_y_vuelta(tmp_path):
+    coeficientes = coeficientes_prueba()
+    entrada = str(tmp_path / 'entrada.npy')
+    directorio = str(tmp_path / 'almacen')
+    np.save(entrada, coeficientes)
+    procesar_lotes(entrada, directorio, formato_salida='almacen', tamano_trozo=100)
+    
+    almacen = AlmacenResultados(directorio)
+    assert len(almacen) == len(coeficientes)
+    lote = analizar_lote(coeficientes, etiquetas=False)
+    np.testing.assert_array_equal(almacen.columna('codigo_tipo'), lote['codigo_tipo'])
+    np.testing.assert_array_equal(almacen.columna('coeficientes'), coeficientes.astype(np.float32))
+    
+    foco_estable = {'tipo': "Foco o Espiral", 'estabilidad': "Asintóticamente Estable"}
+    esperados = np.flatnonzero(
+        (lote['codigo_tipo'] == TIPOS_PUNTO_CRITICO.index(foco_estable['tipo']))
+        & (lote['codigo_estabilidad'] == ESTABILIDADES.index(foco_estable['estabilidad'])))
+    np.testing.assert_array_equal(almacen.consultar(**foco_estable, tamano_trozo=64), esperados)
+    assert almacen.contar(es_unico=False) == int((~lote['es_unico']).sum())
+    
+    # Los coeficientes enteros se guardan sin pérdida: la fila coincide con el analizador
+    for indice in np.flatnonzero(~lote['es_unico'])[:5].tolist() + [300, 301]:
+        fila = almacen.fila(indice)
+        esperada = AnalizadorEstabilidad(*coeficientes[indice]).obtener_informacion_completa()
+        assert fila['tipo_estabilidad'] == esperada['tipo_estabilidad']
+        assert fila['es_unico'] == esperada['es_unico']
+
+
+def test_almacen_sin_esquema_si_falla(tmp_path):
+    entrada = tmp_path / 'entrada.csv'
+    entrada.write_text("a1,b1,a2,b2\n" + "1,2,3,4\n" * 10 + "x,y,z,w\n")
+    directorio = str(tmp_path / 'almacen')
+    with pytest.raises(ValueError):
+        procesar_lotes(str(entrada), directorio, formato_salida='almacen', tamano_trozo=4)
+    assert not os.path.exists(os.path.join(directorio, NOMBRE_ESQUEMA))
+    with pytest.raises(ValueError):
+        AlmacenResultados(directorio)
+    
+    # Reescribir el mismo directorio con datos válidos lo completa
+    guardar_resultados(directorio, np.ones((3, 4)))
+    assert len(AlmacenResultados(directorio)) == 3
+
+
+@pytest.mark.parametrize('tamano', [0, -5])
+def test_tamano_trozo_no_positivo(tmp_path, capsys, entrada_csv, tamano):
+    ruta, coeficientes = entrada_csv
+    np.save(tmp_path / 'entrada.npy', coeficientes)
+    with open(ruta, newline='') as archivo, pytest.raises(ValueError):
+        next(leer_trozos_csv(archivo, tamano))
+    with pytest.raises(ValueError):
+        next(leer_trozos_npy(str(tmp_path / 'entrada.npy'), tamano))
+    
+    # La línea de comandos lo rechaza al analizar los argumentos, sin crear la salida
+    salida = tmp_path / 'salida.csv'
+    with pytest.raises(SystemExit) as error:
+        main(['batch', ruta, '-o', str(salida), '--tamano-trozo', str(tamano)])
+    assert error.value.code == 2
+    assert '--tamano-trozo' in capsys.readouterr().err
+    assert not salida.exists()
+    with pytest.raises(ValueError):
+        procesar_lotes(ruta, str(salida), tamano_trozo=tamano)
+    assert not salida.exists()
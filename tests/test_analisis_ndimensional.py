@@ -0,0 +1,90 @@
+"""Pruebas del analizador n-dimensional: rutas sin valores propios frente a eigvals"""
+
+import numpy as np
+import pytest
+
+from analisis_estabilidad import analizar_lote, TIPOS_PUNTO_CRITICO, ESTABILIDADES
+from analisis_ndimensional import AnalizadorLineal
+
+
+def pila_aleatoria(n, cantidad=500, semilla=0):
+    """Matrices con espectros de ambos lados del eje imaginario"""
+    generador = np.random.default_rng(semilla)
+    return generador.normal(size=(cantidad, n, n)) - generador.uniform(0, 2, size=(cantidad, 1, 1)) * np.eye(n)
+
+
+def pila_simetrica(n, cantidad=500, semilla=0):
+    matrices = pila_aleatoria(n, cantidad, semilla)
+    return 0.5 * (matrices + np.swapaxes(matrices, 1, 2))
+
+
+def hurwitz_por_eigvals(matrices):
+    return np.real(np.linalg.eigvals(matrices)).max(axis=-1) < 0
+
+
+@pytest.mark.parametrize('n', [1, 2, 3])
+def test_routh_como_valores_propios(n):
+    matrices = pila_aleatoria(n)
+    esperado = hurwitz_por_eigvals(matrices)
+    assert 0 < esperado.sum() < len(matrices)  # Hay casos de ambos tipos
+    np.testing.assert_array_equal(AnalizadorLineal(matrices).es_hurwitz('routh'), esperado)
+    np.testing.assert_array_equal(AnalizadorLineal(matrices).es_hurwitz('auto'), esperado)
+    np.testing.assert_array_equal(AnalizadorLineal(matrices).es_hurwitz('valores_propios'), esperado)
+
+
+@pytest.mark.parametrize('n', [2, 4, 6])
+def test_cholesky_como_valores_propios(n):
+    # Con n > 3 y sin valores propios calculados, 'auto' usa Cholesky para las simétricas
+    simetricas = pila_simetrica(n)
+    mezcla = np.concatenate([simetricas, pila_aleatoria(n, 100, semilla=1)])
+    esperado = hurwitz_por_eigvals(mezcla)
+    analizador = AnalizadorLineal(mezcla)
+    if n > 3:
+        np.testing.assert_array_equal(analizador.es_hurwitz('auto'), esperado)
+    np.testing.assert_array_equal(AnalizadorLineal(mezcla)._hurwitz_general(), esperado)
+    
+    # Pila de simétricas todas de Hurwitz: Cholesky de la pila entera sin fallos
+    estables = simetricas - (np.abs(np.linalg.eigvalsh(simetricas)).max() + 1) * np.eye(n)
+    assert AnalizadorLineal(estables)._hurwitz_general().all()
+
+
+def test_lyapunov_como_valores_propios():
+    pytest.importorskip('scipy')
+    matrices = pila_aleatoria(3, cantidad=60)
+    np.testing.assert_array_equal(AnalizadorLineal(matrices).es_hurwitz('lyapunov'),
+                                  hurwitz_por_eigvals(matrices))
+
+
+def test_valores_propios_como_numpy():
+    for matrices in (pila_aleatoria(3), pila_simetrica(4), pila_aleatoria(5, 50)):
+        valores = AnalizadorLineal(matrices).valores_propios()
+        np.testing.assert_allclose(np.sort_complex(valores), np.sort_complex(np.linalg.eigvals(matrices)),
+                                   atol=1e-9)
+
+
+def test_2x2_como_analizar_lote():
+    generador = np.random.default_rng(2)
+    coeficientes = np.concatenate([generador.uniform(-3, 3, size=(300, 4)),
+                                   generador.integers(-2, 3, size=(300, 4)).astype(float)])
+    lote = analizar_lote(coeficientes)
+    analizador = AnalizadorLineal(coeficientes.reshape(-1, 2, 2))
+    tipo, estabilidad = analizador.clasificar_2x2()
+    np.testing.assert_array_equal(tipo, lote['tipo'])
+    np.testing.assert_array_equal(estabilidad, lote['estabilidad'])
+    np.testing.assert_array_equal(analizador.valores_propios(), lote['valores_propios'])
+    
+    escalar = AnalizadorLineal.desde_coeficientes(0.0, 1.0, -1.0, 0.0)
+    assert escalar.clasificar_2x2() == ("Centro", "Estable")
+    assert escalar.es_hurwitz() is False
+    assert set(tipo) <= set(TIPOS_PUNTO_CRITICO) and set(estabilidad) <= set(ESTABILIDADES)
+
+
+def test_dimensiones_subespacios():
+    matriz = np.diag([-2.0, -1.0, 0.0, 3.0])
+    matriz[:2, :2] = [[0.0, 1.0], [-1.0, 0.0]]  # Un centro en el bloque superior
+    dimensiones = AnalizadorLineal(matriz).dimensiones_subespacios()
+    assert dimensiones == {'estable': 0, 'inestable': 1, 'centro': 3}
+    with pytest.raises(ValueError):
+        AnalizadorLineal(np.zeros((2, 3)))
+    with pytest.raises(ValueError):
+        AnalizadorLineal(np.eye(4)).es_hurwitz('routh')
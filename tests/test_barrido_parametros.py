@@ -0,0 +1,64 @@
+"""Pruebas del barrido de parámetros en uno y varios procesos"""
+
+import numpy as np
+import pytest
+
+from almacen_resultados import AlmacenResultados
+from analisis_estabilidad import analizar_lote
+from barrido_parametros import barrer_parametros, construir_ejes
+
+
+# Rejilla con ejes que pasan por cero para incluir las fronteras
+RANGOS = [(-2, 2, 9), (-2, 2, 5), np.array([-1.0, 0.0, 0.5, 1.0]), (-3, 1, 9)]
+
+
+@pytest.fixture(scope='module')
+def secuencial():
+    return barrer_parametros(RANGOS, trabajadores=1, tamano_trozo=97, valores_propios=True)
+
+
+def test_varios_trabajadores_como_uno(secuencial):
+    paralelo = barrer_parametros(RANGOS, trabajadores=3, tamano_trozo=97, valores_propios=True)
+    assert paralelo.forma == secuencial.forma == (9, 5, 4, 9)
+    for nombre in ('determinante', 'traza', 'valores_propios', 'codigo_tipo', 'codigo_estabilidad'):
+        np.testing.assert_array_equal(getattr(paralelo, nombre), getattr(secuencial, nombre))
+
+
+def test_barrido_como_analizar_lote(secuencial):
+    lote = analizar_lote(secuencial.coeficientes(), etiquetas=False)
+    np.testing.assert_array_equal(secuencial.codigo_tipo, lote['codigo_tipo'])
+    np.testing.assert_array_equal(secuencial.codigo_estabilidad, lote['codigo_estabilidad'])
+    np.testing.assert_array_equal(secuencial.valores_propios, lote['valores_propios'])
+
+
+def test_rejilla_y_coeficientes(secuencial):
+    ejes = construir_ejes(RANGOS)
+    rejilla = secuencial.como_rejilla('codigo_tipo')
+    indice = (3, 1, 2, 8)
+    plano = np.ravel_multi_index(indice, secuencial.forma)
+    np.testing.assert_array_equal(secuencial.coeficientes([plano])[0],
+                                  [eje[i] for eje, i in zip(ejes, indice)])
+    assert rejilla[indice] == secuencial.codigo_tipo[plano]
+
+
+def test_progreso_y_guardar(tmp_path, secuencial):
+    llamadas = []
+    barrido = barrer_parametros(RANGOS, trabajadores=1, tamano_trozo=500,
+                                progreso=lambda hechos, total, _: llamadas.append((hechos, total)))
+    assert llamadas[-1] == (barrido.total, barrido.total)
+    assert barrido.valores_propios is None
+    
+    # Sin valores propios guardados se recalculan al escribir el almacén
+    directorio = str(tmp_path / 'barrido')
+    assert barrido.guardar(directorio, tamano_trozo=300) == barrido.total
+    almacen = AlmacenResultados(directorio)
+    np.testing.assert_array_equal(almacen.columna('codigo_tipo'), secuencial.codigo_tipo)
+    np.testing.assert_array_equal(almacen.columna('valores_propios'),
+                                  secuencial.valores_propios.astype(np.complex64))
+
+
+def test_rangos_invalidos():
+    with pytest.raises(ValueError):
+        construir_ejes(RANGOS[:3])
+    with pytest.raises(ValueError):
+        construir_ejes(RANGOS[:3] + [np.array([])])
@@ -0,0 +1,35 @@
+"""Pruebas de la persistencia de las cachés entre sesiones"""
+
+import pickle
+
+import pytest
+
+from cache_lru import VERSION_FORMATO, CacheLRU, cargar_caches, guardar_caches
+
+
+def test_guardar_y_cargar(tmp_path):
+    ruta = tmp_path / 'cache.pkl'
+    original = CacheLRU()
+    original.guardar((1.0, 2.0), 'a')
+    original.guardar((3.0, 4.0), 'b')
+    guardar_caches(ruta, analisis=original)
+    
+    cargada = CacheLRU()
+    assert cargar_caches(ruta, analisis=cargada, graficas=CacheLRU())
+    assert cargada.exportar() == original.exportar()
+
+
+@pytest.mark.parametrize('contenido', [
+    {'version': VERSION_FORMATO},
+    {'version': VERSION_FORMATO, 'caches': None},
+    {'version': VERSION_FORMATO, 'caches': {'analisis': 5}},
+    {'version': VERSION_FORMATO, 'caches': {'analisis': [((1.0,), 'a'), 'xyz']}},
+    {'version': VERSION_FORMATO, 'caches': {'analisis': [((1.0,), 'a'), ([2.0], 'b')]}},
+    {'version': VERSION_FORMATO + 1, 'caches': {'analisis': [((1.0,), 'a')]}},
+])
+def test_archivo_mal_formado_se_ignora(tmp_path, contenido):
+    ruta = tmp_path / 'cache.pkl'
+    ruta.write_bytes(pickle.dumps(contenido))
+    cache = CacheLRU()
+    assert not cargar_caches(ruta, analisis=cache)
+    assert len(cache) == 0  # Sin entradas a medias
@@ -0,0 +1,184 @@
+"""Pruebas del servicio HTTP local, arrancado en un puerto libre de localhost"""
+
+import asyncio
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from servidor_analisis import ServidorAnalisis
+
+
+FIRMA_PNG = b'\x89PNG\r\n\x1a\n'
+SILLA = {'a1': 1, 'b1': 2, 'a2': 3, 'b2': -1}
+CENTRO = {'a1': 0, 'b1': 1, 'a2': -1, 'b2': 0}
+
+
+class ServidorEnHilo:
+    """Ejecuta un ServidorAnalisis en un bucle asyncio propio, en otro hilo"""
+    
+    def __init__(self, **opciones):
+        self.bucle = asyncio.new_event_loop()
+        self._hilo = threading.Thread(target=self.bucle.run_forever, daemon=True)
+        self._hilo.start()
+        self.servidor = ServidorAnalisis(**opciones)
+        self.puerto = self._ejecutar(self.servidor.iniciar('127.0.0.1', 0))
+        self._tarea = asyncio.run_coroutine_threadsafe(self.servidor.servir(), self.bucle)
+    
+    def _ejecutar(self, corrutina):
+        return asyncio.run_coroutine_threadsafe(corrutina, self.bucle).result(timeout=60)
+    
+    def pedir(self, metodo, ruta, cuerpo=None):
+        """Hace una petición HTTP/1.1 y devuelve (estado, cabeceras, contenido)"""
+        conexion = http.client.HTTPConnection('127.0.0.1', self.puerto, timeout=60)
+        try:
+            conexion.request(metodo, ruta, body=cuerpo)
+            respuesta = conexion.getresponse()
+            return respuesta.status, dict(respuesta.getheaders()), respuesta.read()
+        finally:
+            conexion.close()
+    
+    def pedir_hasta_eof(self, peticion, espera=20):
+        """Envía una petición en bruto y lee hasta que el servidor cierra la conexión"""
+        with socket.create_connection(('127.0.0.1', self.puerto), timeout=espera) as cliente:
+            cliente.sendall(peticion)
+            datos = b''
+            while True:
+                bloque = cliente.recv(65536)  # socket.timeout si nunca llega el EOF
+                if not bloque:
+                    return datos
+                datos += bloque
+    
+    def cerrar(self):
+        self._tarea.cancel()
+        self._ejecutar(self.servidor.cerrar())
+        self.bucle.call_soon_threadsafe(self.bucle.stop)
+        self._hilo.join(timeout=10)
+
+
+@pytest.fixture(scope='module')
+def servidor():
+    servidor = ServidorEnHilo(trabajadores=1)
+    yield servidor
+    servidor.cerrar()
+
+
+def _json(contenido):
+    return json.loads(contenido.decode('utf-8'))
+
+
+def test_analyze_get(servidor):
+    estado, cabeceras, contenido = servidor.pedir('GET', '/analyze?a1=1&b1=2&a2=3&b2=-1')
+    assert estado == 200
+    assert cabeceras['Content-Type'] == 'application/json'
+    assert cabeceras['Connection'] == 'keep-alive'
+    informacion = _json(contenido)
+    assert informacion['tipo_estabilidad'].startswith("Silla\nInestable")
+    assert informacion['determinante'] == -7
+    assert informacion['es_unico'] is True
+    assert len(informacion['valores_propios']) == 2
+
+
+def test_analyze_post_objeto(servidor):
+    estado, _, contenido = servidor.pedir('POST', '/analyze', json.dumps(CENTRO))
+    assert estado == 200
+    informacion = _json(contenido)
+    assert informacion['tipo_estabilidad'].startswith("Centro\nEstable")
+    # Valores propios como pares [real, imaginaria]
+    assert informacion['valores_propios'] == [[0.0, 1.0], [0.0, -1.0]]
+
+
+def test_analyze_post_lista(servidor):
+    estado, _, contenido = servidor.pedir('POST', '/analyze', json.dumps([SILLA, CENTRO, SILLA]))
+    assert estado == 200
+    informaciones = _json(contenido)
+    assert [i['tipo_estabilidad'].split('\n')[0] for i in informaciones] == ['Silla', 'Centro', 'Silla']
+
+
+@pytest.mark.parametrize('metodo, ruta, cuerpo', [
+    ('GET', '/analyze?a1=1&b1=2&a2=3', None),
+    ('GET', '/analyze?a1=1&b1=x&a2=3&b2=-1', None),
+    ('GET', '/analyze?a1=nan&b1=2&a2=3&b2=-1', None),
+    ('POST', '/analyze', '{no es json'),
+    ('POST', '/analyze', '[1, 2]'),
+    ('POST', '/analyze', json.dumps([SILLA, {'a1': 1}])),
+    ('PUT', '/analyze', json.dumps(SILLA)),
+    ('GET', '/portrait?a1=1&b1=2&a2=3&b2=-1&detalle=maximo', None),
+    ('POST', '/portrait', json.dumps(SILLA)),
+])
+def test_peticiones_invalidas(servidor, metodo, ruta, cuerpo):
+    estado, _, contenido = servidor.pedir(metodo, ruta, cuerpo)
+    assert estado == 400
+    assert 'error' in _json(contenido)
+
+
+def test_linea_peticion_mal_formada(servidor):
+    respuesta = servidor.pedir_hasta_eof(b"BASURA\r\n\r\n")
+    assert respuesta.startswith(b"HTTP/1.1 400 ")
+    assert b"Connection: close" in respuesta
+
+
+def test_ruta_desconocida(servidor):
+    estado, _, _ = servidor.pedir('GET', '/nada')
+    assert estado == 404
+
+
+def test_portrait_png_y_cierre(servidor):
+    # HTTP/1.0 sin keep-alive: el cliente lee hasta el EOF, que solo llega si
+    # ningún proceso trabajador conserva el socket del cliente
+    respuesta = servidor.pedir_hasta_eof(
+        b"GET /portrait?a1=-0.3&b1=2&a2=-2&b2=-0.3&detalle=bajo HTTP/1.0\r\n\r\n")
+    cabeceras, _, contenido = respuesta.partition(b"\r\n\r\n")
+    assert cabeceras.startswith(b"HTTP/1.1 200 ")
+    assert b"Content-Type: image/png" in cabeceras
+    assert b"Connection: close" in cabeceras
+    assert contenido.startswith(FIRMA_PNG)
+    assert f"Content-Length: {len(contenido)}".encode() in cabeceras
+
+
+def test_metrics(servidor):
+    servidor.pedir('GET', '/analyze?a1=1&b1=2&a2=3&b2=-1')
+    estado, _, contenido = servidor.pedir('GET', '/metrics')
+    assert estado == 200
+    metricas = _json(contenido)
+    assert set(metricas) == {'rutas', 'lotes_analisis', 'cola_retratos', 'conexiones'}
+    analyze = metricas['rutas']['/analyze']
+    assert analyze['peticiones'] >= 1
+    assert set(analyze['latencia_ms']) == {'p50', 'p90', 'p99'}
+    assert metricas['lotes_analisis']['sistemas'] >= 1
+    assert metricas['cola_retratos']['capacidad'] == 2
+
+
+def test_cola_llena_503():
+    servidor = ServidorEnHilo(trabajadores=1, capacidad_retratos=1)
+    try:
+        ruta = '/portrait?a1=1&b1=2&a2=3&b2=-1&detalle=bajo'
+        # El primer retrato ocupa la única plaza mientras arranca el proceso
+        # trabajador; los demás llegan con la cola llena
+        with ThreadPoolExecutor(max_workers=4) as ejecutor:
+            respuestas = list(ejecutor.map(lambda _: servidor.pedir('GET', ruta), range(4)))
+        estados = sorted(estado for estado, _, _ in respuestas)
+        assert estados[0] == 200 and estados[-1] == 503
+        for estado, cabeceras, contenido in respuestas:
+            if estado == 503:
+                assert cabeceras['Retry-After'] == '1'
+                assert 'error' in _json(contenido)
+        rechazados = servidor.servidor.retratos.resumen()['rechazados']
+        assert rechazados == estados.count(503)
+    finally:
+        servidor.cerrar()
+
+
+def test_importar_sin_tkinter():
+    # En un intérprete nuevo: otras pruebas pueden haber cargado ya tkinter
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    codigo = "import sys, servidor_analisis; print('tkinter' in sys.modules)"
+    proceso = subprocess.run([sys.executable, '-c', codigo], cwd=raiz, capture_output=True, text=True,
+                             check=True)
+    assert proceso.stdout.strip() == 'False'
@@ -0,0 +1,66 @@
+"""Pruebas del trazador de transiciones frente a un barrido denso de cada camino"""
+
+import numpy as np
+import pytest
+
+from analisis_estabilidad import analizar_lote, ESTABILIDADES
+from trazador_bifurcaciones import CaminosCoeficientes, TRANSICIONES, trazar_transiciones
+
+
+MUESTRAS_DENSAS = 200_001
+
+
+def codigos_densos(caminos, camino):
+    """Código combinado tipo/estabilidad en una rejilla densa del camino"""
+    t = np.linspace(0.0, 1.0, MUESTRAS_DENSAS)
+    lote = analizar_lote(caminos.evaluar(np.full(len(t), camino), t), etiquetas=False)
+    return t, lote['codigo_tipo'].astype(np.int16) * len(ESTABILIDADES) + lote['codigo_estabilidad']
+
+
+def test_transiciones_como_barrido_denso():
+    generador = np.random.default_rng(3)
+    caminos = CaminosCoeficientes.rectos(generador.uniform(-3, 3, (40, 4)),
+                                         generador.uniform(-3, 3, (40, 4)))
+    resultado = trazar_transiciones(caminos)
+    paso = 1.0 / (MUESTRAS_DENSAS - 1)
+    
+    for camino in range(len(caminos)):
+        t, codigo = codigos_densos(caminos, camino)
+        cambios = np.flatnonzero(codigo[1:] != codigo[:-1])
+        propias = resultado['camino'] == camino
+        t_trazados = resultado['t'][propias]
+        
+        # Cada cambio del barrido denso tiene una transición trazada dentro de su celda
+        for k in cambios:
+            assert np.any((t_trazados >= t[k] - 1e-9) & (t_trazados <= t[k + 1] + 1e-9)), (camino, t[k])
+        
+        # Y cada transición trazada separa los códigos del barrido denso a su alrededor
+        for i in np.flatnonzero(propias):
+            k = min(int(resultado['t'][i] / paso), MUESTRAS_DENSAS - 2)
+            vecinas = [j for j in np.flatnonzero(propias) if abs(resultado['t'][j] - resultado['t'][i]) < 2 * paso]
+            if len(vecinas) > 1 or k == 0 or k == MUESTRAS_DENSAS - 2:
+                continue  # Transiciones más juntas que la rejilla densa, o en un extremo
+            antes = resultado['tipo_antes'][i] * len(ESTABILIDADES) + resultado['estabilidad_antes'][i]
+            despues = resultado['tipo_despues'][i] * len(ESTABILIDADES) + resultado['estabilidad_despues'][i]
+            assert codigo[k - 1] == antes and codigo[k + 2] == despues, (camino, resultado['t'][i])
+
+
+@pytest.mark.parametrize('base, coeficiente, desde, hasta, t_esperado, transicion', [
+    # a1 de -1 a 1 con b2 = 0: la traza cruza cero con Δ = 1 > 0 en a1 = 0
+    ((0.0, 1.0, -1.0, 0.0), 'a1', -1.0, 1.0, 0.5, 1),
+    # b1 de 1 a -3 con a2 = 1: Δ = 0.5 - b1 cruza cero en b1 = 0.5
+    ((-1.0, 1.0, 1.0, -0.5), 'b1', 1.0, -3.0, 0.125, 0),
+])
+def test_transicion_conocida(base, coeficiente, desde, hasta, t_esperado, transicion):
+    caminos = CaminosCoeficientes.variando(base, coeficiente, desde, hasta)
+    resultado = trazar_transiciones(caminos)
+    indice = np.argmin(np.abs(resultado['t'] - t_esperado))
+    assert abs(resultado['t'][indice] - t_esperado) < 1e-9
+    assert TRANSICIONES[resultado['transicion'][indice]] == TRANSICIONES[transicion]
+
+
+def test_camino_sin_transiciones():
+    caminos = CaminosCoeficientes.rectos((-2.0, 1.0, -1.0, -2.0), (-1.0, 2.0, -2.0, -1.0))
+    resultado = trazar_transiciones(caminos)
+    assert len(resultado['t']) == 0
+    assert resultado['evaluaciones'] > 0
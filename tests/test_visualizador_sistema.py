@@ -0,0 +1,127 @@
+"""Pruebas de la solución exacta e^{At}·x0 y de la actualización de la gráfica"""
+
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.quiver import Quiver
+from scipy.integrate import solve_ivp
+
+from visualizador_sistema import GraficaTrayectorias, VisualizadorSistema
+
+
+# Una matriz por rama de calcular_exponencial (y los casos de frontera)
+MATRICES = {
+    'nodo': (-3.0, 1.0, 0.0, -1.0),
+    'silla': (1.0, 2.0, 3.0, -1.0),
+    'foco': (-1.0, 2.0, -2.0, -1.0),
+    'centro': (0.0, 1.0, -1.0, 0.0),
+    'nodo_especial': (-2.0, 0.0, 0.0, -2.0),
+    'jordan': (-1.0, 1.0, 0.0, -1.0),
+    'no_unico': (1.0, 2.0, 2.0, 4.0),
+    'casi_repetido': (-1.0, 1.0, 1e-14, -1.0),
+}
+SEMILLAS = np.array([[1.0, 0.0], [0.0, 1.0], [-1.5, 0.5], [0.3, -2.0]])
+
+
+@pytest.fixture(scope='module')
+def visualizador():
+    return VisualizadorSistema()
+
+
+def integrar(a1, b1, a2, b2, x0, t):
+    """Solución de referencia con RK de orden alto y tolerancias estrictas"""
+    matriz = np.array([[a1, b1], [a2, b2]])
+    solucion = solve_ivp(lambda _, x: matriz @ x, (t[0], t[-1]), x0, t_eval=t,
+                         method='DOP853', rtol=1e-12, atol=1e-12)
+    assert solucion.success
+    return solucion.y.T
+
+
+@pytest.mark.parametrize('nombre', sorted(MATRICES))
+def test_exponencial_como_solve_ivp(visualizador, nombre):
+    coeficientes = MATRICES[nombre]
+    t = np.linspace(0.0, 3.0, 61)
+    C, S, N = visualizador.calcular_exponencial(*coeficientes, t)
+    for x0 in SEMILLAS:
+        exacta = C[:, None] * x0 + S[:, None] * (N @ x0)
+        referencia = integrar(*coeficientes, x0, t)
+        escala = max(1.0, np.abs(referencia).max())
+        np.testing.assert_allclose(exacta, referencia, rtol=0, atol=1e-8 * escala)
+
+
+@pytest.mark.parametrize('nombre', ['silla', 'foco', 'centro', 'jordan'])
+def test_trayectorias_exacto_como_solver(visualizador, nombre):
+    coeficientes = MATRICES[nombre]
+    exactas, validas_exactas = visualizador.calcular_trayectorias(SEMILLAS, *coeficientes, t_max=2.0,
+                                                                   metodo='exacto')
+    numericas, validas_numericas = visualizador.calcular_trayectorias(SEMILLAS, *coeficientes, t_max=2.0,
+                                                                       metodo='solver')
+    assert validas_exactas.all() and validas_numericas.all()
+    np.testing.assert_allclose(exactas, numericas, rtol=1e-4, atol=1e-4)
+
+
+def test_exponencial_en_cero_es_identidad(visualizador):
+    for coeficientes in MATRICES.values():
+        C, S, _ = visualizador.calcular_exponencial(*coeficientes, np.array([0.0]))
+        assert C[0] == 1.0 and S[0] == 0.0
+
+
+def test_grafica_reutiliza_quiver_adaptativo(visualizador):
+    foco = visualizador.calcular_datos_grafica(*MATRICES['foco'])
+    secuencia = [visualizador.calcular_datos_grafica(*MATRICES['silla']),
+                 visualizador.calcular_datos_grafica(*MATRICES['foco'], detalle='bajo'),
+                 foco, foco]
+    
+    def dibujar(datos):
+        fig = Figure(figsize=(5, 4))
+        canvas = FigureCanvasAgg(fig)
+        grafica = GraficaTrayectorias(fig)
+        quivers = []
+        for d in datos:
+            grafica.actualizar(d)
+            quivers.append(grafica.quiver)
+        canvas.draw()
+        return np.asarray(canvas.buffer_rgba()).copy(), quivers, grafica
+    
+    reutilizada, quivers, grafica = dibujar(secuencia)
+    nueva, _, _ = dibujar(secuencia[-1:])
+    assert quivers[-1] is quivers[-2]  # Mismas posiciones: solo set_UVC
+    assert len({id(q) for q in quivers}) == 3  # Posiciones distintas: quiver nuevo
+    assert sum(isinstance(c, Quiver) for c in grafica.ax.collections) == 1
+    np.testing.assert_array_equal(reutilizada, nueva)
+
+
+@pytest.mark.parametrize('estilo', ['adaptativo', 'rejilla'])
+def test_cache_compartida_distingue_direcciones(estilo):
+    # Las cachés se guardan en disco y pueden cargarse con otra configuración
+    con = VisualizadorSistema(estilo_campo=estilo)
+    sin = VisualizadorSistema(estilo_campo=estilo, direcciones_propias=False)
+    sin.cache = con.cache
+    assert con.calcular_datos_grafica(*MATRICES['silla'])['direcciones']
+    assert not sin.calcular_datos_grafica(*MATRICES['silla'])['direcciones']
+
+
+def test_desbordamiento_conserva_el_principio(visualizador, monkeypatch):
+    # e^{250t} se desborda hacia t = 2.8: los puntos previos siguen siendo válidos
+    trayectorias, validas = visualizador.calcular_trayectorias([[1e-3, 0.5]], 250.0, 0.0, 0.0, -1.0,
+                                                               t_max=4.0, metodo='exacto')
+    assert validas.shape == trayectorias.shape[:2]
+    np.testing.assert_array_equal(np.isfinite(trayectorias).all(axis=2), validas)
+    assert validas[0, :100].all() and not validas[0, -1]
+    
+    # Una trayectoria con la cola no finita se dibuja con los puntos anteriores
+    instancia = VisualizadorSistema(estilo_campo='rejilla', metodo_trayectorias='solver')
+    integrar = instancia.integrar_trayectorias
+    
+    def integrar_con_cola_no_finita(*args, **kwargs):
+        trayectorias = integrar(*args, **kwargs)
+        trayectorias[0, 150:] = np.nan
+        trayectorias[1, 120:] = np.inf
+        return trayectorias
+    
+    monkeypatch.setattr(instancia, 'integrar_trayectorias', integrar_con_cola_no_finita)
+    datos = instancia.calcular_datos_grafica(*MATRICES['foco'])
+    assert all(np.isfinite(linea).all() for linea in datos['lineas'])
+    np.testing.assert_array_equal([linea[0] for linea in datos['lineas'][:2]], datos['semillas'][:2])
+    assert [len(linea) for linea in datos['lineas'][:2]] == [150, 120]
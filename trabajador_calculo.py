@@ -0,0 +1,106 @@
+"""
+Módulo para ejecutar cálculos en segundo plano sin bloquear la interfaz
+
+Los trabajos se ejecutan en un hilo trabajador y sus resultados vuelven al
+hilo de Tk a través de una cola que se consulta con ventana.after. Al enviar
+un trabajo nuevo se cancela el anterior, y los resultados obsoletos se
+descartan.
+"""
+
+import queue
+import threading
+
+
+class TrabajadorCalculo:
+    """Hilo trabajador con cancelación de trabajos obsoletos"""
+    
+    def __init__(self, ventana, intervalo_ms=10):
+        """
+        Inicializa el trabajador
+        
+        Args:
+            ventana: Ventana de Tk usada para consultar la cola con after
+            intervalo_ms: Intervalo de consulta de resultados en milisegundos
+        """
+        self.ventana = ventana
+        self.intervalo_ms = intervalo_ms
+        self._entrada = queue.Queue()
+        self._salida = queue.Queue()
+        self._generacion = 0
+        self._cancelacion = threading.Event()
+        self._callbacks = {}
+        self._consultando = False
+        
+        self._hilo = threading.Thread(target=self._bucle, name='TrabajadorCalculo', daemon=True)
+        self._hilo.start()
+    
+    def enviar(self, funcion, *args, al_terminar=None, al_fallar=None):
+        """
+        Envía un trabajo y cancela el que estuviera en curso
+        
+        La función recibe además el argumento con nombre cancelado, una
+        función sin argumentos que devuelve True si el trabajo quedó obsoleto.
+        
+        Args:
+            funcion: Función a ejecutar en el hilo trabajador
+            *args: Argumentos de la función
+            al_terminar: Callback(resultado) ejecutado en el hilo de Tk
+            al_fallar: Callback(excepcion) ejecutado en el hilo de Tk
+        
+        Returns:
+            int: Identificador del trabajo
+        """
+        self.cancelar()
+        self._generacion += 1
+        self._cancelacion = threading.Event()
+        self._callbacks = {self._generacion: (al_terminar, al_fallar)}
+        self._entrada.put((self._generacion, self._cancelacion, funcion, args))
+        
+        if not self._consultando:
+            self._consultando = True
+            self.ventana.after(self.intervalo_ms, self._consultar)
+        return self._generacion
+    
+    def cancelar(self):
+        """Cancela el trabajo en curso; su resultado se descartará"""
+        self._cancelacion.set()
+        self._callbacks = {}
+    
+    @property
+    def ocupado(self):
+        """True si hay un trabajo pendiente cuyo resultado no se ha entregado"""
+        return bool(self._callbacks)
+    
+    def _bucle(self):
+        """Bucle del hilo trabajador"""
+        while True:
+            identificador, cancelacion, funcion, args = self._entrada.get()
+            if cancelacion.is_set():
+                continue
+            try:
+                resultado = funcion(*args, cancelado=cancelacion.is_set)
+                self._salida.put((identificador, True, resultado))
+            except Exception as e:
+                self._salida.put((identificador, False, e))
+    
+    def _consultar(self):
+        """Entrega en el hilo de Tk los resultados disponibles del trabajo actual"""
+        while True:
+            try:
+                identificador, exito, valor = self._salida.get_nowait()
+            except queue.Empty:
+                break
+            
+            callbacks = self._callbacks.pop(identificador, None)
+            if callbacks is None:
+                continue  # Resultado de un trabajo cancelado u obsoleto
+            al_terminar, al_fallar = callbacks
+            if exito and al_terminar:
+                al_terminar(valor)
+            elif not exito and al_fallar:
+                al_fallar(valor)
+        
+        if self._callbacks:
+            self.ventana.after(self.intervalo_ms, self._consultar)
+        else:
+            self._consultando = False
@@ -0,0 +1,406 @@
+"""
+Módulo para localizar las bifurcaciones a lo largo de caminos de parámetros
+
+Un camino recorre el espacio de coeficientes (a1, b1, a2, b2) con t en [0, 1]
+(p. ej. b1 de -5 a 5 con el resto fijo, o una curva cualquiera). La
+clasificación de AnalizadorEstabilidad solo cambia donde se anula alguna de
+tres funciones de los coeficientes:
+
+    determinante = 0                    silla-nodo (punto crítico no único)
+    traza = 0 con determinante > 0      tipo Hopf (foco estable <-> inestable)
+    discriminante = 0                   nodo <-> foco
+
+En lugar de muestrear densamente, se toma una rejilla gruesa, se subdividen
+los intervalos donde la interpolación cuadrática de una función revela dos
+cruces ocultos (exacto en caminos rectos, donde las tres funciones son
+polinomios de grado <= 2 en t) y cada cambio de signo se refina por
+bisección. Todos los caminos y todos los intervalos se procesan a la vez como
+un único lote vectorizado.
+
+Uso:
+    python trazador_bifurcaciones.py --base -1 2 -3 0.5 --coeficiente b1 --desde -5 --hasta 5
+    python trazador_bifurcaciones.py --base 0 1 -1 0 --coeficiente a1 -o bifurcaciones.png
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from analisis_estabilidad import analizar_lote, TIPOS_PUNTO_CRITICO, ESTABILIDADES, TOLERANCIA
+
+
+COEFICIENTES = ('a1', 'b1', 'a2', 'b2')
+
+# Códigos de 'transicion' en el resultado de trazar_transiciones
+TRANSICIONES = (
+    "Silla-nodo (Δ = 0)",
+    "Hopf (τ = 0, Δ > 0)",
+    "Nodo-foco (τ² = 4Δ)",
+    "Otra",
+)
+MARCADORES_TRANSICION = ('s', 'D', '^', 'o')
+
+MUESTRAS = 33        # Rejilla gruesa por camino
+RONDAS = 4           # Rondas de subdivisión por cruces ocultos
+TOLERANCIA_T = 1e-12  # Anchura final de la bisección en t
+ITERACIONES = 60
+
+
+class CaminosCoeficientes:
+    """Familia de caminos t ∈ [0, 1] -> (a1, b1, a2, b2) evaluables en lote"""
+    
+    def __init__(self, funcion, n_caminos):
+        """
+        Args:
+            funcion: funcion(caminos, t) con dos arreglos 1-D de igual
+                longitud (índice de camino y parámetro) que devuelve los
+                coeficientes como arreglo (n, 4)
+            n_caminos: Número de caminos de la familia
+        """
+        self.funcion = funcion
+        self.n_caminos = int(n_caminos)
+    
+    def __len__(self):
+        return self.n_caminos
+    
+    def evaluar(self, caminos, t):
+        """
+        Coeficientes de los caminos dados en los parámetros dados
+        
+        Args:
+            caminos: Índices de camino (n,)
+            t: Parámetros en [0, 1] (n,)
+        
+        Returns:
+            np.ndarray: Coeficientes (n, 4)
+        """
+        return np.asarray(self.funcion(np.asarray(caminos), np.asarray(t, dtype=float)), dtype=float)
+    
+    @classmethod
+    def rectos(cls, inicio, fin):
+        """
+        Segmentos rectos de inicio a fin
+        
+        Args:
+            inicio, fin: Coeficientes (4,) o (P, 4)
+        """
+        inicio, fin = np.broadcast_arrays(np.atleast_2d(np.asarray(inicio, dtype=float)),
+                                          np.atleast_2d(np.asarray(fin, dtype=float)))
+        if inicio.shape[1] != 4:
+            raise ValueError("Se esperaban coeficientes (a1, b1, a2, b2)")
+        return cls(lambda caminos, t: inicio[caminos] + t[:, None] * (fin[caminos] - inicio[caminos]),
+                   len(inicio))
+    
+    @classmethod
+    def variando(cls, base, coeficiente, desde, hasta):
+        """
+        Caminos que varían un solo coeficiente con el resto fijo
+        
+        Args:
+            base: Coeficientes fijos (4,) o (P, 4)
+            coeficiente: 'a1', 'b1', 'a2' o 'b2'
+            desde, hasta: Valores extremos (escalares o (P,))
+        """
+        if coeficiente not in COEFICIENTES:
+            raise ValueError(f"Coeficiente desconocido: {coeficiente}")
+        columna = COEFICIENTES.index(coeficiente)
+        base = np.atleast_2d(np.asarray(base, dtype=float))
+        desde, hasta = np.broadcast_arrays(np.asarray(desde, dtype=float), np.asarray(hasta, dtype=float))
+        n = max(len(base), desde.size)
+        inicio = np.broadcast_to(base, (n, 4)).copy()
+        fin = inicio.copy()
+        inicio[:, columna] = np.broadcast_to(desde.ravel(), (n,))
+        fin[:, columna] = np.broadcast_to(hasta.ravel(), (n,))
+        return cls.rectos(inicio, fin)
+
+
+def _evaluar(caminos, indices, t):
+    """
+    Funciones frontera y clasificación en los puntos dados
+    
+    Returns:
+        tuple: (funciones (n, 3) con determinante, traza y discriminante,
+        código combinado (n,) tipo * len(ESTABILIDADES) + estabilidad)
+    """
+    lote = analizar_lote(caminos.evaluar(indices, t), etiquetas=False)
+    funciones = np.stack([lote['determinante'], lote['traza'], lote['discriminante']], axis=1)
+    codigo = lote['codigo_tipo'].astype(np.int16) * len(ESTABILIDADES) + lote['codigo_estabilidad']
+    return funciones, codigo
+
+
+def _cruces_ocultos(g0, gm, g1):
+    """
+    Punto de corte de los intervalos con dos cruces entre muestras del mismo signo
+    
+    Ajusta la parábola que pasa por los extremos y el punto medio de cada
+    intervalo; si ella (o el punto medio) cambia de signo dentro, el intervalo
+    se parte en su vértice (o en el medio).
+    
+    Args:
+        g0, gm, g1: Funciones (m, 3) en el inicio, el medio y el final
+    
+    Returns:
+        np.ndarray: Fracción u ∈ (0, 1) donde partir cada intervalo, o NaN
+    """
+    mismo_signo = (g0 >= 0) == (g1 >= 0)
+    medio_opuesto = mismo_signo & ((gm >= 0) != (g0 >= 0))
+    
+    a = 2.0 * (g0 + g1 - 2.0 * gm)
+    b = 4.0 * gm - 3.0 * g0 - g1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        u = np.where(a != 0, -b / (2.0 * a), np.nan)
+    dentro = (u > 0) & (u < 1)
+    vertice = g0 + b * u + a * u * u
+    vertice_opuesto = mismo_signo & dentro & ((vertice >= 0) != (g0 >= 0))
+    
+    corte = np.where(medio_opuesto, 0.5, np.where(vertice_opuesto, u, np.nan))
+    return np.where(np.isnan(corte), np.inf, corte).min(axis=1)
+
+
+def trazar_transiciones(caminos, muestras=MUESTRAS, rondas=RONDAS, tolerancia=TOLERANCIA_T,
+                        iteraciones=ITERACIONES):
+    """
+    Localiza dónde cambia la clasificación a lo largo de cada camino
+    
+    Un extremo del camino que cae justo sobre una frontera (p. ej. un camino
+    que empieza con Δ = 0) no cuenta como transición.
+    
+    Args:
+        caminos: CaminosCoeficientes
+        muestras: Puntos de la rejilla gruesa por camino
+        rondas: Rondas de subdivisión por cruces ocultos
+        tolerancia: Anchura final del intervalo de bisección en t
+        iteraciones: Máximo de pasos de bisección
+    
+    Returns:
+        dict: Arreglos de longitud K (una fila por transición, ordenadas por
+        camino y t) con 'camino', 't', 'coeficientes' (K, 4), 'traza',
+        'determinante', 'transicion' (códigos sobre TRANSICIONES) y
+        'tipo_antes', 'estabilidad_antes', 'tipo_despues',
+        'estabilidad_despues' (códigos sobre TIPOS_PUNTO_CRITICO y
+        ESTABILIDADES), más 'evaluaciones', el total de puntos evaluados
+    """
+    n = len(caminos)
+    rejilla = np.linspace(0.0, 1.0, muestras)
+    g, codigo = _evaluar(caminos, np.repeat(np.arange(n), muestras), np.tile(rejilla, n))
+    evaluaciones = n * muestras
+    
+    # Intervalos entre muestras consecutivas de cada camino, como arreglos planos
+    g, codigo = g.reshape(n, muestras, 3), codigo.reshape(n, muestras)
+    camino = np.repeat(np.arange(n), muestras - 1)
+    t0, t1 = np.tile(rejilla[:-1], n), np.tile(rejilla[1:], n)
+    g0, g1 = g[:, :-1].reshape(-1, 3), g[:, 1:].reshape(-1, 3)
+    c0, c1 = codigo[:, :-1].ravel(), codigo[:, 1:].ravel()
+    
+    # Subdividir donde una función cruza cero dos veces entre dos muestras
+    for _ in range(rondas):
+        gm, _ = _evaluar(caminos, camino, 0.5 * (t0 + t1))
+        evaluaciones += len(t0)
+        u = _cruces_ocultos(g0, gm, g1)
+        partir = np.isfinite(u)
+        if not partir.any():
+            break
+        tc = t0[partir] + u[partir] * (t1[partir] - t0[partir])
+        gc, cc = _evaluar(caminos, camino[partir], tc)
+        evaluaciones += len(tc)
+        camino = np.concatenate([camino[~partir], camino[partir], camino[partir]])
+        t0, t1 = (np.concatenate([t0[~partir], t0[partir], tc]),
+                  np.concatenate([t1[~partir], tc, t1[partir]]))
+        g0, g1 = (np.concatenate([g0[~partir], g0[partir], gc]),
+                  np.concatenate([g1[~partir], gc, g1[partir]]))
+        c0, c1 = (np.concatenate([c0[~partir], c0[partir], cc]),
+                  np.concatenate([c1[~partir], cc, c1[partir]]))
+    
+    # Un corchete por cada función que cambia de signo; los cambios de
+    # clasificación sin cambio de signo se bisecan sobre el propio código
+    cambia = (g0 >= 0) != (g1 >= 0)
+    intervalo, funcion = np.nonzero(cambia)
+    solo_codigo = np.flatnonzero((c0 != c1) & ~cambia.any(axis=1))
+    intervalo = np.concatenate([intervalo, solo_codigo])
+    funcion = np.concatenate([funcion, np.full(len(solo_codigo), 3)])
+    
+    bajo, alto = t0[intervalo].copy(), t1[intervalo].copy()
+    signo = g0[intervalo, np.minimum(funcion, 2)] >= 0
+    codigo_bajo = c0[intervalo]
+    for _ in range(iteraciones):
+        activo = np.flatnonzero(alto - bajo > tolerancia)
+        if len(activo) == 0:
+            break
+        medio = 0.5 * (bajo[activo] + alto[activo])
+        gm, cm = _evaluar(caminos, camino[intervalo[activo]], medio)
+        evaluaciones += len(activo)
+        por_codigo = funcion[activo] == 3
+        igual = np.where(por_codigo, cm == codigo_bajo[activo],
+                         (gm[np.arange(len(activo)), np.minimum(funcion[activo], 2)] >= 0) == signo[activo])
+        bajo[activo] = np.where(igual, medio, bajo[activo])
+        alto[activo] = np.where(igual, alto[activo], medio)
+    
+    # Clasificar a ambos lados, fuera de la banda de TOLERANCIA de los analizadores
+    t = 0.5 * (bajo + alto)
+    ancho = t1[intervalo] - t0[intervalo]  # El margen no se recorta al intervalo: la raíz puede estar en un extremo
+    pendiente = np.abs(g1[intervalo] - g0[intervalo])[np.arange(len(t)), np.minimum(funcion, 2)] / ancho
+    with np.errstate(divide='ignore'):
+        margen = np.where(funcion == 3, 0.5 * (alto - bajo), 4.0 * TOLERANCIA / pendiente + tolerancia)
+    antes = np.clip(t - margen, 0.0, 1.0)
+    despues = np.clip(t + margen, 0.0, 1.0)
+    _, codigo_antes = _evaluar(caminos, camino[intervalo], antes)
+    _, codigo_despues = _evaluar(caminos, camino[intervalo], despues)
+    coeficientes = caminos.evaluar(camino[intervalo], t)
+    g_t, _ = _evaluar(caminos, camino[intervalo], t)
+    evaluaciones += 3 * len(t)
+    
+    # Los cambios sin cambio de signo dentro de la banda de tolerancia de una
+    # frontera son bordes de esa banda (p. ej. un camino que empieza en τ = 0)
+    en_banda = (funcion == 3) & (np.abs(g_t) < 4.0 * TOLERANCIA).any(axis=1)
+    validas = (codigo_antes != codigo_despues) & ~en_banda
+    orden = np.lexsort((t[validas], camino[intervalo][validas]))
+    seleccion = np.flatnonzero(validas)[orden]
+    a1, b1, a2, b2 = coeficientes[seleccion].T
+    return {
+        'camino': camino[intervalo][seleccion],
+        't': t[seleccion],
+        'coeficientes': coeficientes[seleccion],
+        'traza': a1 + b2,
+        'determinante': a1 * b2 - b1 * a2,
+        'transicion': funcion[seleccion].astype(np.uint8),
+        'tipo_antes': (codigo_antes[seleccion] // len(ESTABILIDADES)).astype(np.uint8),
+        'estabilidad_antes': (codigo_antes[seleccion] % len(ESTABILIDADES)).astype(np.uint8),
+        'tipo_despues': (codigo_despues[seleccion] // len(ESTABILIDADES)).astype(np.uint8),
+        'estabilidad_despues': (codigo_despues[seleccion] % len(ESTABILIDADES)).astype(np.uint8),
+        'evaluaciones': evaluaciones,
+    }
+
+
+def describir_transiciones(resultado):
+    """
+    Describe cada transición en una línea de texto
+    
+    Args:
+        resultado: Diccionario de trazar_transiciones
+    
+    Returns:
+        list: Una cadena por transición
+    """
+    lineas = []
+    for i in range(len(resultado['t'])):
+        a1, b1, a2, b2 = resultado['coeficientes'][i]
+        antes = (f"{TIPOS_PUNTO_CRITICO[resultado['tipo_antes'][i]]} "
+                 f"({ESTABILIDADES[resultado['estabilidad_antes'][i]]})")
+        despues = (f"{TIPOS_PUNTO_CRITICO[resultado['tipo_despues'][i]]} "
+                   f"({ESTABILIDADES[resultado['estabilidad_despues'][i]]})")
+        lineas.append(f"camino {resultado['camino'][i]}  t={resultado['t'][i]:.12f}  "
+                      f"a1={a1:.10g} b1={b1:.10g} a2={a2:.10g} b2={b2:.10g}  "
+                      f"{TRANSICIONES[resultado['transicion'][i]]}: {antes} -> {despues}")
+    return lineas
+
+
+def dibujar_transiciones(fig, caminos, resultado, muestras=400, max_caminos=12):
+    """
+    Dibuja los caminos y sus transiciones
+    
+    A la izquierda, los caminos sobre el diagrama traza-determinante con las
+    transiciones marcadas; a la derecha, la clasificación a lo largo de t de
+    cada camino (con los colores del diagrama) y las transiciones como líneas.
+    
+    Args:
+        fig: Figura de matplotlib (vacía)
+        caminos: CaminosCoeficientes
+        resultado: Diccionario de trazar_transiciones
+        muestras: Puntos por camino para dibujarlo
+        max_caminos: Caminos como máximo en el panel de clasificación
+    """
+    from matplotlib.lines import Line2D
+    from mapa_estabilidad import MapaTrazaDeterminante, tabla_colores
+    
+    n = len(caminos)
+    t = np.linspace(0.0, 1.0, muestras)
+    lote = analizar_lote(caminos.evaluar(np.repeat(np.arange(n), muestras), np.tile(t, n)), etiquetas=False)
+    traza = lote['traza'].reshape(n, muestras)
+    determinante = lote['determinante'].reshape(n, muestras)
+    codigo = (lote['codigo_tipo'].astype(np.int16) * len(ESTABILIDADES)
+              + lote['codigo_estabilidad']).reshape(n, muestras)
+    
+    ax_mapa, ax_camino = fig.subplots(1, 2, gridspec_kw={'width_ratios': (1, 1.2)})
+    
+    semiancho = 1.1 * max(np.abs(traza).max(), np.abs(determinante).max(), 1.0)
+    MapaTrazaDeterminante().dibujar(ax_mapa, (-semiancho, semiancho, -semiancho, semiancho))
+    for i in range(n):
+        ax_mapa.plot(traza[i], determinante[i], color='black', linewidth=0.8, alpha=0.7, zorder=3)
+    for codigo_transicion, marcador in enumerate(MARCADORES_TRANSICION):
+        seleccion = resultado['transicion'] == codigo_transicion
+        if seleccion.any():
+            ax_mapa.plot(resultado['traza'][seleccion], resultado['determinante'][seleccion], marcador,
+                         color='white', markeredgecolor='black', markersize=7, zorder=6)
+    ax_mapa.set_title('Caminos sobre el diagrama traza-determinante', fontsize=12, fontweight='bold')
+    
+    mostrados = min(n, max_caminos)
+    ax_camino.imshow(tabla_colores()[codigo[:mostrados]], aspect='auto', interpolation='nearest',
+                     extent=(0.0, 1.0, mostrados - 0.5, -0.5))
+    for codigo_transicion, marcador in enumerate(MARCADORES_TRANSICION):
+        seleccion = (resultado['transicion'] == codigo_transicion) & (resultado['camino'] < mostrados)
+        ax_camino.vlines(resultado['t'][seleccion], resultado['camino'][seleccion] - 0.45,
+                         resultado['camino'][seleccion] + 0.45, color='black', linewidth=1.2)
+        ax_camino.plot(resultado['t'][seleccion], resultado['camino'][seleccion], marcador,
+                       color='white', markeredgecolor='black', markersize=6)
+    ax_camino.set_yticks(range(mostrados))
+    ax_camino.set_xlabel('Parámetro del camino (t)', fontsize=11, fontweight='bold')
+    ax_camino.set_ylabel('Camino', fontsize=11, fontweight='bold')
+    ax_camino.set_title('Clasificación a lo largo de cada camino', fontsize=12, fontweight='bold')
+    ax_camino.legend(handles=[Line2D([], [], linestyle='none', marker=marcador, color='white',
+                                     markeredgecolor='black', label=etiqueta)
+                              for marcador, etiqueta in zip(MARCADORES_TRANSICION, TRANSICIONES)],
+                     loc='upper right', fontsize=8, framealpha=0.9)
+
+
+def crear_parser():
+    """Crea el parser de argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Transiciones de estabilidad a lo largo de un camino")
+    parser.add_argument('--base', type=float, nargs=4, required=True, metavar=('A1', 'B1', 'A2', 'B2'),
+                        help="Coeficientes fijos del sistema")
+    parser.add_argument('--coeficiente', choices=COEFICIENTES, default='b1',
+                        help="Coeficiente que se varía (por defecto %(default)s)")
+    parser.add_argument('--desde', type=float, default=-5.0,
+                        help="Valor inicial del coeficiente (por defecto %(default)s)")
+    parser.add_argument('--hasta', type=float, default=5.0,
+                        help="Valor final del coeficiente (por defecto %(default)s)")
+    parser.add_argument('--muestras', type=int, default=MUESTRAS,
+                        help="Puntos de la rejilla gruesa (por defecto %(default)s)")
+    parser.add_argument('-o', '--figura',
+                        help="Guarda una figura con el camino y sus transiciones (PNG, SVG o PDF)")
+    return parser
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos
+    
+    Args:
+        argv: Lista de argumentos (por defecto sys.argv[1:])
+    
+    Returns:
+        int: Código de salida del proceso
+    """
+    args = crear_parser().parse_args(argv)
+    caminos = CaminosCoeficientes.variando(args.base, args.coeficiente, args.desde, args.hasta)
+    resultado = trazar_transiciones(caminos, muestras=args.muestras)
+    
+    for linea in describir_transiciones(resultado):
+        print(linea)
+    print(f"{len(resultado['t'])} transiciones, {resultado['evaluaciones']} evaluaciones", file=sys.stderr)
+    
+    if args.figura:
+        from matplotlib.figure import Figure
+        
+        fig = Figure(figsize=(14, 6), layout='constrained')
+        dibujar_transiciones(fig, caminos, resultado)
+        try:
+            fig.savefig(args.figura)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,145 @@
 """
 Módulo para la visualización gráfica de sistemas dinámicos
+
+matplotlib, el backend TkAgg, el mapa traza-determinante y scipy se importan
+la primera vez que se usan (o en segundo plano con precargar_modulos), para
+que la ventana aparezca sin esperar a cargarlos. tkinter solo se importa en
+los métodos que reciben widgets, así que el módulo sirve sin Tk (servicio
+HTTP, informes, benchmarks).
 """
 
+import importlib
+
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import tkinter as tk
+
+from analisis_estabilidad import AnalizadorEstabilidad, TOLERANCIA
+from cache_lru import CacheLRU, cuantizar
+from flujo_adaptativo import muestrear_campo_adaptativo, lineas_flujo_uniformes
+from instrumentacion import etapa
+
+
+METODOS_TRAYECTORIA = ('exacto', 'solver')
+ESTILOS_CAMPO = ('adaptativo', 'rejilla')
+ORIGEN = np.zeros((1, 2))
+COLORES_TRAYECTORIAS = ['red', 'blue', 'green', 'orange', 'purple', 'brown']
+
+# Parámetros de cada nivel de detalle: 'bajo' se usa como vista previa
+# mientras se arrastran los deslizadores. densidad, puntos y
+# semillas_reducidas son del estilo 'rejilla'; separacion_px (entre líneas
+# de flujo), celda_px (celda más gruesa de las flechas) y niveles (de
+# subdivisión) son del estilo 'adaptativo'
+NIVELES_DETALLE = {
+    'alto': {'densidad': 25, 'puntos': 200, 'semillas_reducidas': False,
+             'separacion_px': 28, 'celda_px': 70, 'niveles': 2},
+    'bajo': {'densidad': 13, 'puntos': 60, 'semillas_reducidas': True,
+             'separacion_px': 48, 'celda_px': 110, 'niveles': 1},
+}
+
+# Fracción aproximada de la figura que ocupan los ejes
+FRACCION_EJES = 0.8
+
+# Lado de los ejes (px) para el que están pensados densidad y puntos de la
+# rejilla: el de la figura por defecto de 8x6 pulgadas a 100 ppp. En otros
+# tamaños se escalan en proporción, dentro de estos márgenes
+LADO_REFERENCIA_PX = FRACCION_EJES * 600
+LIMITES_DENSIDAD = (7, 40)
+LIMITES_PUNTOS = (30, 400)
+
+# Líneas de flujo mínimas a lo ancho de la región en canvas pequeños
+LINEAS_MINIMAS = 6
+
+# Trayectorias recortadas a la vista (calcular_trayectorias_recortadas): la
+# salida se busca con pasos en los que el estado gira o escala como mucho
+# PASO_RELATIVO (según la norma de la matriz), evaluados por bloques, y se
+# refina subdividiendo el intervalo de salida. FRACCION_CONVERGENCIA es el
+# radio, relativo al límite, en el que se da por alcanzado el punto crítico
+PASO_RELATIVO = 0.1
+PASOS_BLOQUE = 64
+PASOS_MAXIMOS = 8192
+DIVISIONES_REFINAMIENTO = 16
+REFINAMIENTOS_SALIDA = 8  # 16**8: el intervalo final mide ~2e-10 pasos
+FRACCION_CONVERGENCIA = 1e-3
+SEMILLAS_POR_TROZO = 4096
+
+# Desajuste relativo máximo tras una vuelta para tratar una órbita como cerrada
+TOLERANCIA_CIERRE = 1e-3
+
+# Superposición de direcciones propias: estilo de línea de cada tipo
+ESTILOS_DIRECCION = {
+    'estable': {'color': 'navy', 'linestyle': '--'},
+    'inestable': {'color': 'darkred', 'linestyle': '--'},
+    'neutra': {'color': 'dimgray', 'linestyle': ':'},
+}
+
+# Semillas a lo largo de las direcciones propias: desplazamientos (fracción
+# del rango) respecto de la separatriz estable de una silla, y número de
+# semillas de un nodo repartidas en su base propia
+DESPLAZAMIENTOS_SILLA = (0.05, 0.2, 0.45)
+SEMILLAS_NODO = 8
+
+# Módulos pesados que la interfaz necesita tras el primer análisis
+MODULOS_PRECARGA = (
+    'matplotlib.figure',
+    'matplotlib.backends.backend_tkagg',
+    'mapa_estabilidad',
+)
+
+
+def precargar_modulos(solver=False):
+    """
+    Importa los módulos pesados de dibujo para que el primer análisis no espere
+    
+    Pensada para ejecutarse en un hilo en segundo plano tras mostrar la ventana.
+    
+    Args:
+        solver: Si es True, importa también scipy.integrate
+    """
+    for modulo in MODULOS_PRECARGA + (('scipy.integrate',) if solver else ()):
+        importlib.import_module(modulo)
 
 
 class VisualizadorSistema:
     """Clase para crear visualizaciones del sistema dinámico"""
     
-    def __init__(self, figura_tamano=(8, 6)):
+    def __init__(self, figura_tamano=(8, 6), metodo_trayectorias='exacto', capacidad_cache=32,
+                 estilo_campo='adaptativo', direcciones_propias=True):
         """
         Inicializa el visualizador
         
         Args:
             figura_tamano: Tupla con el tamaño de la figura (ancho, alto)
+            metodo_trayectorias: 'exacto' usa la exponencial de matriz e^{At}x0;
+                'solver' integra numéricamente con scipy (fallback a Euler)
+            capacidad_cache: Número de gráficas (campo y trayectorias) que se
+                conservan para reutilizarlas
+            estilo_campo: 'adaptativo' coloca las flechas con un árbol
+                cuaternario y dibuja líneas de flujo equiespaciadas con una
+                densidad según el tamaño en píxeles; 'rejilla' usa la rejilla
+                fija de flechas y las trayectorias desde una rejilla de semillas
+            direcciones_propias: Si es True, superpone las direcciones propias
+                (separatrices en las sillas) con sus escalas de tiempo 1/|λ| y,
+                con el estilo 'rejilla', siembra las trayectorias de sillas y
+                nodos a lo largo de ellas en lugar de en la rejilla
         """
+        if metodo_trayectorias not in METODOS_TRAYECTORIA:
+            raise ValueError(f"Método de trayectorias desconocido: {metodo_trayectorias}")
+        if estilo_campo not in ESTILOS_CAMPO:
+            raise ValueError(f"Estilo de campo desconocido: {estilo_campo}")
         self.figura_tamano = figura_tamano
+        self.metodo_trayectorias = metodo_trayectorias
+        self.estilo_campo = estilo_campo
+        self.direcciones_propias = direcciones_propias
+        self._mapa_estabilidad = None
+        self.grafica_persistente = None
+        self.cache = CacheLRU(capacidad_cache)
+    
+    @property
+    def mapa_estabilidad(self):
+        """Mapa traza-determinante con su caché de teselas, creado al primer uso"""
+        if self._mapa_estabilidad is None:
+            from mapa_estabilidad import MapaTrazaDeterminante
+            self._mapa_estabilidad = MapaTrazaDeterminante()
+        return self._mapa_estabilidad
         
     def calcular_campo_vectorial(self, x_range, y_range, a1, b1, a2, b2, densidad=20):
         """
@@ -43,89 +164,427 @@ class VisualizadorSistema:
         
         return X, Y, U, V
     
-    def calcular_trayectoria(self, x0, y0, a1, b1, a2, b2, t_max=3, puntos=200):
+    def calcular_exponencial(self, a1, b1, a2, b2, t):
+        """
+        Evalúa e^{At} = C(t)·I + S(t)·(A - sI) para todos los tiempos dados
+        
+        La descomposición espectral se calcula una sola vez por matriz: con
+        valores propios reales distintos se usan sus exponenciales, con valores
+        propios complejos s ± iw se usan cos/sin, y en el caso "Nodo Especial"
+        (valor propio repetido) la forma de Jordan da C = e^{st}, S = t·e^{st}.
+        
+        Args:
+            a1, b1, a2, b2: Coeficientes del sistema
+            t: Arreglo de tiempos (de cualquier forma)
+            
+        Returns:
+            tuple: (C, S, N) con C y S de la forma de t y N = A - sI (2x2)
+        """
+        t = np.asarray(t, dtype=float)
+        m1, m2 = AnalizadorEstabilidad(a1, b1, a2, b2).calcular_valores_propios()
+        s = 0.5 * np.real(m1 + m2)
+        
+        with np.errstate(over='ignore', invalid='ignore'):
+            if np.imag(m1) != 0:
+                # Valores propios complejos s ± iw
+                w = abs(np.imag(m1))
+                crecimiento = np.exp(s * t)
+                C = crecimiento * np.cos(w * t)
+                S = crecimiento * np.sin(w * t) / w
+            elif abs(m1 - m2) <= TOLERANCIA:
+                # Valor propio repetido: forma de Jordan
+                C = np.exp(s * t)
+                S = t * C
+            else:
+                # Valores propios reales distintos l1 > l2; expm1 evita cancelación
+                l1, l2 = max(m1.real, m2.real), min(m1.real, m2.real)
+                base = np.exp(l2 * t)
+                diferencia = np.expm1((l1 - l2) * t)
+                C = base * (1.0 + 0.5 * diferencia)
+                S = base * diferencia / (l1 - l2)
+        
+        N = np.array([[a1 - s, b1], [a2, b2 - s]], dtype=float)
+        return C, S, N
+    
+    def matriz_paso(self, a1, b1, a2, b2, limites, velocidad=1.0):
+        """
+        Calcula e^{AΔt} para animar partículas a una velocidad en pantalla razonable
+        
+        Δt se elige para que una partícula con la velocidad típica de la
+        región (percentil 90 de |Ax|) recorra un 0.5 % de su ancho por cuadro.
+        
+        Args:
+            a1, b1, a2, b2: Coeficientes del sistema
+            limites: Tupla (x_min, x_max, y_min, y_max)
+            velocidad: Multiplicador de Δt
+            
+        Returns:
+            np.ndarray: Matriz 2x2 que avanza un cuadro
+        """
+        x_min, x_max, y_min, y_max = limites
+        X, Y = np.meshgrid(np.linspace(x_min, x_max, 9), np.linspace(y_min, y_max, 9))
+        rapidez = np.percentile(np.hypot(a1 * X + b1 * Y, a2 * X + b2 * Y), 90)
+        if rapidez <= 0:
+            return np.eye(2)
+        dt = velocidad * 0.005 * max(x_max - x_min, y_max - y_min) / rapidez
+        C, S, N = self.calcular_exponencial(a1, b1, a2, b2, np.array([dt]))
+        return C[0] * np.eye(2) + S[0] * N
+    
+    def crear_animacion(self, a1, b1, a2, b2, velocidad=1.0, **opciones):
         """
-        Calcula una trayectoria específica del sistema usando integración numérica
+        Crea una animación de partículas sobre la gráfica persistente
+        
+        Args:
+            a1, b1, a2, b2: Coeficientes del sistema mostrado
+            velocidad: Multiplicador de Δt (ver matriz_paso)
+            **opciones: Opciones de AnimacionFlujo (particulas, cuadros, vida...)
+            
+        Returns:
+            AnimacionFlujo: Animación sin iniciar (ver AnimacionFlujo.iniciar)
+            
+        Raises:
+            RuntimeError: Si aún no se ha mostrado ninguna gráfica
+        """
+        from animacion_flujo import AnimacionFlujo
+        
+        grafica = self.grafica_persistente
+        if grafica is None or grafica.canvas is None or grafica.limites is None:
+            raise RuntimeError("No hay ninguna gráfica mostrada que animar")
+        paso = self.matriz_paso(a1, b1, a2, b2, grafica.limites, velocidad)
+        return AnimacionFlujo(grafica, paso, **opciones)
+    
+    def calcular_trayectorias(self, semillas, a1, b1, a2, b2, t_max=3, puntos=200, metodo=None):
+        """
+        Calcula las trayectorias de varias condiciones iniciales a la vez
+        
+        Args:
+            semillas: Arreglo (M, 2) de condiciones iniciales
+            a1, b1, a2, b2: Coeficientes del sistema
+            t_max: Tiempo máximo de integración
+            puntos: Número de puntos en cada trayectoria
+            metodo: 'exacto' o 'solver'; por defecto el del visualizador
+            
+        Returns:
+            tuple: (trayectorias, validas) con trayectorias de forma
+            (M, puntos, 2) y validas un arreglo booleano (M, puntos) que
+            marca los puntos finitos (en sistemas que crecen muy deprisa el
+            final de una trayectoria puede desbordarse sin invalidar el
+            principio)
+        """
+        metodo = metodo or self.metodo_trayectorias
+        if metodo not in METODOS_TRAYECTORIA:
+            raise ValueError(f"Método de trayectorias desconocido: {metodo}")
+        
+        semillas = np.asarray(semillas, dtype=float).reshape(-1, 2)
+        
+        with etapa(f"trayectorias/{metodo}"):
+            if metodo == 'exacto':
+                t = np.linspace(0, t_max, puntos)
+                C, S, N = self.calcular_exponencial(a1, b1, a2, b2, t)
+                # x(t) = C(t)·x0 + S(t)·N·x0 evaluado para todas las semillas y tiempos
+                with np.errstate(over='ignore', invalid='ignore'):
+                    trayectorias = (C[None, :, None] * semillas[:, None, :]
+                                    + S[None, :, None] * (semillas @ N.T)[:, None, :])
+            else:
+                trayectorias = self.integrar_trayectorias(semillas, a1, b1, a2, b2, t_max, puntos)
+        
+        validas = np.all(np.isfinite(trayectorias), axis=2)
+        return trayectorias, validas
+    
+    def calcular_trayectoria(self, x0, y0, a1, b1, a2, b2, t_max=3, puntos=200, metodo=None):
+        """
+        Calcula una trayectoria específica del sistema
         
         Args:
             x0, y0: Condiciones iniciales
             a1, b1, a2, b2: Coeficientes del sistema
             t_max: Tiempo máximo de integración
             puntos: Número de puntos en la trayectoria
+            metodo: 'exacto' o 'solver'; por defecto el del visualizador
             
         Returns:
             tuple: (x_trayectoria, y_trayectoria)
         """
+        trayectorias, _ = self.calcular_trayectorias([[x0, y0]], a1, b1, a2, b2,
+                                                     t_max=t_max, puntos=puntos, metodo=metodo)
+        return trayectorias[0, :, 0], trayectorias[0, :, 1]
+    
+    def periodo_orbita(self, a1, b1, a2, b2, tolerancia=TOLERANCIA_CIERRE):
+        """
+        Detecta órbitas periódicas: con valores propios s ± iw, tras un periodo
+        2π/w cada trayectoria vuelve a su punto escalada por e^{2πs/w}
+        
+        Args:
+            a1, b1, a2, b2: Coeficientes del sistema
+            tolerancia: Desajuste relativo |e^{2πs/w} - 1| admitido tras una vuelta
+            
+        Returns:
+            float: Periodo 2π/w si las órbitas se cierran dentro de la
+            tolerancia (centros y focos muy lentos), o None
+        """
+        m1, _ = AnalizadorEstabilidad(a1, b1, a2, b2).calcular_valores_propios()
+        w = abs(np.imag(m1))
+        if w == 0:
+            return None
+        periodo = 2 * np.pi / w
+        return periodo if abs(np.expm1(np.real(m1) * periodo)) <= tolerancia else None
+    
+    def calcular_trayectorias_recortadas(self, semillas, a1, b1, a2, b2, limite, t_max=3, puntos=200,
+                                         ciclo_completo=True, salida=None):
+        """
+        Calcula trayectorias que terminan al salir de la vista
+        
+        Cada trayectoria termina en el primer instante en que sale del cuadrado
+        |x|, |y| < limite o llega al punto crítico (radio FRACCION_CONVERGENCIA
+        * limite), localizado sobre la solución exacta e^{At}x0 como un evento,
+        y sus puntos se reparten entre 0 y ese instante. Así ninguna muestra cae
+        fuera de la vista y los horizontes largos no desbordan. Si las órbitas
+        son cerradas (ver periodo_orbita) y ciclo_completo es True, el
+        horizonte es exactamente un periodo, aunque sea mayor que t_max.
+        
+        Args:
+            semillas: Arreglo (M, 2) de condiciones iniciales
+            a1, b1, a2, b2: Coeficientes del sistema
+            limite: Semiancho de la vista centrada en el origen
+            t_max: Horizonte máximo; None integra hasta que todas las
+                trayectorias salen o convergen (como mucho PASOS_MAXIMOS pasos)
+            puntos: Número de puntos en cada trayectoria
+            ciclo_completo: Si es True, las órbitas cerradas se dibujan una vez
+            salida: Arreglo float32 (M, puntos, 2) ya reservado donde escribir
+                las trayectorias; por defecto se crea uno nuevo
+            
+        Returns:
+            tuple: (trayectorias, duraciones) con trayectorias float32 de forma
+            (M, puntos, 2) y duraciones (M,) el instante final de cada una
+        """
+        semillas = np.asarray(semillas, dtype=float).reshape(-1, 2)
+        if salida is None:
+            salida = np.empty((len(semillas), puntos, 2), dtype=np.float32)
+        elif salida.shape != (len(semillas), puntos, 2):
+            raise ValueError(f"El arreglo de salida debe tener forma {(len(semillas), puntos, 2)}")
+        
+        periodo = self.periodo_orbita(a1, b1, a2, b2) if ciclo_completo else None
+        horizonte = periodo if periodo is not None else t_max
+        
+        with etapa('trayectorias/recortadas'):
+            duraciones = self._tiempos_salida(semillas, a1, b1, a2, b2, limite, horizonte)
+            fracciones = np.linspace(0.0, 1.0, puntos)
+            # Por trozos de semillas, para acotar los temporales float64
+            for inicio in range(0, len(semillas), SEMILLAS_POR_TROZO):
+                trozo = slice(inicio, inicio + SEMILLAS_POR_TROZO)
+                salida[trozo] = self._posiciones(semillas[trozo], a1, b1, a2, b2,
+                                                 duraciones[trozo, None] * fracciones)
+        return salida, duraciones
+    
+    def _posiciones(self, semillas, a1, b1, a2, b2, t):
+        """
+        Evalúa e^{At}x0 con t de forma (M, P) o (1, P)
+        
+        Returns:
+            np.ndarray: Arreglo (M, P, 2) con las posiciones de cada semilla
+        """
+        C, S, N = self.calcular_exponencial(a1, b1, a2, b2, t)
+        derivada = semillas @ N.T
+        with np.errstate(over='ignore', invalid='ignore'):
+            return C[..., None] * semillas[:, None, :] + S[..., None] * derivada[:, None, :]
+    
+    def _tiempos_salida(self, semillas, a1, b1, a2, b2, limite, horizonte):
+        """
+        Primer instante en que cada trayectoria sale de la vista o llega al
+        punto crítico, como mucho horizonte (ver calcular_trayectorias_recortadas)
+        """
+        radio = FRACCION_CONVERGENCIA * limite
+        
+        def terminadas(posiciones):
+            # Los valores no finitos (desbordamiento) cuentan como fuera
+            x, y = posiciones[..., 0], posiciones[..., 1]
+            with np.errstate(over='ignore', invalid='ignore'):
+                dentro = np.maximum(np.abs(x), np.abs(y)) < limite
+                return ~dentro | (x * x + y * y < radio * radio)
+        
+        # Paso de búsqueda: |A|·h acota el giro y el cambio de escala por paso
+        escala = np.linalg.norm([[a1, b1], [a2, b2]])
+        if escala == 0:
+            return np.full(len(semillas), 0.0 if horizonte is None else float(horizonte))
+        paso = PASO_RELATIVO / escala
+        if horizonte is None:
+            horizonte = PASOS_MAXIMOS * paso
+        else:
+            paso = min(max(paso, horizonte / PASOS_MAXIMOS), horizonte / PASOS_BLOQUE)
+        
+        duraciones = np.full(len(semillas), float(horizonte))
+        activas = np.arange(len(semillas))
+        indices, izquierdas, derechas = [], [], []
+        t_inicio = 0.0
+        while activas.size and t_inicio < horizonte:
+            t = np.minimum(t_inicio + paso * np.arange(1, PASOS_BLOQUE + 1), horizonte)
+            fin = terminadas(self._posiciones(semillas[activas], a1, b1, a2, b2, t[None, :]))
+            salen = fin.any(axis=1)
+            primero = fin[salen].argmax(axis=1)
+            indices.append(activas[salen])
+            izquierdas.append(np.where(primero > 0, t[primero - 1], t_inicio))
+            derechas.append(t[primero])
+            activas = activas[~salen]
+            t_inicio = t[-1]
+        indices = np.concatenate(indices) if indices else activas[:0]
+        if not indices.size:
+            return duraciones
+        
+        # Refinar todos los intervalos a la vez, dividiendo cada uno en
+        # DIVISIONES_REFINAMIENTO partes por ronda
+        izquierda, derecha = np.concatenate(izquierdas), np.concatenate(derechas)
+        filas = np.arange(len(indices))
+        fracciones = np.arange(1, DIVISIONES_REFINAMIENTO + 1) / DIVISIONES_REFINAMIENTO
+        for _ in range(REFINAMIENTOS_SALIDA):
+            t = izquierda[:, None] + (derecha - izquierda)[:, None] * fracciones
+            fin = terminadas(self._posiciones(semillas[indices], a1, b1, a2, b2, t))
+            # Si el redondeo deja el extremo derecho sin terminar, se conserva
+            primero = np.where(fin.any(axis=1), fin.argmax(axis=1), DIVISIONES_REFINAMIENTO - 1)
+            izquierda = np.where(primero > 0, t[filas, primero - 1], izquierda)
+            derecha = np.where(fin[filas, primero], t[filas, primero], derecha)
+        duraciones[indices] = izquierda
+        return duraciones
+    
+    def integrar_trayectorias(self, semillas, a1, b1, a2, b2, t_max=3, puntos=200):
+        """
+        Integra numéricamente todas las semillas juntas como una matriz de estado
+        
+        Usa un único solve_ivp (Runge-Kutta) sobre el estado apilado de las M
+        semillas; si falla, recurre al método de Euler, también vectorizado.
+        
+        Args:
+            semillas: Arreglo (M, 2) de condiciones iniciales
+            a1, b1, a2, b2: Coeficientes del sistema
+            t_max: Tiempo máximo de integración
+            puntos: Número de puntos en cada trayectoria
+            
+        Returns:
+            np.ndarray: Arreglo (M, puntos, 2) con las trayectorias
+        """
         from scipy.integrate import solve_ivp
         
-        def sistema_dinamico(t, y):
-            return [a1 * y[0] + b1 * y[1], a2 * y[0] + b2 * y[1]]
+        semillas = np.asarray(semillas, dtype=float).reshape(-1, 2)
+        matriz_t = np.array([[a1, b1], [a2, b2]], dtype=float).T
+        
+        def sistema_dinamico(t, estado):
+            # estado contiene las M semillas aplanadas como (x0, y0, x1, y1, ...)
+            return (estado.reshape(-1, 2) @ matriz_t).ravel()
         
-        # Integrar hacia adelante y hacia atrás
         t_span = (0, t_max)
         t_eval = np.linspace(0, t_max, puntos)
         
         try:
-            sol = solve_ivp(sistema_dinamico, t_span, [x0, y0], t_eval=t_eval, 
-                          rtol=1e-8, atol=1e-10)
+            with np.errstate(over='ignore', invalid='ignore'):
+                sol = solve_ivp(sistema_dinamico, t_span, semillas.ravel(), t_eval=t_eval,
+                              rtol=1e-8, atol=1e-10)
             if sol.success:
-                return sol.y[0], sol.y[1]
-        except:
+                # sol.y tiene forma (2M, puntos)
+                return sol.y.reshape(-1, 2, puntos).transpose(0, 2, 1)
+        except (ValueError, ArithmeticError):
             pass
         
-        # Fallback: usar método de Euler mejorado
+        # Fallback: método de Euler avanzando todas las semillas a la vez
+        # (la etapa 'trayectorias/euler' cuenta cuántas veces ocurre y su coste)
         dt = t_max / puntos
-        x_traj = [x0]
-        y_traj = [y0]
+        trayectorias = np.empty((len(semillas), puntos, 2))
+        trayectorias[:, 0] = semillas
+        with etapa('trayectorias/euler'), np.errstate(over='ignore', invalid='ignore'):
+            for i in range(puntos - 1):
+                estado = trayectorias[:, i]
+                trayectorias[:, i + 1] = estado + dt * (estado @ matriz_t)
         
-        for i in range(puntos - 1):
-            x_curr, y_curr = x_traj[-1], y_traj[-1]
-            dx = a1 * x_curr + b1 * y_curr
-            dy = a2 * x_curr + b2 * y_curr
+        return trayectorias
+    
+    def medir_tamano_px(self, parent_frame):
+        """
+        Mide el frame padre en píxeles (en el hilo de Tk)
+        
+        Args:
+            parent_frame: Frame de Tkinter
             
-            x_next = x_curr + dt * dx
-            y_next = y_curr + dt * dy
+        Returns:
+            tuple: (ancho, alto), o None si aún no tiene tamaño o no existe
+        """
+        import tkinter as tk
+        
+        try:
+            parent_frame.update_idletasks()
+            ancho = parent_frame.winfo_width()
+            alto = parent_frame.winfo_height()
+        except tk.TclError:
+            return None
+        return (ancho, alto) if ancho > 1 and alto > 1 else None
+    
+    def crear_figura(self, parent_frame=None):
+        """
+        Crea una figura con tamaño adaptado al frame padre si se proporciona
+        
+        Args:
+            parent_frame: Frame padre para calcular tamaño dinámico
             
-            x_traj.append(x_next)
-            y_traj.append(y_next)
+        Returns:
+            matplotlib.figure.Figure: Figura vacía
+        """
+        from matplotlib.figure import Figure
         
-        return np.array(x_traj), np.array(y_traj)
+        # Calcular tamaño dinámico si se proporciona el frame padre
+        tamano_px = self.medir_tamano_px(parent_frame) if parent_frame else None
+        if tamano_px:
+            # Convertir píxeles a pulgadas (DPI típico: 100)
+            dpi = 100
+            fig_width = max(tamano_px[0] / dpi, 6)  # Mínimo 6 pulgadas
+            fig_height = max(tamano_px[1] / dpi, 4)  # Mínimo 4 pulgadas
+            
+            fig = Figure(figsize=(fig_width, fig_height), dpi=dpi)
+        else:
+            fig = Figure(figsize=self.figura_tamano)
+            
+        return fig
     
-    def crear_grafica_completa(self, a1, b1, a2, b2, titulo="Trayectorias del Sistema", parent_frame=None):
+    def crear_grafica_completa(self, a1, b1, a2, b2, titulo="Trayectorias del Sistema", parent_frame=None,
+                               detalle='alto'):
         """
         Crea una gráfica completa con campo vectorial y trayectorias
         
         Args:
             a1, b1, a2, b2: Coeficientes del sistema
             titulo: Título de la gráfica
-            parent_frame: Frame padre para calcular tamaño dinámico
+            parent_frame: Frame padre para calcular tamaño dinámico; el nivel
+                de detalle se escala con sus píxeles
+            detalle: Clave de NIVELES_DETALLE ('alto' o 'bajo')
             
         Returns:
             matplotlib.figure.Figure: Figura con la gráfica
         """
-        # Calcular tamaño dinámico si se proporciona el frame padre
-        if parent_frame:
-            try:
-                # Obtener dimensiones del frame padre
-                parent_frame.update_idletasks()
-                width = parent_frame.winfo_width()
-                height = parent_frame.winfo_height()
-                
-                # Convertir píxeles a pulgadas (DPI típico: 100)
-                dpi = 100
-                fig_width = max(width / dpi, 6)  # Mínimo 6 pulgadas
-                fig_height = max(height / dpi, 4)  # Mínimo 4 pulgadas
-                
-                fig = plt.Figure(figsize=(fig_width, fig_height), dpi=dpi)
-            except:
-                fig = plt.Figure(figsize=self.figura_tamano)
-        else:
-            fig = plt.Figure(figsize=self.figura_tamano)
+        fig = self.crear_figura(parent_frame)
+        tamano_px = self.medir_tamano_px(parent_frame) if parent_frame else None
+        datos = self.calcular_datos_grafica(a1, b1, a2, b2, detalle=detalle, tamano_px=tamano_px)
+        self.dibujar_grafica(fig, datos, titulo)
+        return fig
+    
+    def calcular_datos_grafica(self, a1, b1, a2, b2, detalle='alto', cancelado=None, tamano_px=None):
+        """
+        Calcula el campo vectorial y las trayectorias a dibujar
+        
+        Solo usa NumPy (y scipy con el método 'solver'), por lo que puede
+        ejecutarse fuera del hilo de la interfaz.
+        
+        Args:
+            a1, b1, a2, b2: Coeficientes del sistema
+            detalle: Clave de NIVELES_DETALLE ('alto' o 'bajo')
+            cancelado: Función opcional sin argumentos; si devuelve True entre
+                etapas, el cálculo se abandona
+            tamano_px: Tupla (ancho, alto) del canvas en píxeles, que escala
+                el nivel de detalle; por defecto el de figura_tamano a 100 ppp
             
-        ax = fig.add_subplot(111)
+        Returns:
+            dict: Datos para dibujar_grafica, o None si se canceló
+        """
+        nivel = NIVELES_DETALLE[detalle]
         
         # Determinar el rango dinámico basado en los valores propios
-        valores_propios = np.linalg.eigvals([[a1, b1], [a2, b2]])
+        # (la descomposición se comparte con el análisis a través de su caché)
+        valores_propios = AnalizadorEstabilidad(a1, b1, a2, b2).calcular_valores_propios()
         max_real = max(np.abs(np.real(valores_propios)))
         
         # Verificar si es una silla (valores propios reales con signos opuestos)
@@ -145,19 +604,107 @@ class VisualizadorSistema:
         else:
             rango = 3.0
         
+        if self.estilo_campo == 'adaptativo':
+            limites = (-rango, rango, -rango, rango)
+            parametros = self._parametros_adaptativos(limites, nivel, tamano_px)
+            clave = ((cuantizar((a1, b1, a2, b2)), rango, 'adaptativo', self.direcciones_propias)
+                     + parametros)
+            datos = self.cache.obtener(clave)
+            if datos is not None:
+                return datos
+            
+            datos = self.calcular_flujo_adaptativo(
+                lambda x, y: (a1 * x + b1 * y, a2 * x + b2 * y), limites, *parametros,
+                cancelado=cancelado)
+            if datos is None:
+                return None
+            datos.update({'detalle': detalle, 'rango': rango, 'es_silla': es_silla,
+                          'coeficientes': (a1, b1, a2, b2)},
+                         **self._datos_direcciones(a1, b1, a2, b2, es_silla))
+            self.cache.guardar(clave, datos)
+            return datos
+        
+        # Para sillas, usar tiempo de integración más largo para mostrar mejor la divergencia
+        t_max = 4.0 if es_silla else 3.0
+        nivel = self._nivel_rejilla(nivel, tamano_px)
+        
+        # Reutilizar la gráfica si ya se calculó con los mismos parámetros (las
+        # cachés pueden guardarse y cargarse con otra configuración)
+        clave = (cuantizar((a1, b1, a2, b2)), rango, self.estilo_campo, self.direcciones_propias,
+                 nivel['densidad'], t_max, nivel['puntos'], nivel['semillas_reducidas'],
+                 self.metodo_trayectorias)
+        datos = self.cache.obtener(clave)
+        if datos is not None:
+            return datos
+        
         # Crear campo vectorial con mayor densidad
-        X, Y, U, V = self.calcular_campo_vectorial((-rango, rango), (-rango, rango), 
-                                                  a1, b1, a2, b2, densidad=25)
+        with etapa('campo'):
+            X, Y, U, V = self.calcular_campo_vectorial((-rango, rango), (-rango, rango), 
+                                                      a1, b1, a2, b2, densidad=nivel['densidad'])
+            
+            # Calcular magnitud para colorear las flechas
+            magnitud = np.sqrt(U**2 + V**2)
         
-        # Calcular magnitud para colorear las flechas
-        magnitud = np.sqrt(U**2 + V**2)
+        if cancelado and cancelado():
+            return None
         
-        # Graficar campo vectorial con mejor visualización
-        ax.quiver(X, Y, U, V, magnitud, cmap='plasma', alpha=0.8, scale=30, 
-                 scale_units='xy', width=0.003)
+        # Semillas a lo largo de las direcciones propias (sillas y nodos) o,
+        # si no las hay, en una rejilla
+        direcciones = self._datos_direcciones(a1, b1, a2, b2, es_silla)
+        semillas = None
+        if self.direcciones_propias:
+            semillas = self.semillas_direcciones(direcciones['direcciones'], rango)
+        if semillas is not None:
+            indices_color = np.arange(len(semillas)) % len(COLORES_TRAYECTORIAS)
+        else:
+            semillas, indices_color = self._semillas_rejilla(rango, nivel, es_silla, max_real)
+        
+        # Calcular todas las trayectorias de la rejilla en una sola llamada
+        puntos_minimos = 10 * nivel['puntos'] // 200
+        if self.metodo_trayectorias == 'exacto':
+            # Cada trayectoria termina al salir de la vista, con todos sus puntos
+            # dentro; las órbitas cerradas se dibujan una sola vuelta
+            trayectorias, duraciones = self.calcular_trayectorias_recortadas(
+                semillas, a1, b1, a2, b2, rango*1.2, t_max=t_max, puntos=nivel['puntos'])
+            significativas = np.flatnonzero(duraciones > t_max * puntos_minimos / nivel['puntos'])
+            lineas = [trayectorias[k] for k in significativas]
+        else:
+            trayectorias, validas = self.calcular_trayectorias(semillas, a1, b1, a2, b2, t_max=t_max,
+                                                               puntos=nivel['puntos'])
+            # Filtrar puntos que se salen del rango (o se desbordan) y quedarse
+            # con las trayectorias significativas
+            mascaras = validas & np.all(np.abs(trayectorias) < rango*1.2, axis=2)
+            significativas = np.flatnonzero(mascaras.sum(axis=1) > puntos_minimos)
+            lineas = [trayectorias[k][mascaras[k]] for k in significativas]
         
+        if cancelado and cancelado():
+            return None
+        
+        datos = {
+            'detalle': detalle,
+            'rango': rango,
+            'es_silla': es_silla,
+            'coeficientes': (a1, b1, a2, b2),
+            'campo': (X, Y, U, V, magnitud),
+            'lineas': lineas,
+            'semillas': semillas[significativas],
+            'colores': [COLORES_TRAYECTORIAS[i] for i in indices_color[significativas]],
+            **direcciones,
+        }
+        self.cache.guardar(clave, datos)
+        return datos
+    
+    def _semillas_rejilla(self, rango, nivel, es_silla, max_real):
+        """
+        Semillas de una rejilla según el tipo de sistema, evitando el punto crítico
+        
+        Returns:
+            tuple: (semillas (K, 2), índices de color sobre COLORES_TRAYECTORIAS)
+        """
         # Seleccionar puntos iniciales estratégicos según el tipo de sistema
-        if es_silla:
+        if nivel['semillas_reducidas']:  # Vista previa
+            puntos_iniciales = [-rango*0.8, -rango*0.4, rango*0.4, rango*0.8]
+        elif es_silla:
             # Para sillas, usar más puntos iniciales distribuidos en el rango amplio
             puntos_iniciales = [-rango*0.9, -rango*0.6, -rango*0.3, rango*0.3, rango*0.6, rango*0.9]
         elif max_real > 1:  # Sistema rápido
@@ -165,58 +712,443 @@ class VisualizadorSistema:
         else:  # Sistema lento
             puntos_iniciales = [-rango*0.9, -rango*0.6, -rango*0.3, rango*0.3, rango*0.6, rango*0.9]
         
-        colores = ['red', 'blue', 'green', 'orange', 'purple', 'brown']
-        
-        # Graficar trayectorias con diferentes colores y grosores
-        for i, x0 in enumerate(puntos_iniciales):
-            for j, y0 in enumerate(puntos_iniciales):
-                if abs(x0) > 0.1 or abs(y0) > 0.1:  # Evitar el punto crítico
-                    try:
-                        # Para sillas, usar tiempo de integración más largo para mostrar mejor la divergencia
-                        t_max = 4.0 if es_silla else 3.0
-                        x_traj, y_traj = self.calcular_trayectoria(x0, y0, a1, b1, a2, b2, t_max=t_max)
-                        
-                        # Filtrar trayectorias que se salen del rango
-                        mask = (np.abs(x_traj) < rango*1.2) & (np.abs(y_traj) < rango*1.2)
-                        x_traj = x_traj[mask]
-                        y_traj = y_traj[mask]
-                        
-                        if len(x_traj) > 10:  # Solo mostrar trayectorias significativas
-                            color_idx = (i + j) % len(colores)
-                            # Para sillas, usar líneas más gruesas para mejor visibilidad
-                            linewidth = 1.5 if es_silla else 1.2
-                            ax.plot(x_traj, y_traj, color=colores[color_idx], 
-                                   linewidth=linewidth, alpha=0.8)
-                            
-                            # Marcar punto inicial
-                            ax.plot(x0, y0, 'o', color=colores[color_idx], 
-                                   markersize=4, alpha=0.7)
-                    except:
-                        continue
+        # Semillas de la rejilla, evitando el punto crítico
+        rejilla = np.array(puntos_iniciales)
+        I, J = np.meshgrid(np.arange(len(rejilla)), np.arange(len(rejilla)), indexing='ij')
+        semillas = np.stack([rejilla[I], rejilla[J]], axis=-1).reshape(-1, 2)
+        fuera_origen = np.any(np.abs(semillas) > 0.1, axis=1)
+        indices_color = ((I + J).ravel()[fuera_origen]) % len(COLORES_TRAYECTORIAS)
+        return semillas[fuera_origen], indices_color
+    
+    def calcular_direcciones_propias(self, a1, b1, a2, b2):
+        """
+        Direcciones propias reales del sistema
         
-        # Marcar el punto crítico con mejor visibilidad
-        ax.plot([0], [0], 'ko', markersize=15, 
-                markeredgecolor='white', markeredgewidth=3, zorder=10)
+        Reutiliza la descomposición de AnalizadorEstabilidad (compartida a
+        través de su caché) en lugar de recalcularla.
         
-        # Configurar gráfica con mejor estilo
-        ax.set_xlabel('x', fontsize=12, fontweight='bold')
-        ax.set_ylabel('y', fontsize=12, fontweight='bold')
-        ax.set_title(titulo, fontsize=14, fontweight='bold', pad=20)
-        ax.grid(True, alpha=0.4, linestyle='--')
-        ax.set_aspect('equal')
+        Args:
+            a1, b1, a2, b2: Coeficientes del sistema
+            
+        Returns:
+            list: Diccionarios con 'direccion' (vector unitario),
+            'valor_propio', 'escala_tiempo' (1/|λ|, inf si λ = 0) y 'tipo'
+            ('estable', 'inestable' o 'neutra'); vacía si los valores propios
+            son complejos o si A es múltiplo de la identidad (toda dirección
+            es propia)
+        """
+        analizador = AnalizadorEstabilidad(a1, b1, a2, b2)
+        vectores = analizador.calcular_vectores_propios()
+        if vectores is None:
+            return []
+        valores_propios = analizador.calcular_valores_propios()
+        repetido = abs(valores_propios[0] - valores_propios[1]) <= TOLERANCIA
+        if repetido and abs(b1) <= TOLERANCIA and abs(a2) <= TOLERANCIA:
+            return []
         
-        # Agregar leyenda del punto crítico en la esquina superior derecha
-        ax.text(0.98, 0.98, 'Punto crítico (0,0)', transform=ax.transAxes, 
-                fontsize=10, fontweight='bold', ha='right', va='top',
-                bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8, edgecolor='black'))
+        direcciones = []
+        # Con un valor propio doble (bloque de Jordan) hay una sola dirección
+        for indice in range(1 if repetido else 2):
+            valor = float(valores_propios[indice])
+            if valor < -TOLERANCIA:
+                tipo = 'estable'
+            elif valor > TOLERANCIA:
+                tipo = 'inestable'
+            else:
+                tipo = 'neutra'
+            direcciones.append({
+                'direccion': vectores[:, indice],
+                'valor_propio': valor,
+                'escala_tiempo': 1.0 / abs(valor) if tipo != 'neutra' else np.inf,
+                'tipo': tipo,
+            })
+        return direcciones
+    
+    def _datos_direcciones(self, a1, b1, a2, b2, es_silla):
+        """
+        Direcciones propias y texto con las escalas de tiempo para dibujar_grafica
         
-        # Establecer límites de los ejes
-        ax.set_xlim(-rango, rango)
-        ax.set_ylim(-rango, rango)
+        Returns:
+            dict: 'direcciones' (ver calcular_direcciones_propias) y 'anotacion'
+            (vacíos si direcciones_propias es False)
+        """
+        if not self.direcciones_propias:
+            return {'direcciones': [], 'anotacion': ''}
         
-        # Agregar líneas de referencia
-        ax.axhline(y=0, color='black', linestyle='-', alpha=0.3, linewidth=0.5)
-        ax.axvline(x=0, color='black', linestyle='-', alpha=0.3, linewidth=0.5)
+        direcciones = self.calcular_direcciones_propias(a1, b1, a2, b2)
+        # Las direcciones de una silla (valores propios de signo opuesto) son sus separatrices
+        separatrices = es_silla and {d['tipo'] for d in direcciones} == {'estable', 'inestable'}
+        nombre = 'Separatriz' if separatrices else 'Dirección'
+        lineas = [f"{nombre} {d['tipo']}: λ = {d['valor_propio']:.3g}"
+                  + (f", 1/|λ| = {d['escala_tiempo']:.3g}" if d['tipo'] != 'neutra' else '')
+                  for d in direcciones]
+        if not direcciones:
+            m1, _ = AnalizadorEstabilidad(a1, b1, a2, b2).calcular_valores_propios()
+            parte_real, w = np.real(m1), abs(np.imag(m1))
+            if w == 0:
+                # A múltiplo de la identidad: todas las direcciones son propias
+                lineas.append(f"λ = {parte_real:.3g}"
+                              + (f", 1/|λ| = {1.0 / abs(parte_real):.3g}" if abs(parte_real) > TOLERANCIA else ''))
+            else:
+                if abs(parte_real) > TOLERANCIA:
+                    lineas.append(f"1/|Re λ| = {1.0 / abs(parte_real):.3g}")
+                lineas.append(f"Periodo 2π/ω = {2 * np.pi / w:.3g}")
+        return {'direcciones': direcciones, 'anotacion': '\n'.join(lineas)}
+    
+    def semillas_direcciones(self, direcciones, rango):
+        """
+        Pocas semillas colocadas a lo largo de las direcciones propias
+        
+        En una silla se colocan junto a los dos extremos de la separatriz
+        estable, desplazadas a uno y otro lado según la inestable
+        (DESPLAZAMIENTOS_SILLA), de modo que cada trayectoria recorre uno de
+        los cuatro sectores entre separatrices. En un nodo se reparten
+        SEMILLAS_NODO puntos en su base propia, en el borde de la vista si es
+        estable y cerca del origen si es inestable.
+        
+        Args:
+            direcciones: Lista devuelta por calcular_direcciones_propias
+            rango: Semiancho de la vista
+            
+        Returns:
+            np.ndarray: Arreglo (K, 2) de semillas, o None si el sistema no es
+            una silla ni un nodo con dos direcciones bien separadas
+        """
+        if len(direcciones) != 2 or any(d['tipo'] == 'neutra' for d in direcciones):
+            return None
+        borde = 0.9 * rango
+        
+        def al_borde(vectores, distancia=borde):
+            # Escala cada vector hasta el cuadrado |x|, |y| = distancia
+            return vectores * distancia / np.max(np.abs(vectores), axis=-1, keepdims=True)
+        
+        tipos = {d['tipo']: d['direccion'] for d in direcciones}
+        if len(tipos) == 2:
+            extremos = al_borde(np.array([tipos['estable'], -tipos['estable']]))
+            desplazamientos = np.outer([1.0, -1.0], DESPLAZAMIENTOS_SILLA) * rango
+            semillas = extremos[:, None, None, :] + desplazamientos[None, :, :, None] * tipos['inestable']
+            return np.clip(semillas.reshape(-1, 2), -borde, borde)
+        
+        # Nodo: con direcciones casi paralelas la base propia está mal condicionada
+        base = np.array([d['direccion'] for d in direcciones])
+        if abs(np.linalg.det(base)) < 0.1:
+            return None
+        angulos = (np.arange(SEMILLAS_NODO) + 0.5) * 2 * np.pi / SEMILLAS_NODO
+        combinaciones = np.stack([np.cos(angulos), np.sin(angulos)], axis=1) @ base
+        distancia = borde if direcciones[0]['tipo'] == 'estable' else 0.1 * rango
+        return al_borde(combinaciones, distancia)
+    
+    def _lado_ejes_px(self, tamano_px=None):
+        """
+        Lado aproximado de los ejes en píxeles para un canvas de tamano_px
+        
+        Se redondea a múltiplos de 32 px para que la caché sirva en tamaños
+        parecidos; sin tamano_px se usa figura_tamano a 100 ppp.
+        """
+        if tamano_px is None:
+            tamano_px = (self.figura_tamano[0] * 100, self.figura_tamano[1] * 100)
+        return FRACCION_EJES * max(32, 32 * round(min(tamano_px) / 32))
+    
+    def _nivel_rejilla(self, nivel, tamano_px=None):
+        """
+        Escala densidad, puntos y semillas del estilo 'rejilla' con el canvas
+        
+        Args:
+            nivel: Entrada de NIVELES_DETALLE
+            tamano_px: Tupla (ancho, alto) del canvas en píxeles
+            
+        Returns:
+            dict: Copia del nivel ajustada al tamaño
+        """
+        factor = self._lado_ejes_px(tamano_px) / LADO_REFERENCIA_PX
+        return dict(nivel,
+                    densidad=int(np.clip(round(nivel['densidad'] * factor), *LIMITES_DENSIDAD)),
+                    puntos=int(np.clip(round(nivel['puntos'] * factor), *LIMITES_PUNTOS)),
+                    semillas_reducidas=nivel['semillas_reducidas'] or factor < 0.6)
+    
+    def _parametros_adaptativos(self, limites, nivel, tamano_px=None):
+        """
+        Traduce las medidas en píxeles del nivel de detalle a la región
+        
+        Args:
+            limites: Tupla (x_min, x_max, y_min, y_max)
+            nivel: Entrada de NIVELES_DETALLE
+            tamano_px: Tupla (ancho, alto) del canvas; por defecto la de
+                figura_tamano a 100 ppp
+            
+        Returns:
+            tuple: (separacion, celdas_base, niveles) para calcular_flujo_adaptativo
+        """
+        lado_px = self._lado_ejes_px(tamano_px)
+        ancho = max(limites[1] - limites[0], limites[3] - limites[2])
+        separacion = ancho * min(nivel['separacion_px'] / lado_px, 1.0 / LINEAS_MINIMAS)
+        celdas_base = max(4, int(round(lado_px / nivel['celda_px'])))
+        return float(separacion), celdas_base, nivel['niveles']
+    
+    def calcular_flujo_adaptativo(self, campo, limites, separacion, celdas_base, niveles=2,
+                                  cancelado=None):
+        """
+        Calcula flechas adaptativas y líneas de flujo equiespaciadas
+        
+        Las flechas se colocan en las hojas de un árbol cuaternario (más
+        finas donde la dirección del flujo cambia deprisa) con longitud
+        proporcional a su celda; el color indica la magnitud.
+        
+        Args:
+            campo: Función vectorizada campo(x, y) -> (u, v)
+            limites: Tupla (x_min, x_max, y_min, y_max)
+            separacion: Distancia entre líneas de flujo
+            celdas_base: Celdas por eje del nivel más grueso de flechas
+            niveles: Subdivisiones máximas de las celdas
+            cancelado: Función opcional sin argumentos; si devuelve True entre
+                etapas, el cálculo se abandona
+            
+        Returns:
+            dict: Claves 'campo', 'lineas', 'semillas' y 'colores' de los
+            datos de dibujar_grafica, o None si se canceló; las semillas van
+            vacías porque el punto de siembra de una línea de flujo no
+            aporta información
+        """
+        with etapa('campo'):
+            X, Y, U, V, lados = muestrear_campo_adaptativo(campo, limites, celdas_base, niveles)
+            magnitud = np.hypot(U, V)
+            # Flechas de 0.7 veces su celda (quiver con scale=30 en unidades xy)
+            with np.errstate(all='ignore'):
+                factor = np.where(magnitud > 0, 0.7 * lados * 30 / magnitud, 0.0)
+            U, V = U * factor, V * factor
+        
+        if cancelado and cancelado():
+            return None
+        
+        with etapa('trayectorias/lineas_flujo'):
+            lineas, _ = lineas_flujo_uniformes(campo, limites, separacion, cancelado=cancelado)
+        
+        if cancelado and cancelado():
+            return None
+        
+        return {
+            'campo': (X, Y, U, V, magnitud),
+            'lineas': lineas,
+            'semillas': np.empty((0, 2)),
+            'colores': [COLORES_TRAYECTORIAS[k % len(COLORES_TRAYECTORIAS)] for k in range(len(lineas))],
+        }
+    
+    def integrar_campo(self, campo, semillas, t_max=3, puntos=200, subpasos=4):
+        """
+        Integra un campo no lineal con Runge-Kutta 4 para todas las semillas a la vez
+        
+        Args:
+            campo: Función vectorizada campo(x, y) -> (u, v)
+            semillas: Arreglo (M, 2) de condiciones iniciales
+            t_max: Tiempo de integración; si es negativo se integra hacia atrás
+            puntos: Número de puntos guardados en cada trayectoria
+            subpasos: Pasos de RK4 entre dos puntos guardados
+            
+        Returns:
+            np.ndarray: Arreglo (M, puntos, 2); tras escapar a infinito los
+            valores no son finitos
+        """
+        semillas = np.asarray(semillas, dtype=float).reshape(-1, 2)
+        h = t_max / ((puntos - 1) * subpasos)
+        
+        def derivada(estado):
+            u, v = campo(estado[:, 0], estado[:, 1])
+            return np.stack([u, v], axis=-1)
+        
+        trayectorias = np.empty((len(semillas), puntos, 2))
+        trayectorias[:, 0] = estado = semillas
+        with np.errstate(all='ignore'):
+            for i in range(1, puntos):
+                for _ in range(subpasos):
+                    k1 = derivada(estado)
+                    k2 = derivada(estado + 0.5 * h * k1)
+                    k3 = derivada(estado + 0.5 * h * k2)
+                    k4 = derivada(estado + h * k3)
+                    estado = estado + (h / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
+                trayectorias[:, i] = estado
+        return trayectorias
+    
+    def calcular_datos_campo(self, campo, limites, puntos_criticos=None, es_silla=False,
+                             detalle='alto', t_max=4.0, cancelado=None, tamano_px=None):
+        """
+        Calcula campo y trayectorias de un sistema no lineal para dibujar_grafica
+        
+        Con el estilo 'adaptativo' se usan las flechas adaptativas y las
+        líneas de flujo equiespaciadas de calcular_flujo_adaptativo. Con
+        'rejilla' el campo se evalúa sobre toda la rejilla en una llamada y las
+        trayectorias se integran hacia delante y hacia atrás desde una rejilla
+        de semillas; cada trayectoria se corta al salir de la región.
+        
+        Args:
+            campo: Función vectorizada campo(x, y) -> (u, v)
+            limites: Tupla (x_min, x_max, y_min, y_max)
+            puntos_criticos: Arreglo (K, 2) de puntos críticos a marcar
+            es_silla: Si es True, usa líneas más gruesas
+            detalle: Clave de NIVELES_DETALLE ('alto' o 'bajo')
+            t_max: Tiempo de integración en cada sentido (estilo 'rejilla')
+            cancelado: Función opcional sin argumentos; si devuelve True entre
+                etapas, el cálculo se abandona
+            tamano_px: Tupla (ancho, alto) del canvas en píxeles, que escala
+                el nivel de detalle
+            
+        Returns:
+            dict: Datos para dibujar_grafica, o None si se canceló
+        """
+        nivel = NIVELES_DETALLE[detalle]
+        x_min, x_max, y_min, y_max = limites
+        if puntos_criticos is None:
+            puntos_criticos = np.empty((0, 2))
+        datos = {
+            'detalle': detalle,
+            'rango': max(abs(x_min), abs(x_max), abs(y_min), abs(y_max)),
+            'limites': tuple(float(limite) for limite in limites),
+            'es_silla': es_silla,
+            'puntos_criticos': np.asarray(puntos_criticos, dtype=float).reshape(-1, 2),
+            'leyenda': f"Puntos críticos: {len(puntos_criticos)}",
+        }
+        
+        if self.estilo_campo == 'adaptativo':
+            flujo = self.calcular_flujo_adaptativo(
+                campo, limites, *self._parametros_adaptativos(limites, nivel, tamano_px),
+                cancelado=cancelado)
+            if flujo is None:
+                return None
+            datos.update(flujo)
+            return datos
+        
+        nivel = self._nivel_rejilla(nivel, tamano_px)
+        with etapa('campo'):
+            x = np.linspace(x_min, x_max, nivel['densidad'])
+            y = np.linspace(y_min, y_max, nivel['densidad'])
+            X, Y = np.meshgrid(x, y)
+            U, V = (np.array(componente) for componente in campo(X, Y))
+            U[~np.isfinite(U)] = 0.0
+            V[~np.isfinite(V)] = 0.0
+            magnitud = np.sqrt(U**2 + V**2)
+            
+            # Flechas de longitud acotada: el campo no lineal puede crecer mucho
+            escala = np.percentile(magnitud, 90) if magnitud.size else 0.0
+            if escala > 0:
+                factor = 0.6 * (x_max - x_min) / nivel['densidad'] * 30 / escala
+                U, V = U * factor, V * factor
+        
+        if cancelado and cancelado():
+            return None
+        
+        # Semillas en una rejilla interior de la región
+        fracciones = np.linspace(0.1, 0.9, 4 if nivel['semillas_reducidas'] else 6)
+        I, J = np.meshgrid(np.arange(len(fracciones)), np.arange(len(fracciones)), indexing='ij')
+        semillas = np.stack([x_min + (x_max - x_min) * fracciones[I.ravel()],
+                             y_min + (y_max - y_min) * fracciones[J.ravel()]], axis=-1)
+        indices_color = (I + J).ravel() % len(COLORES_TRAYECTORIAS)
+        
+        with etapa('trayectorias/rk4'):
+            adelante = self.integrar_campo(campo, semillas, t_max, nivel['puntos'])
+            atras = self.integrar_campo(campo, semillas, -t_max, nivel['puntos'])
+        
+        if cancelado and cancelado():
+            return None
+        
+        # Cortar cada trayectoria en su primera salida de la región ampliada
+        margen_x, margen_y = 0.1 * (x_max - x_min), 0.1 * (y_max - y_min)
+        lineas, colores, semillas_validas = [], [], []
+        for trayectorias in (adelante, atras):
+            dentro = ((trayectorias[..., 0] >= x_min - margen_x) & (trayectorias[..., 0] <= x_max + margen_x)
+                      & (trayectorias[..., 1] >= y_min - margen_y) & (trayectorias[..., 1] <= y_max + margen_y))
+            longitudes = np.cumprod(dentro, axis=1).sum(axis=1)
+            for k in np.flatnonzero(longitudes > 10 * nivel['puntos'] // 200):
+                lineas.append(trayectorias[k, :longitudes[k]])
+                colores.append(COLORES_TRAYECTORIAS[indices_color[k]])
+                semillas_validas.append(semillas[k])
+        
+        datos.update({
+            'campo': (X, Y, U, V, magnitud),
+            'lineas': lineas,
+            'semillas': np.array(semillas_validas).reshape(-1, 2),
+            'colores': colores,
+        })
+        return datos
+    
+    def dibujar_grafica(self, fig, datos, titulo="Trayectorias del Sistema"):
+        """
+        Dibuja en la figura los datos calculados por calcular_datos_grafica
+        
+        Args:
+            fig: Figura de matplotlib (vacía)
+            datos: Diccionario devuelto por calcular_datos_grafica
+            titulo: Título de la gráfica
+            
+        Returns:
+            GraficaTrayectorias: Artistas de la gráfica, reutilizables
+        """
+        grafica = GraficaTrayectorias(fig, titulo)
+        grafica.actualizar(datos)
+        return grafica
+    
+    def mostrar_grafica(self, parent_frame, datos, titulo="Trayectorias del Sistema"):
+        """
+        Muestra los datos en un canvas persistente dentro del frame padre
+        
+        La primera vez crea la figura, los ejes y el canvas; las siguientes
+        reutiliza los artistas existentes (set_UVC, set_data) y redibuja solo
+        la capa dinámica con blitting cuando la vista no cambia.
+        
+        Args:
+            parent_frame: Frame padre donde se coloca el canvas
+            datos: Diccionario devuelto por calcular_datos_grafica
+            titulo: Título de la gráfica
+            
+        Returns:
+            GraficaTrayectorias: Gráfica persistente
+        """
+        grafica = self.grafica_persistente
+        if (grafica is None or grafica.canvas is None
+                or not grafica.canvas.get_tk_widget().winfo_exists()
+                or grafica.canvas.get_tk_widget().master is not parent_frame):
+            fig = self.crear_figura(parent_frame)
+            grafica = GraficaTrayectorias(fig, titulo, animada=True)
+            grafica.actualizar(datos)
+            canvas = self.crear_canvas_tkinter(parent_frame, fig)
+            grafica.conectar_canvas(canvas)
+            self.grafica_persistente = grafica
+            return grafica
+        
+        # El título queda fuera de la zona de blitting: si cambia, redibujar todo
+        titulo_cambiado = grafica.ax.get_title() != titulo
+        if titulo_cambiado:
+            grafica.ax.set_title(titulo, fontsize=14, fontweight='bold', pad=20)
+        grafica.redibujar(grafica.actualizar(datos) or titulo_cambiado)
+        return grafica
+    
+    def crear_mapa_traza_determinante(self, a1, b1, a2, b2, parent_frame=None, limites=None):
+        """
+        Crea el diagrama traza-determinante con el sistema actual marcado
+        
+        El fondo reutiliza las teselas en caché de self.mapa_estabilidad; para
+        marcar otro sistema sin reconstruirlo basta con
+        self.mapa_estabilidad.marcar_sistema(traza, determinante).
+        
+        Args:
+            a1, b1, a2, b2: Coeficientes del sistema
+            parent_frame: Frame padre para calcular tamaño dinámico
+            limites: Tupla (traza_min, traza_max, det_min, det_max); por
+                defecto una vista centrada en el origen que incluye el sistema
+            
+        Returns:
+            matplotlib.figure.Figure: Figura con el diagrama
+        """
+        from mapa_estabilidad import limites_para
+        
+        analizador = AnalizadorEstabilidad(a1, b1, a2, b2)
+        traza = float(analizador.calcular_traza())
+        determinante = float(analizador.calcular_determinante())
+        
+        fig = self.crear_figura(parent_frame)
+        ax = fig.add_subplot(111)
+        ax.grid(True, alpha=0.4, linestyle='--')
+        
+        self.mapa_estabilidad.dibujar(ax, limites or limites_para(traza, determinante))
+        self.mapa_estabilidad.marcar_sistema(traza, determinante)
         
         return fig
     
@@ -231,6 +1163,9 @@ class VisualizadorSistema:
         Returns:
             FigureCanvasTkAgg: Canvas de Tkinter
         """
+        import tkinter as tk
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
         # Limpiar frame anterior
         for widget in parent_frame.winfo_children():
             widget.destroy()
@@ -244,3 +1179,258 @@ class VisualizadorSistema:
         canvas.get_tk_widget().configure(width=1, height=1)  # Forzar expansión
         
         return canvas
+
+
+class GraficaTrayectorias:
+    """
+    Artistas de una gráfica de trayectorias, actualizables sin recrearlos
+    
+    Los elementos fijos (ejes, rejilla, etiquetas) forman el fondo; el campo
+    vectorial, las trayectorias, las semillas y el punto crítico son la capa
+    dinámica. Con animada=True la capa dinámica se pinta con blitting sobre
+    el fondo guardado.
+    """
+    
+    def __init__(self, fig, titulo="Trayectorias del Sistema", animada=False):
+        """
+        Crea los ejes y los artistas vacíos
+        
+        Args:
+            fig: Figura de matplotlib (vacía)
+            titulo: Título de la gráfica
+            animada: Si es True, la capa dinámica se excluye del dibujo
+                completo y se pinta con blitting (requiere conectar_canvas)
+        """
+        self.fig = fig
+        self.ax = ax = fig.add_subplot(111)
+        self.animada = animada
+        self.canvas = None
+        self.limites = None
+        self._fondo = None
+        self.quiver = None
+        self.lineas = []
+        self.direcciones = []
+        
+        # Puntos iniciales de las trayectorias
+        self.semillas = ax.scatter(np.empty(0), np.empty(0), s=16, alpha=0.7,
+                                   zorder=3, animated=animada)
+        
+        # Marcar el punto crítico con mejor visibilidad
+        self.punto_critico, = ax.plot([0], [0], 'ko', markersize=15, 
+                                      markeredgecolor='white', markeredgewidth=3, zorder=10,
+                                      animated=animada)
+        
+        # Configurar gráfica con mejor estilo
+        ax.set_xlabel('x', fontsize=12, fontweight='bold')
+        ax.set_ylabel('y', fontsize=12, fontweight='bold')
+        ax.set_title(titulo, fontsize=14, fontweight='bold', pad=20)
+        ax.grid(True, alpha=0.4, linestyle='--')
+        ax.set_aspect('equal')
+        
+        # Agregar leyenda del punto crítico en la esquina superior derecha
+        self.leyenda = ax.text(0.98, 0.98, 'Punto crítico (0,0)', transform=ax.transAxes, 
+                               fontsize=10, fontweight='bold', ha='right', va='top',
+                               bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8,
+                                         edgecolor='black'),
+                               animated=animada)
+        
+        # Escalas de tiempo de las direcciones propias en la esquina inferior izquierda
+        self.anotacion = ax.text(0.02, 0.02, '', transform=ax.transAxes, fontsize=9,
+                                 ha='left', va='bottom', visible=False,
+                                 bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8,
+                                           edgecolor='gray'),
+                                 animated=animada)
+        
+        # Agregar líneas de referencia
+        ax.axhline(y=0, color='black', linestyle='-', alpha=0.3, linewidth=0.5)
+        ax.axvline(x=0, color='black', linestyle='-', alpha=0.3, linewidth=0.5)
+    
+    def actualizar(self, datos):
+        """
+        Actualiza los artistas con nuevos datos de calcular_datos_grafica
+        
+        Args:
+            datos: Diccionario devuelto por calcular_datos_grafica
+            
+        Returns:
+            bool: True si cambió la vista y hace falta un redibujado completo
+        """
+        with etapa('grafica'):
+            return self._actualizar_artistas(datos)
+    
+    def _actualizar_artistas(self, datos):
+        """Actualiza el quiver, las líneas y las semillas (ver actualizar)"""
+        ax = self.ax
+        rango = datos['rango']
+        limites = datos.get('limites', (-rango, rango, -rango, rango))
+        X, Y, U, V, magnitud = datos['campo']
+        vista_cambiada = limites != self.limites
+        
+        self._actualizar_flechas(X, Y, U, V, magnitud)
+        
+        # Para sillas, usar líneas más gruesas para mejor visibilidad
+        linewidth = 1.5 if datos['es_silla'] else 1.2
+        
+        # Reutilizar las Line2D existentes y crear solo las que falten
+        while len(self.lineas) < len(datos['lineas']):
+            self.lineas.append(ax.plot([], [], alpha=0.8, animated=self.animada)[0])
+        for linea, trayectoria, color in zip(self.lineas, datos['lineas'], datos['colores']):
+            linea.set_data(trayectoria[:, 0], trayectoria[:, 1])
+            linea.set_color(color)
+            linea.set_linewidth(linewidth)
+            linea.set_visible(True)
+        for linea in self.lineas[len(datos['lineas']):]:
+            linea.set_visible(False)
+        
+        # Direcciones propias (separatrices en las sillas), de borde a borde
+        direcciones = datos.get('direcciones', [])
+        while len(self.direcciones) < len(direcciones):
+            self.direcciones.append(ax.plot([], [], zorder=4, animated=self.animada)[0])
+        extension = 2 * max(abs(limite) for limite in limites)
+        for linea, direccion in zip(self.direcciones, direcciones):
+            dx, dy = extension * direccion['direccion']
+            linea.set_data([-dx, dx], [-dy, dy])
+            linea.set(**ESTILOS_DIRECCION[direccion['tipo']],
+                      linewidth=2.5 if datos.get('es_silla') else 1.8, visible=True)
+        for linea in self.direcciones[len(direcciones):]:
+            linea.set_visible(False)
+        anotacion = datos.get('anotacion', '')
+        self.anotacion.set_text(anotacion)
+        self.anotacion.set_visible(bool(anotacion))
+        
+        # Marcar puntos iniciales
+        self.semillas.set_offsets(datos['semillas'].reshape(-1, 2))
+        self.semillas.set_color(datos['colores'])
+        
+        # Puntos críticos: el origen en los sistemas lineales
+        puntos_criticos = datos.get('puntos_criticos', ORIGEN)
+        self.punto_critico.set_data(puntos_criticos[:, 0], puntos_criticos[:, 1])
+        self.leyenda.set_text(datos.get('leyenda', 'Punto crítico (0,0)'))
+        
+        if vista_cambiada:
+            # Establecer límites de los ejes
+            ax.set_xlim(limites[0], limites[1])
+            ax.set_ylim(limites[2], limites[3])
+            self.limites = limites
+        return vista_cambiada
+    
+    def _actualizar_flechas(self, X, Y, U, V, magnitud):
+        """
+        Actualiza el campo vectorial, reutilizando el quiver si se puede
+        
+        Con las mismas posiciones (rejilla fija, o el mismo sistema y tamaño)
+        solo se cambian las componentes con set_UVC. Las flechas adaptativas
+        cambian de número y de sitio con el sistema; como Quiver no tiene API
+        pública para moverlas, en ese caso se sustituye por uno nuevo.
+        """
+        posiciones = np.column_stack((np.ravel(X), np.ravel(Y)))
+        if self.quiver is not None and np.array_equal(posiciones, self.quiver.get_offsets()):
+            self.quiver.set_UVC(U, V, magnitud)
+        else:
+            if self.quiver is not None:
+                self.quiver.remove()
+            # Graficar campo vectorial con mejor visualización
+            self.quiver = self.ax.quiver(X, Y, U, V, magnitud, cmap='plasma', alpha=0.8, scale=30,
+                                         scale_units='xy', width=0.003, animated=self.animada)
+        if magnitud.size:
+            self.quiver.set_clim(magnitud.min(), magnitud.max())
+    
+    def conectar_canvas(self, canvas):
+        """
+        Asocia el canvas donde se muestra la figura para redibujar con blitting
+        
+        Args:
+            canvas: Canvas de matplotlib de la figura
+        """
+        self.canvas = canvas
+        canvas.mpl_connect('draw_event', self._al_dibujar)
+        if self.animada:
+            # El primer dibujo se hizo sin guardar fondo: repetirlo con la capa dinámica
+            canvas.draw_idle()
+    
+    def _artistas_dinamicos(self):
+        """Artistas de la capa dinámica en orden de dibujo"""
+        return [self.quiver, *self.lineas, *self.direcciones, self.semillas, self.punto_critico,
+                self.leyenda, self.anotacion]
+    
+    def _al_dibujar(self, evento):
+        """Guarda el fondo tras un dibujo completo y pinta la capa dinámica encima"""
+        if not self.animada:
+            return
+        self._fondo = self.canvas.copy_from_bbox(self.ax.bbox)
+        for artista in self._artistas_dinamicos():
+            if artista is not None:
+                self.ax.draw_artist(artista)
+    
+    def redibujar(self, completo=False):
+        """
+        Redibuja la gráfica en su canvas
+        
+        Args:
+            completo: Si es True (p. ej. cambió la vista), redibuja todo; si no,
+                restaura el fondo guardado y pinta solo la capa dinámica
+        """
+        if self.canvas is None:
+            return
+        if completo or not self.animada or self._fondo is None or not self.canvas.supports_blit:
+            self.canvas.draw_idle()
+            return
+        
+        with etapa('dibujo/blit'):
+            self.canvas.restore_region(self._fondo)
+            for artista in self._artistas_dinamicos():
+                if artista is not None:
+                    self.ax.draw_artist(artista)
+            self.canvas.blit(self.ax.bbox)
+
+
+def medir_fps(sistemas=None, repeticiones=3, figura_tamano=(8, 6)):
+    """
+    Mide los cuadros por segundo al redibujar análisis consecutivos
+    
+    Compara recrear figura y canvas en cada análisis con actualizar una
+    GraficaTrayectorias persistente. Los datos se calculan antes de medir,
+    así que solo se mide el dibujo. Usa el backend Agg (sin ventana).
+    
+    Args:
+        sistemas: Lista de coeficientes (a1, b1, a2, b2); por defecto una
+            secuencia de focos con a1 variando poco a poco
+        repeticiones: Veces que se recorre la lista
+        figura_tamano: Tamaño de la figura en pulgadas
+        
+    Returns:
+        dict: Cuadros por segundo de 'recrear' e 'incremental'
+    """
+    import time
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    
+    if sistemas is None:
+        sistemas = [(a1, 2.0, -2.0, -1.0) for a1 in np.linspace(-1.0, -0.5, 20)]
+    visualizador = VisualizadorSistema(figura_tamano)
+    datos = [visualizador.calcular_datos_grafica(*coeficientes) for coeficientes in sistemas]
+    cuadros = len(datos) * repeticiones
+    
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for d in datos:
+            fig = Figure(figsize=figura_tamano)
+            canvas = FigureCanvasAgg(fig)
+            visualizador.dibujar_grafica(fig, d)
+            canvas.draw()
+    fps_recrear = cuadros / (time.perf_counter() - inicio)
+    
+    fig = Figure(figsize=figura_tamano)
+    canvas = FigureCanvasAgg(fig)
+    grafica = GraficaTrayectorias(fig, animada=True)
+    grafica.actualizar(datos[0])
+    grafica.conectar_canvas(canvas)
+    
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for d in datos:
+            grafica.redibujar(grafica.actualizar(d))
+    fps_incremental = cuadros / (time.perf_counter() - inicio)
+    
+    return {'recrear': fps_recrear, 'incremental': fps_incremental}
+